@@ -0,0 +1,130 @@
+import logging
+import time
+from collections import namedtuple
+
+import engine_pool
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_MULTIPV = 3 # Jumlah variasi utama (principal variation) yang ditampilkan
+ANALYSIS_UPDATE_INTERVAL = 0.25 # Detik; batas laju pembaruan panel (throttle UI)
+ANALYSIS_PV_LENGTH = 5 # Jumlah langkah per variasi yang ditampilkan di sidebar
+ANALYSIS_TIME_LIMIT = 30.0 # Detik per posisi; setelah itu worker engine dilepas untuk job lain
+ANALYSIS_JOB_KEY = "analysis" # Satu job analisis aktif; posisi baru membatalkan job lama
+
+# Satu baris analisis: rank (1..N), depth, skor (string, sudut pandang Putih), dan variasi dalam SAN
+AnalysisLine = namedtuple("AnalysisLine", ["rank", "depth", "score", "pv_san"])
+
+def format_score(score):
+    """Memformat chess.engine.PovScore menjadi teks singkat dari sudut pandang Putih (misal '+0.35' atau '#-3')."""
+    white_score = score.white()
+    if white_score.is_mate():
+        return f"#{white_score.mate()}"
+    return f"{white_score.score() / 100:+.2f}"
+
+class LiveAnalyzer:
+    """
+    Analisis posisi secara live (multi-PV) lewat pool engine bersama (engine_pool.EnginePool) sebagai
+    job prioritas terendah: komunikasi dengan engine tidak memblokir render loop, hasil dipublikasikan
+    sebagai snapshot yang di-throttle, dan job lama langsung dibatalkan saat posisi berubah.
+    """
+    def __init__(self, pool, multipv=ANALYSIS_MULTIPV, update_interval=ANALYSIS_UPDATE_INTERVAL):
+        self.pool = pool
+        self.multipv = multipv
+        self.update_interval = update_interval
+
+        self.enabled = False
+        self.status_message = "Analysis off"
+
+        self._position_key = None
+        self._job = None
+        self._board = None
+        self._infos = {}
+        self._last_publish = 0.0
+
+        self.lines = () # Snapshot terakhir (tuple AnalysisLine), aman dibaca kapan saja oleh GUI
+        self.snapshot_version = 0 # Naik setiap snapshot baru, dipakai GUI untuk cache render teks
+
+    def _publish(self, lines, status_message):
+        self.lines = tuple(lines)
+        self.status_message = status_message
+        self.snapshot_version += 1
+
+    def set_enabled(self, enabled):
+        """Menyalakan/mematikan mode analisis. Saat dimatikan, pencarian yang berjalan dibatalkan."""
+        self.enabled = enabled
+        if not enabled:
+            self._cancel()
+            self._position_key = None
+            self._publish((), "Analysis off")
+
+    def update_position(self, board):
+        """
+        Dipanggil setiap frame dengan papan saat ini (murah jika posisi tidak berubah).
+        Jika posisi berubah (langkah, undo, redo), job lama dibatalkan seketika dan job analisis
+        baru dimasukkan ke antrian pool.
+        """
+        if not self.enabled:
+            return
+        position_key = (board.fen(), len(board.move_stack))
+        if position_key == self._position_key:
+            return
+        self._position_key = position_key
+        self._cancel()
+        if not self.pool.has_engine:
+            self._publish((), "No UCI engine found")
+            return
+        if board.is_game_over():
+            self._publish((), "Game over")
+            return
+        self._publish((), "Analyzing...")
+
+        self._board = board.copy()
+        self._infos = {}
+        self._last_publish = 0.0
+        job = self.pool.submit(engine_pool.JOB_ANALYSE, self._board, engine_pool.PRIORITY_ANALYSIS,
+                               ANALYSIS_TIME_LIMIT, key=ANALYSIS_JOB_KEY, multipv=self.multipv,
+                               on_info=self._on_info)
+        job.future.add_done_callback(lambda future: self._on_done(job, future))
+        self._job = job
+
+    def _cancel(self):
+        if self._job is not None:
+            self._job.cancel()
+        self._job = None
+
+    def _on_info(self, info):
+        """Callback dari worker pool untuk setiap info deepening engine; publikasi di-throttle."""
+        if "pv" not in info or "score" not in info:
+            return
+        self._infos[info.get("multipv", 1)] = info
+        now = time.perf_counter()
+        if now - self._last_publish >= self.update_interval:
+            self._publish(self._build_lines(self._board, self._infos), f"Depth {info.get('depth', 0)}")
+            self._last_publish = now
+
+    def _on_done(self, job, future):
+        if job is not self._job or future.cancelled():
+            return
+        if future.exception() is not None:
+            logger.warning("Analysis job failed: %s", future.exception())
+            self._publish((), "Engine stopped")
+            return
+        self._publish(self._build_lines(self._board, self._infos), "Analysis complete")
+
+    def _build_lines(self, board, infos):
+        """Mengubah InfoDict engine menjadi AnalysisLine (SAN hanya dihitung saat publish, bukan per info)."""
+        lines = []
+        for rank in sorted(infos):
+            info = infos[rank]
+            pv = info["pv"][:ANALYSIS_PV_LENGTH]
+            try:
+                pv_san = board.variation_san(pv)
+            except ValueError: # PV tidak valid untuk posisi ini (info basi), lewati
+                continue
+            lines.append(AnalysisLine(rank, info.get("depth", 0), format_score(info["score"]), pv_san))
+        return lines
+
+    async def close(self):
+        """Menghentikan pencarian (proses engine ditutup oleh pool)."""
+        self._cancel()
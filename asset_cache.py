@@ -0,0 +1,154 @@
+import hashlib
+import logging
+import os
+import pygame
+
+logger = logging.getLogger(__name__)
+
+ASSET_DIR = "assets"
+CACHE_DIR = os.path.join(ASSET_DIR, ".cache") # Folder untuk atlas/gambar yang sudah di-scale
+MAX_CACHED_SIZES = 3 # File cache per aset (ukuran berbeda) yang disimpan di disk; yang terlama dihapus
+CACHE_KEY_LENGTH = 16 # Jumlah karakter hex dari _cache_key
+
+
+def _cache_key(paths, *extra):
+    """
+    Membuat kunci cache dari path dan waktu modifikasi (mtime) file aset,
+    ditambah parameter lain (misal ukuran). Jika aset berubah, kunci ikut berubah.
+    """
+    digest = hashlib.sha1()
+    for path in paths:
+        digest.update(path.encode("utf-8"))
+        try:
+            digest.update(str(os.path.getmtime(path)).encode("utf-8"))
+        except OSError:
+            digest.update(b"missing")
+    for value in extra:
+        digest.update(str(value).encode("utf-8"))
+    return digest.hexdigest()[:CACHE_KEY_LENGTH]
+
+
+def _cache_path(name, size_label, key):
+    """Path file cache: <nama_aset>_<ukuran>_<kunci>.png (nama aset boleh berisi '_')."""
+    return os.path.join(CACHE_DIR, f"{name}_{size_label}_{key}.png")
+
+
+def _parse_cache_filename(filename):
+    """Kebalikan _cache_path: (nama_aset, ukuran, kunci), atau None jika bukan file cache."""
+    stem, extension = os.path.splitext(filename)
+    parts = stem.rsplit("_", 2)
+    if extension != ".png" or len(parts) != 3 or len(parts[2]) != CACHE_KEY_LENGTH:
+        return None
+    return tuple(parts)
+
+
+def _remove_stale(name, size_label, keep_path):
+    """
+    Menghapus file cache lama milik aset yang sama (nama persis sama): semua file lain dengan
+    ukuran yang sama (kunci sudah tidak berlaku), lalu sisanya dibatasi MAX_CACHED_SIZES file terbaru.
+    """
+    try:
+        others = []
+        for filename in os.listdir(CACHE_DIR):
+            path = os.path.join(CACHE_DIR, filename)
+            parsed = _parse_cache_filename(filename)
+            if path == keep_path or parsed is None or parsed[0] != name:
+                continue
+            if parsed[1] == size_label:
+                os.remove(path)
+            else:
+                others.append(path)
+        others.sort(key=os.path.getmtime, reverse=True)
+        for path in others[MAX_CACHED_SIZES - 1:]:
+            os.remove(path)
+    except OSError:
+        pass
+
+
+def _save_cache(surface, path, name, size_label):
+    """Menyimpan surface ke disk. Kegagalan (misal folder read-only) tidak fatal."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        pygame.image.save(surface, path)
+        _remove_stale(name, size_label, path)
+    except (pygame.error, OSError) as e:
+        logger.warning("Could not write asset cache %s: %s", path, e)
+
+
+def make_placeholder(label, size):
+    """Membuat gambar pengganti (kotak merah transparan dengan label) jika aset gagal dimuat."""
+    surface = pygame.Surface((size, size), pygame.SRCALPHA)
+    surface.fill((255, 0, 0, 128))
+    pygame.font.init()
+    font = pygame.font.Font(None, 24)
+    text_surface = font.render(label, True, (0, 0, 0))
+    text_rect = text_surface.get_rect(center=(size // 2, size // 2))
+    surface.blit(text_surface, text_rect)
+    return surface
+
+
+def load_piece_atlas(piece_files, square_size, persist=True):
+    """
+    Memuat semua gambar bidak sebagai satu atlas yang sudah di-scale ke square_size.
+    piece_files: dict {simbol_bidak: nama_file} (misal PIECE_IMAGES).
+    Atlas disimpan di CACHE_DIR dengan kunci ukuran + mtime aset, sehingga launch berikutnya
+    cukup decode satu PNG kecil tanpa transform.scale.
+    persist: Jika False, atlas baru tidak ditulis ke disk (misal ukuran sementara saat resize);
+             cache disk yang sudah ada tetap dibaca.
+    Mengembalikan dict {simbol_bidak: Surface} (subsurface dari atlas).
+    """
+    symbols = list(piece_files.keys())
+    paths = [os.path.join(ASSET_DIR, piece_files[symbol]) for symbol in symbols]
+    cache_path = _cache_path("pieces", square_size, _cache_key(paths, square_size))
+
+    atlas = None
+    if os.path.exists(cache_path):
+        try:
+            atlas = pygame.image.load(cache_path).convert_alpha()
+        except pygame.error as e:
+            logger.warning("Asset cache %s is unreadable, rebuilding: %s", cache_path, e)
+            atlas = None
+
+    if atlas is None:
+        atlas = pygame.Surface((square_size * len(symbols), square_size), pygame.SRCALPHA)
+        all_loaded = True
+        for index, (symbol, path) in enumerate(zip(symbols, paths)):
+            try:
+                image = pygame.image.load(path).convert_alpha()
+                sprite = pygame.transform.smoothscale(image, (square_size, square_size))
+            except pygame.error as e:
+                logger.error("Error loading piece image %s: %s", path, e)
+                sprite = make_placeholder(symbol, square_size)
+                all_loaded = False
+            atlas.blit(sprite, (index * square_size, 0))
+        # Jangan cache atlas yang berisi placeholder, supaya aset yang diperbaiki langsung terpakai
+        if all_loaded and persist:
+            _save_cache(atlas, cache_path, "pieces", str(square_size))
+
+    return {symbol: atlas.subsurface((index * square_size, 0, square_size, square_size))
+            for index, symbol in enumerate(symbols)}
+
+
+def load_scaled_image(filename, size, persist=True):
+    """
+    Memuat satu gambar dari ASSET_DIR yang sudah di-scale ke size (lebar, tinggi), dengan cache di disk.
+    persist: Jika False, hasil scale tidak ditulis ke disk (lihat load_piece_atlas).
+    Melempar pygame.error jika file aset tidak bisa dimuat.
+    """
+    path = os.path.join(ASSET_DIR, filename)
+    width, height = size
+    name = os.path.splitext(filename)[0]
+    size_label = f"{width}x{height}"
+    cache_path = _cache_path(name, size_label, _cache_key([path], width, height))
+
+    if os.path.exists(cache_path):
+        try:
+            return pygame.image.load(cache_path).convert_alpha()
+        except pygame.error:
+            pass
+
+    image = pygame.image.load(path).convert_alpha()
+    scaled = pygame.transform.smoothscale(image, (width, height))
+    if persist:
+        _save_cache(scaled, cache_path, name, size_label)
+    return scaled
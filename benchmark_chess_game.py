@@ -0,0 +1,227 @@
+# benchmark_chess_game.py
+# Perft dan uji kesesuaian aturan untuk ChessGame, plus benchmark operasi per detik.
+# Semua langkah dijalankan lewat API ChessGame (select_square, undo_move, redo_move, ...),
+# sehingga optimasi di lapisan aturan bisa divalidasi dari sisi kebenaran dan kecepatan.
+#
+#   python benchmark_chess_game.py            # perft cepat + uji aturan + benchmark siklus
+#   python benchmark_chess_game.py --deep     # perft satu level lebih dalam (lebih lambat)
+#
+# Exit code 1 jika ada perft atau uji aturan yang gagal.
+import argparse
+import logging
+import random
+import sys
+import time
+from collections import namedtuple
+
+import chess
+
+import chess_game
+
+# Posisi standar perft (chessprogramming.org/Perft_Results) dengan jumlah node per kedalaman
+PerftCase = namedtuple("PerftCase", ["name", "fen", "node_counts"])
+PERFT_CASES = [
+    PerftCase("startpos", chess.STARTING_FEN, [20, 400, 8902, 197281]),
+    PerftCase("kiwipete", "r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1", [48, 2039, 97862]),
+    PerftCase("position3", "8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1", [14, 191, 2812, 43238]),
+    PerftCase("position4", "r3k2r/Pppp1ppp/1b3nbN/nP6/BBP1P3/q4N2/Pp1P2PP/R2Q1RK1 w kq - 0 1", [6, 264, 9467]),
+    PerftCase("position5", "rnbq1k1r/pp1Pbppp/2p5/8/2B5/8/PPP1NnPP/RNBQK2R w KQ - 1 8", [44, 1486, 62379]),
+]
+QUICK_DEPTHS = {"startpos": 3, "kiwipete": 2, "position3": 4, "position4": 3, "position5": 2}
+
+PROMOTION_PIECES = [chess.QUEEN, chess.ROOK, chess.BISHOP, chess.KNIGHT]
+CYCLE_GAMES = 20 # Jumlah permainan acak untuk benchmark siklus
+CYCLE_MAX_PLIES = 200 # Panjang maksimum tiap permainan acak
+
+def _own_squares(game):
+    board = game.get_board_state()
+    return [chess.square_name(square) for square in chess.SquareSet(board.occupied_co[board.turn])]
+
+def _is_promotion(game, from_name, to_square):
+    piece = game.get_board_state().piece_at(chess.parse_square(from_name))
+    return piece.piece_type == chess.PAWN and chess.square_rank(to_square) in (0, 7)
+
+def perft(game, depth):
+    """Menghitung node perft dengan hanya memakai API ChessGame (termasuk promosi minor)."""
+    if depth == 0:
+        return 1
+    nodes = 0
+    for from_name in _own_squares(game):
+        destinations = game.get_legal_moves(from_name) # Promosi muncul 4x (satu per bidak)
+        if depth == 1:
+            nodes += len(destinations)
+            continue
+        for to_square in dict.fromkeys(destinations): # Unik, urutan tetap
+            to_name = chess.square_name(to_square)
+            promotions = PROMOTION_PIECES if _is_promotion(game, from_name, to_square) else [chess.QUEEN]
+            for promotion in promotions:
+                if not game.select_square(from_name) or not game.select_square(to_name, promotion):
+                    raise AssertionError(f"Legal move {from_name}{to_name} rejected at {game.get_board_state().fen()}")
+                nodes += perft(game, depth - 1)
+                game.undo_move()
+    return nodes
+
+def run_perft(deep=False):
+    failures = 0
+    print("== Perft (via ChessGame API) ==")
+    for case in PERFT_CASES:
+        depth = QUICK_DEPTHS[case.name] + (1 if deep else 0)
+        depth = min(depth, len(case.node_counts))
+        game = chess_game.ChessGame()
+        game.reset_game(case.fen)
+        start = time.perf_counter()
+        nodes = perft(game, depth)
+        elapsed = time.perf_counter() - start
+        expected = case.node_counts[depth - 1]
+        ok = nodes == expected
+        failures += not ok
+        print(f"{'OK  ' if ok else 'FAIL'} {case.name:<10} depth {depth}: {nodes:>8} nodes "
+              f"(expected {expected:>8}) {elapsed:7.2f} s, {nodes / elapsed:10.0f} nodes/s")
+    return failures
+
+def _check(name, condition):
+    print(f"{'OK  ' if condition else 'FAIL'} {name}")
+    return 0 if condition else 1
+
+def _play(game, *moves):
+    """Memainkan langkah UCI lewat dua kali select_square (promosi memakai huruf ke-5 UCI)."""
+    results = []
+    for uci in moves:
+        move = chess.Move.from_uci(uci)
+        game.select_square(chess.square_name(move.from_square))
+        results.append(game.select_square(chess.square_name(move.to_square), move.promotion or chess.QUEEN))
+    return all(results)
+
+def run_conformance():
+    """Uji aturan yang rawan salah di lapisan ChessGame (promosi, en passant, rokade, undo/redo, riwayat)."""
+    failures = 0
+    print("== Rules conformance ==")
+
+    game = chess_game.ChessGame()
+    failures += _check("illegal move is rejected", not _play(game, "e2e5") and game.get_board_state().fen() == chess.STARTING_FEN)
+    failures += _check("opponent piece cannot be selected", not game.select_square("e7") and game.selected_square is None)
+
+    game.reset_game("4k3/1P6/8/8/8/8/8/4K3 w - - 0 1")
+    failures += _check("default promotion is queen", _play(game, "b7b8") and game.get_board_state().piece_at(chess.B8).piece_type == chess.QUEEN)
+    game.undo_move()
+    failures += _check("underpromotion to knight", _play(game, "b7b8n") and game.get_board_state().piece_at(chess.B8).piece_type == chess.KNIGHT)
+
+    game.reset_game("4k3/8/8/3pP3/8/8/8/4K3 w - d6 0 1")
+    failures += _check("en passant captures the pawn", _play(game, "e5d6") and game.get_board_state().piece_at(chess.D5) is None)
+
+    game.reset_game("r3k2r/8/8/8/8/8/8/R3K2R w KQkq - 0 1")
+    failures += _check("castling moves the rook", _play(game, "e1g1") and game.get_board_state().piece_at(chess.F1).piece_type == chess.ROOK)
+    game.reset_game("r3k2r/8/8/8/8/8/5r2/R3K2R w KQkq - 0 1")
+    failures += _check("cannot castle through an attacked square", not _play(game, "e1g1"))
+
+    game.reset_game()
+    _play(game, "f2f3", "e7e5", "g2g4", "d8h4")
+    status = game.get_game_status()
+    failures += _check("fool's mate is checkmate", status["checkmate"] and status["message"] == "Checkmate! Black wins!")
+
+    game.reset_game()
+    moves = ["e2e4", "e7e5", "g1f3", "b8c6", "f1b5", "a7a6"]
+    _play(game, *moves)
+    final_fen = game.get_board_state().fen()
+    while game.undo_move():
+        pass
+    failures += _check("undo all returns to start", game.get_board_state().fen() == chess.STARTING_FEN)
+    while game.redo_move():
+        pass
+    failures += _check("redo all restores final position", game.get_board_state().fen() == final_fen)
+
+    game.undo_move()
+    game.undo_move()
+    _play(game, "f1c4")
+    failures += _check("branching keeps old line as variation", len(game.history.variations()) == 2)
+    game.undo_move()
+    _play(game, "f1b5")
+    failures += _check("replaying known move reuses its branch", game.redo_move() and game.get_board_state().fen() == final_fen)
+
+    failures += _check("jump to ply matches replay", game.go_to_ply(2) and game.get_board_state().fen() == _replay_fen(moves[:2]))
+    failures += _check("jump keeps move stack for undo", game.go_to_ply(5) and len(game.get_board_state().move_stack) == 5
+                       and game.undo_move() and game.get_board_state().fen() == _replay_fen(moves[:4]))
+    return failures
+
+def _replay_fen(moves):
+    board = chess.Board()
+    for uci in moves:
+        board.push_uci(uci)
+    return board.fen()
+
+def _random_game(game, rng, max_plies, timings):
+    """Memainkan satu game acak lewat API sambil mengukur select, move, dan status."""
+    for _ in range(max_plies):
+        board = game.get_board_state()
+        if board.is_game_over():
+            break
+        move = rng.choice(list(board.legal_moves))
+        from_name, to_name = chess.square_name(move.from_square), chess.square_name(move.to_square)
+
+        start = time.perf_counter()
+        game.select_square(from_name)
+        game.get_legal_moves(from_name)
+        timings["select"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        game.select_square(to_name, move.promotion or chess.QUEEN)
+        timings["move"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        game.get_game_status()
+        timings["status"].append(time.perf_counter() - start)
+
+def run_cycles(games=CYCLE_GAMES, max_plies=CYCLE_MAX_PLIES, seed=0):
+    """Benchmark siklus select/move/status/undo/redo/jump pada game panjang; melaporkan operasi per detik."""
+    print(f"== Cycle benchmark ({games} random games, up to {max_plies} plies) ==")
+    rng = random.Random(seed)
+    timings = {name: [] for name in ["select", "move", "status", "undo", "redo", "jump"]}
+    total_plies = 0
+    for _ in range(games):
+        game = chess_game.ChessGame()
+        _random_game(game, rng, max_plies, timings)
+        plies = len(game.get_board_state().move_stack)
+        total_plies += plies
+
+        while True:
+            start = time.perf_counter()
+            if not game.undo_move():
+                break
+            timings["undo"].append(time.perf_counter() - start)
+        while True:
+            start = time.perf_counter()
+            if not game.redo_move():
+                break
+            timings["redo"].append(time.perf_counter() - start)
+        for _ in range(plies):
+            target = rng.randint(0, plies)
+            start = time.perf_counter()
+            game.go_to_ply(target)
+            timings["jump"].append(time.perf_counter() - start)
+
+    print(f"{total_plies} plies played")
+    for name, samples in timings.items():
+        if not samples:
+            continue
+        total = sum(samples)
+        samples.sort()
+        print(f"{name:<7} {len(samples):>7} ops  {len(samples) / total:10.0f} ops/s  "
+              f"mean {total / len(samples) * 1e6:8.1f} us  p99 {samples[int(len(samples) * 0.99) - 1] * 1e6:8.1f} us")
+
+def main():
+    parser = argparse.ArgumentParser(description="Perft, rules conformance and speed benchmark for ChessGame.")
+    parser.add_argument("--deep", action="store_true", help="Run perft one level deeper (slower).")
+    parser.add_argument("--skip-cycles", action="store_true", help="Only run correctness checks.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING) # Log per langkah ChessGame (INFO) tidak ikut diukur
+
+    failures = run_perft(args.deep)
+    failures += run_conformance()
+    if not args.skip_cycles:
+        run_cycles()
+    print(f"\n{failures} failure(s)")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
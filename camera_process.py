@@ -0,0 +1,197 @@
+import enum
+import logging
+import multiprocessing
+import time
+import types
+from collections import namedtuple
+
+import gesture_control
+import game_logging
+import hand_tracker
+from game_logging import log_event
+
+logger = logging.getLogger(__name__)
+
+# Pesan dari proses kamera ke proses game (lewat multiprocessing.Pipe)
+MSG_READY = "ready" # (MSG_READY, lama_startup_detik, shape_frame)
+MSG_FAILED = "failed" # (MSG_FAILED, None, None)
+MSG_FRAME = "frame" # (MSG_FRAME, shape_frame, tangan_terpaket, inferensi_penuh, timestamp)
+
+STOP_TIMEOUT = 2.0 # Detik menunggu proses kamera berhenti sendiri sebelum di-terminate
+
+# Landmark ringan pengganti protobuf MediaPipe; cukup untuk kode yang membaca .landmark[i].x/.y/.z
+Landmark = namedtuple("Landmark", ["x", "y", "z"])
+HandLandmarks = namedtuple("HandLandmarks", ["landmark"])
+
+class HandLandmark(enum.IntEnum):
+    """Indeks landmark MediaPipe yang dipakai GestureController, tanpa mengimpor mediapipe di proses game."""
+    THUMB_TIP = hand_tracker.THUMB_TIP
+    INDEX_FINGER_PIP = 6
+    INDEX_FINGER_TIP = hand_tracker.INDEX_FINGER_TIP
+    MIDDLE_FINGER_PIP = 10
+    MIDDLE_FINGER_TIP = 12
+
+# Pengganti mp.solutions.hands untuk kode kelas induk yang membaca self.mp_hands.HandLandmark.*
+LANDMARK_NAMES = types.SimpleNamespace(HandLandmark=HandLandmark)
+
+# Hasil satu frame dari proses kamera. shape meniru ndarray.shape (tinggi, lebar, kanal) karena
+# game loop hanya butuh ukuran frame, bukan pikselnya; piksel tidak pernah dikirim antar proses.
+LandmarkFrame = namedtuple("LandmarkFrame", ["shape", "hands", "inferred", "timestamp"])
+
+def _pack_hand(hand):
+    """DetectedHand (protobuf) -> tuple yang murah di-pickle: 21 titik (x, y, z), handedness, skor."""
+    points = tuple((landmark.x, landmark.y, landmark.z) for landmark in hand.landmarks.landmark)
+    return points, hand.handedness, hand.score
+
+def _unpack_hand(packed):
+    points, handedness, score = packed
+    return gesture_control.DetectedHand(HandLandmarks([Landmark(*point) for point in points]), handedness, score)
+
+def _camera_worker(camera_id, max_num_hands, conn, stop_event, show_debug):
+    """
+    Isi proses kamera: satu VideoCapture + satu MediaPipe Hands (GestureController biasa, termasuk
+    kualitas adaptif dan optical flow), lalu mengirim landmark setiap frame ke proses game.
+    Berjalan di proses sendiri sehingga inferensi tidak berebut GIL dengan render loop game mana pun.
+    max_num_hands: multiprocessing.Value yang diubah proses game saat mode game berganti.
+    """
+    game_logging.setup_logging()
+    controller = gesture_control.GestureController(max_num_hands=max_num_hands.value)
+    start = time.perf_counter()
+    try:
+        controller.load_model()
+        started = controller.start_camera(camera_id)
+        frame = controller.read_frame() if started else None
+    except Exception as e:
+        logger.exception("Camera process %s failed to start: %s", camera_id, e)
+        frame = None
+
+    try:
+        if frame is None:
+            conn.send((MSG_FAILED, None, None))
+            return
+        conn.send((MSG_READY, time.perf_counter() - start, frame.shape))
+        log_event(logger, "camera_process_ready", "Camera process ready.", camera=camera_id,
+                  load_ms=round((time.perf_counter() - start) * 1000))
+
+        while not stop_event.is_set():
+            controller.set_max_num_hands(max_num_hands.value)
+            frame = controller.read_frame()
+            if frame is None:
+                log_event(logger, "camera_read_failed", "Camera process failed to grab frame.", logging.ERROR, camera=camera_id)
+                break
+            image, hands = controller.detect_hands(frame)
+            conn.send((MSG_FRAME, image.shape, [_pack_hand(hand) for hand in hands],
+                       controller.last_frame_inferred, controller.last_frame_timestamp))
+            if show_debug and controller.show_debug_frame(image):
+                break
+    except (BrokenPipeError, EOFError, OSError, KeyboardInterrupt):
+        pass # Proses game sudah berhenti (atau Ctrl+C di mode host)
+    finally:
+        controller.stop_camera()
+        controller.close_debug_windows()
+        conn.close()
+        game_logging.shutdown_logging()
+
+class RemoteGestureController(gesture_control.GestureController):
+    """
+    GestureController yang capture dan inferensinya berjalan di proses terpisah (_camera_worker).
+    Proses game hanya menerima landmark lewat pipe, sehingga satu mesin multi-core bisa menjalankan
+    beberapa meja (satu kamera + satu game per meja) tanpa saling memperlambat.
+    Antarmukanya sama dengan GestureController: read_frame() mengembalikan LandmarkFrame terbaru
+    (tanpa menunggu) dan detect_hands() hanya membongkarnya; hitungan kursor/pinch tetap di kelas induk.
+    """
+    def __init__(self, camera_id=0, max_num_hands=1, show_debug=False):
+        super().__init__(max_num_hands=max_num_hands)
+        self.camera_id = camera_id
+        self.show_debug = show_debug
+        self._process = None
+        self._conn = None
+        self._stop_event = None
+        self._latest = None # LandmarkFrame terakhir yang diterima
+        self._max_num_hands_value = None # multiprocessing.Value bersama proses kamera
+        self.mp_hands = LANDMARK_NAMES # cv2/mediapipe hanya diimpor di proses kamera
+
+    def start_in_background(self, camera_id=None):
+        """Memulai proses kamera; kesiapannya dicek dengan is_ready() / has_failed() seperti biasa."""
+        if self._process is not None:
+            return
+        if camera_id is not None:
+            self.camera_id = camera_id
+        # spawn: proses kamera tidak mewarisi state pygame/thread dari proses game
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe(duplex=False)
+        self._stop_event = context.Event()
+        self._max_num_hands_value = context.Value("i", self.max_num_hands, lock=False)
+        self._process = context.Process(target=_camera_worker, name=f"camera-{self.camera_id}",
+                                        args=(self.camera_id, self._max_num_hands_value, child_conn, self._stop_event,
+                                              self.show_debug))
+        self._process.start()
+        child_conn.close() # Ujung kirim hanya dipegang proses kamera; EOF saat proses itu berhenti
+        super().start_in_background(self.camera_id)
+
+    def _background_startup(self, camera_id):
+        start = time.perf_counter()
+        try:
+            message, _, frame_shape = self._conn.recv()
+            self.startup_failed = message != MSG_READY
+            if not self.startup_failed:
+                self.last_frame_timestamp = time.perf_counter()
+                self._latest = LandmarkFrame(frame_shape, [], False, self.last_frame_timestamp)
+        except Exception as e:
+            logger.exception("Camera process %s failed to start: %s", camera_id, e)
+            self.startup_failed = True
+        self.startup_seconds = time.perf_counter() - start
+        self._ready_event.set()
+
+    def set_max_num_hands(self, max_num_hands):
+        """Meneruskan jumlah tangan ke proses kamera (model dibuat ulang di sana jika berubah)."""
+        self.max_num_hands = max_num_hands
+        if self._max_num_hands_value is not None:
+            self._max_num_hands_value.value = max_num_hands
+
+    def read_frame(self):
+        """
+        Mengambil hasil terbaru dari proses kamera tanpa menunggu; frame yang menumpuk dilewati.
+        Jika belum ada frame baru, frame terakhir dikembalikan lagi (tanpa flag inferensi).
+        Mengembalikan None jika proses kamera sudah berhenti.
+        """
+        inferred = False
+        received = None
+        try:
+            while self._conn.poll():
+                _, frame_shape, packed_hands, frame_inferred, timestamp = self._conn.recv()
+                inferred = inferred or frame_inferred
+                received = (frame_shape, packed_hands, timestamp)
+        except (EOFError, OSError):
+            return None
+        if received is not None:
+            frame_shape, packed_hands, timestamp = received
+            self._latest = LandmarkFrame(frame_shape, [_unpack_hand(packed) for packed in packed_hands], inferred, timestamp)
+            self.last_frame_timestamp = timestamp # Waktu capture di proses kamera: latensi ikut menghitung pipe + inferensi
+        elif not self._process.is_alive():
+            return None
+        else:
+            self._latest = self._latest._replace(inferred=False)
+        return self._latest
+
+    def detect_hands(self, frame):
+        """Inferensi sudah dijalankan di proses kamera; di sini hanya meneruskan hasilnya."""
+        self.last_frame_inferred = frame.inferred
+        return frame, frame.hands
+
+    def show_debug_frame(self, frame):
+        """Feed kamera (jika show_debug) ditampilkan oleh proses kamera sendiri."""
+        return False
+
+    def stop_camera(self):
+        """Menghentikan proses kamera (berhenti sendiri lewat stop_event, atau di-terminate jika macet)."""
+        if self._process is None:
+            return
+        self._stop_event.set()
+        self._conn.close()
+        self._process.join(STOP_TIMEOUT)
+        if self._process.is_alive():
+            logger.warning("Camera process %s did not stop, terminating.", self.camera_id)
+            self._process.terminate()
+            self._process.join()
+        self._process = None
@@ -1,5 +1,11 @@
+import logging
 import chess
 
+import move_history
+from game_logging import log_event
+
+logger = logging.getLogger(__name__)
+
 class ChessGame:
     def __init__(self):
         """
@@ -8,7 +14,10 @@ class ChessGame:
         """
         self.board = chess.Board()
         self.selected_square = None  # Untuk melacak kotak yang sedang dipilih oleh pemain
-        self.move_history_redo = [] # Menyimpan langkah yang di-undo untuk keperluan redo
+        self.history = move_history.MoveHistory(self.board) # Pohon variasi + checkpoint untuk undo/redo/lompat
+        self.position_version = 0 # Naik setiap kali posisi papan berubah (langkah, undo, redo, lompat, reset)
+        self._destinations = {} # Cache {kotak_asal: [kotak_tujuan, ...]} untuk posisi _destinations_version
+        self._destinations_version = None
 
     def get_board_state(self):
         """
@@ -23,17 +32,18 @@ class ChessGame:
         """
         return self.board.turn == chess.WHITE
 
-    def select_square(self, square_coords):
+    def select_square(self, square_coords, promotion=chess.QUEEN):
         """
         Memilih atau membatalkan pilihan sebuah kotak di papan, atau melakukan langkah.
         square_coords: String notasi catur (e.g., 'e2').
+        promotion: Bidak hasil promosi jika langkah ini mempromosikan pion (default Ratu).
         Mengembalikan True jika pemilihan/langkah berhasil, False jika tidak.
         """
         try:
             # Mengonversi string notasi catur ke objek square (integer)
             square = chess.Square(chess.parse_square(square_coords)) 
         except ValueError:
-            print(f"Invalid square coordinate: {square_coords}")
+            log_event(logger, "invalid_square", f"Invalid square coordinate: {square_coords}", logging.WARNING, square=square_coords)
             return False 
 
         # Jika belum ada bidak yang dipilih (ini adalah pemilihan pertama)
@@ -44,7 +54,7 @@ class ChessGame:
                 # chess.WHITE adalah True, chess.BLACK adalah False. self.board.turn adalah boolean
                 if (piece.color == self.board.turn): 
                     self.selected_square = square
-                    print(f"Selected: {chess.square_name(square)}")
+                    log_event(logger, "select", "Square selected.", logging.DEBUG, square=chess.square_name(square))
                     return True 
             return False # Tidak ada bidak milik pemain yang bisa dipilih, atau kotak kosong
 
@@ -54,23 +64,24 @@ class ChessGame:
             to_square = square
 
             # Cek promosi pion (jika pion mencapai baris terakhir)
-            # Asumsi promosi ke Ratu (Queen) untuk penyederhanaan
+            # Default promosi ke Ratu (Queen); gestur belum punya cara memilih bidak lain
             move = None
             if self.board.piece_at(from_square) and self.board.piece_at(from_square).piece_type == chess.PAWN and \
                (chess.square_rank(to_square) == 7 or chess.square_rank(to_square) == 0): # Cek baris terakhir untuk promosi
-                move = chess.Move(from_square, to_square, promotion=chess.QUEEN)
+                move = chess.Move(from_square, to_square, promotion=promotion)
             else:
                 move = chess.Move(from_square, to_square)
 
             if move in self.board.legal_moves:
                 self.board.push(move) # Lakukan langkah
                 self.selected_square = None # Reset pilihan
-                self.move_history_redo = [] # Kosongkan history redo saat langkah baru dilakukan
-                print(f"Moved {chess.square_name(from_square)} to {chess.square_name(to_square)}")
+                self.history.record_move(self.board) # Lanjutan lama (setelah undo) tetap disimpan sebagai variasi
+                self.position_version += 1
+                log_event(logger, "move", "Move played.", move=move.uci())
                 return True 
             else:
                 # Jika langkah tidak sah, atau mencoba klik kotak yang sama lagi
-                print(f"Illegal move: {chess.square_name(from_square)} to {chess.square_name(to_square)}")
+                log_event(logger, "illegal_move", "Illegal move.", move=move.uci())
                 self.selected_square = None # Batalkan pilihan
                 return False 
 
@@ -81,11 +92,12 @@ class ChessGame:
         """
         if self.board.move_stack: # Cek apakah ada langkah yang bisa di-undo
             last_move = self.board.pop() # Batalkan langkah terakhir
-            self.move_history_redo.append(last_move) # Tambahkan ke history redo
-            print(f"Undone move: {last_move.uci()}")
+            self.history.step_back() # Langkah tetap ada di pohon sebagai lanjutan untuk redo
+            self.position_version += 1
+            log_event(logger, "undo", "Move undone.", move=last_move.uci())
             self.selected_square = None # Pastikan tidak ada bidak yang dipilih setelah undo
             return True
-        print("No moves to undo.")
+        log_event(logger, "undo", "No moves to undo.", logging.DEBUG)
         return False
 
     def redo_move(self):
@@ -93,30 +105,52 @@ class ChessGame:
         Mengulang langkah yang baru saja di-undo.
         Mengembalikan True jika berhasil, False jika tidak ada langkah untuk di-redo.
         """
-        if self.move_history_redo: # Cek apakah ada langkah yang bisa di-redo
-            next_move = self.move_history_redo.pop() # Ambil langkah terakhir dari history redo
+        next_move = self.history.next_move() # Lanjutan pilihan di pohon variasi
+        if next_move is not None: # Cek apakah ada langkah yang bisa di-redo
             # Penting: Pastikan langkah yang di-redo valid di posisi papan saat ini.
             if next_move in self.board.legal_moves: # Pastikan legal di posisi saat ini
                 self.board.push(next_move) # Lakukan langkah
-                print(f"Redone move: {next_move.uci()}")
+                self.history.step_forward()
+                self.position_version += 1
+                log_event(logger, "redo", "Move redone.", move=next_move.uci())
                 self.selected_square = None
                 return True
             else:
-                # Jika langkah tidak lagi valid (misal karena state board berubah),
-                # kembalikan move ke history_redo dan cetak pesan
-                self.move_history_redo.append(next_move) # Kembalikan ke history redo
-                print(f"Cannot redo move {next_move.uci()} - not a legal move in current position.")
+                # Jika langkah tidak lagi valid (misal papan diubah di luar riwayat), cetak pesan
+                log_event(logger, "redo", "Cannot redo move, not legal in the current position.", logging.WARNING, move=next_move.uci())
                 return False
-        print("No moves to redo.")
+        log_event(logger, "redo", "No moves to redo.", logging.DEBUG)
         return False
 
+    def go_to_ply(self, ply):
+        """
+        Lompat ke ply mana pun di timeline (0 = posisi awal). Satu langkah maju/mundur memakai
+        redo/undo biasa; lompatan lebih jauh memulihkan checkpoint terdekat lalu me-replay beberapa
+        langkah saja (lihat move_history.MoveHistory.restore_into). Ply di luar timeline dipotong
+        ke ujungnya. Mengembalikan True jika posisi berubah.
+        """
+        ply = max(0, min(ply, len(self.history.timeline()) - 1))
+        if ply == self.history.ply:
+            return False
+        if ply == self.history.ply - 1:
+            return self.undo_move()
+        if ply == self.history.ply + 1:
+            return self.redo_move()
+        self.history.restore_into(self.board, ply) # Objek board tetap sama; referensi lain ikut terbarui
+        self.selected_square = None
+        self.position_version += 1
+        log_event(logger, "jump", "Jumped to ply.", logging.DEBUG, ply=self.history.ply)
+        return True
+
+    def get_timeline_info(self):
+        """Mengembalikan (ply_sekarang, total_ply_timeline, ply_bercabang) untuk scrubber di sidebar."""
+        return self.history.ply, len(self.history.timeline()) - 1, self.history.branch_plies()
+
     def get_legal_moves(self, square_name=None):
         """
         Mengembalikan langkah-langkah yang sah untuk bidak di kotak tertentu,
         atau semua langkah sah jika tidak ada square_name.
         """
-        legal_moves_for_piece = []
-        
         # Jika tidak ada square_name spesifik, dan ada bidak yang sedang dipilih
         if square_name is None and self.selected_square:
             square = self.selected_square # Gunakan square yang sudah dipilih (dalam bentuk integer)
@@ -129,20 +163,39 @@ class ChessGame:
         else:
             return [] # Jika tidak ada square_name dan tidak ada yang dipilih
 
-        for move in self.board.legal_moves:
-            if move.from_square == square:
-                legal_moves_for_piece.append(move.to_square)
-        return legal_moves_for_piece
+        return list(self._legal_destinations().get(square, ()))
+
+    def _legal_destinations(self):
+        """
+        Peta kotak asal -> kotak tujuan sah untuk posisi sekarang. Dibangun sekali per posisi
+        (satu kali generate langkah untuk semua bidak), sehingga hover/pinch berikutnya cukup lookup.
+        Promosi muncul sekali per bidak promosi, sama seperti board.legal_moves.
+        """
+        if self._destinations_version != self.position_version:
+            destinations = {}
+            for move in self.board.legal_moves:
+                destinations.setdefault(move.from_square, []).append(move.to_square)
+            self._destinations = destinations
+            self._destinations_version = self.position_version
+        return self._destinations
+
+    def prefetch_legal_moves(self):
+        """Menghitung cache langkah sah posisi ini lebih awal (misal saat kursor melayang di atas bidak)."""
+        self._legal_destinations()
     
-    def reset_game(self):
+    def reset_game(self, fen=None):
         """
-        Mengatur ulang papan catur ke posisi awal.
-        Juga membersihkan history redo.
+        Mengatur ulang papan catur ke posisi awal (atau ke posisi FEN tertentu, misal untuk benchmark).
+        Juga membersihkan riwayat (pohon variasi).
         """
-        self.board.reset()
+        if fen is None:
+            self.board.reset()
+        else:
+            self.board.set_fen(fen)
         self.selected_square = None
-        self.move_history_redo = [] # Kosongkan history redo saat reset
-        print("Game reset.")
+        self.history.reset(self.board) # Kosongkan pohon variasi saat reset
+        self.position_version += 1
+        log_event(logger, "reset", "Game reset.")
 
     def get_game_status(self):
         """
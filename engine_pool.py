@@ -0,0 +1,296 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import random
+import shutil
+import time
+
+import chess
+import chess.engine
+
+from game_logging import log_event
+
+logger = logging.getLogger(__name__)
+
+# Lokasi engine UCI yang dicoba (berurutan). Stockfish bisa di-build dari source di folder stockfish/.
+ENGINE_PATH_ENV = "CHESS_ENGINE_PATH"
+ENGINE_PATH_CANDIDATES = [
+    os.path.join("stockfish", "stockfish", "src", "stockfish"),
+    os.path.join("stockfish", "stockfish", "src", "stockfish.exe"),
+]
+
+ENGINE_POOL_SIZE = 2 # Jumlah proses engine; bersama ENGINE_OPTIONS membatasi total core yang dipakai
+ENGINE_OPTIONS = {"Threads": 1, "Hash": 64} # Per proses engine
+MAX_QUEUED_JOBS = 16 # Jika antrian penuh, job prioritas terendah (paling baru) dibuang; langkah AI tidak pernah
+ENGINE_MAX_ATTEMPTS = 2 # Job yang engine-nya mati sebanyak ini: langkah AI jatuh ke langkah acak, analisis gagal
+
+# Prioritas job (angka kecil = lebih dulu). Job dengan prioritas sama dilayani FIFO.
+PRIORITY_AI_MOVE = 0 # Langkah AI yang sedang ditunggu pemain
+PRIORITY_HINT = 1 # Hint yang diminta pemain lewat tombol
+PRIORITY_ANALYSIS = 2 # Analisis background; boleh di-preempt oleh prioritas lebih tinggi
+
+JOB_PLAY = "play" # Hasil: chess.Move (atau None jika tidak ada langkah)
+JOB_ANALYSE = "analyse" # Hasil: None; info dialirkan lewat callback on_info
+
+class EngineQueueFullError(chess.engine.EngineError):
+    """Job ditolak karena antrian penuh dan job ini yang paling tidak penting."""
+
+def find_engine_path():
+    """Mencari executable engine UCI: env CHESS_ENGINE_PATH, build lokal Stockfish, lalu PATH."""
+    candidates = [os.environ.get(ENGINE_PATH_ENV)] + ENGINE_PATH_CANDIDATES + [shutil.which("stockfish")]
+    for path in candidates:
+        if path and os.path.isfile(path) and os.access(path, os.X_OK):
+            return path
+    return None
+
+class EngineJob:
+    """
+    Satu permintaan ke pool engine. Hasil diambil dengan `await job.future`.
+    deadline: waktu absolut (time.perf_counter) setelah itu job tidak lagi berguna; job yang belum
+              mulai dibuang, dan batas waktu pencarian dipotong agar selesai sebelum deadline.
+    key: job baru dengan key yang sama membatalkan job lama (permintaan basi, misal posisi berubah).
+    """
+    def __init__(self, kind, board, priority, time_limit, deadline=None, key=None, multipv=1, on_info=None):
+        self.kind = kind
+        self.board = board.copy()
+        self.priority = priority
+        self.time_limit = time_limit
+        self.deadline = deadline
+        self.key = key
+        self.multipv = multipv
+        self.on_info = on_info
+        self.future = asyncio.get_running_loop().create_future()
+        self.task = None # Task pencarian saat job sedang dijalankan worker
+        self.preempted = False
+        self.attempts = 0 # Berapa kali engine mati saat menjalankan job ini
+
+    @property
+    def done(self):
+        return self.future.done()
+
+    def cancel(self):
+        """Membatalkan job (belum mulai: dilewati worker; sedang jalan: pencarian engine dihentikan)."""
+        self.future.cancel()
+        if self.task is not None:
+            self.task.cancel()
+
+    def remaining_time(self, now):
+        if self.deadline is None:
+            return self.time_limit
+        return min(self.time_limit, self.deadline - now)
+
+class EnginePool:
+    """
+    Pool proses engine UCI bersama untuk langkah AI, hint, dan analisis background.
+    Job masuk ke antrian prioritas; ENGINE_POOL_SIZE worker (satu proses engine per worker,
+    Threads=1) mengambil job satu per satu, sehingga pemakaian CPU tetap terbatas berapa pun
+    banyaknya permintaan dari UI. Job analisis yang sedang berjalan di-preempt (dikembalikan ke
+    antrian) saat ada job prioritas lebih tinggi dan semua worker sibuk.
+    Tanpa engine UCI, langkah AI jatuh ke AI sederhana (langkah acak legal); hint dan analisis tidak tersedia.
+    """
+    def __init__(self, size=ENGINE_POOL_SIZE, engine_path=None):
+        self.size = size
+        self.engine_path = engine_path or find_engine_path()
+        self._heap = []
+        self._sequence = itertools.count()
+        self._jobs_available = None
+        self._workers = []
+        self._running = {} # {worker_id: EngineJob}
+        self._by_key = {}
+        if self.engine_path is None:
+            logger.info("No UCI engine found, AI falls back to random moves; hints and analysis are unavailable.")
+
+    @property
+    def has_engine(self):
+        return self.engine_path is not None
+
+    def start(self):
+        """Memulai worker (harus dipanggil dari dalam event loop asyncio). Proses engine dibuka saat job pertama."""
+        if self._workers:
+            return
+        self._jobs_available = asyncio.Event()
+        self._workers = [asyncio.create_task(self._worker(worker_id)) for worker_id in range(self.size)]
+
+    def submit(self, kind, board, priority, time_limit, deadline=None, key=None, multipv=1, on_info=None):
+        """
+        Memasukkan job ke antrian dan mengembalikan EngineJob-nya. Jika antrian penuh, job lain yang
+        kalah penting dibatalkan, atau job ini sendiri ditolak (future berisi EngineQueueFullError).
+        Job langkah AI (pemain sedang menunggu) tidak pernah dibuang maupun ditolak.
+        """
+        self.start()
+        if key is not None and key in self._by_key:
+            self._by_key.pop(key).cancel() # Permintaan lama dengan key sama sudah basi
+        job = EngineJob(kind, board, priority, time_limit, deadline, key, multipv, on_info)
+        if self._queue_full() and not self._make_room(job):
+            job.future.set_exception(EngineQueueFullError("Engine queue full"))
+            log_event(logger, "engine_job_rejected", "Engine queue full, rejecting job.", logging.WARNING,
+                      kind=job.kind, priority=job.priority)
+            return job
+        if key is not None:
+            self._by_key[key] = job
+        self._push(job)
+        self._maybe_preempt(job)
+        return job
+
+    def _queue_full(self):
+        return sum(1 for _, _, queued in self._heap if not queued.done) >= MAX_QUEUED_JOBS
+
+    def _make_room(self, job):
+        """
+        Membatalkan job antrian yang kalah penting dari job baru (prioritas lebih rendah, atau sama
+        tapi lebih baru). Mengembalikan False jika tidak ada; langkah AI tetap masuk walau antrian penuh.
+        """
+        candidates = [entry for entry in self._heap if not entry[2].done and entry[0] != PRIORITY_AI_MOVE]
+        if candidates and (max(candidates)[0] > job.priority or job.priority == PRIORITY_AI_MOVE):
+            dropped = max(candidates)[2]
+            dropped.cancel()
+            log_event(logger, "engine_job_dropped", "Engine queue full, dropping job.", logging.WARNING,
+                      kind=dropped.kind, priority=dropped.priority)
+            return True
+        return job.priority == PRIORITY_AI_MOVE
+
+    def _push(self, job):
+        heapq.heappush(self._heap, (job.priority, next(self._sequence), job))
+        self._jobs_available.set()
+
+    def _maybe_preempt(self, job):
+        """Jika semua worker sibuk, hentikan satu job analisis berprioritas lebih rendah agar job ini segera jalan."""
+        if len(self._running) < self.size:
+            return
+        candidates = [running for running in self._running.values()
+                      if running.kind == JOB_ANALYSE and running.priority > job.priority and not running.preempted]
+        if candidates:
+            victim = max(candidates, key=lambda running: running.priority)
+            victim.preempted = True
+            victim.task.cancel()
+
+    async def _next_job(self):
+        while True:
+            while self._heap:
+                _, _, job = heapq.heappop(self._heap)
+                if not job.done:
+                    return job
+            self._jobs_available.clear()
+            await self._jobs_available.wait()
+
+    async def _worker(self, worker_id):
+        engine = None
+        try:
+            while True:
+                job = await self._next_job()
+                now = time.perf_counter()
+                if job.remaining_time(now) <= 0:
+                    job.future.cancel()
+                    log_event(logger, "engine_job_expired", "Engine job expired before it started.", logging.DEBUG,
+                              kind=job.kind, priority=job.priority)
+                    continue
+
+                if engine is None and self.engine_path is not None:
+                    engine = await self._open_engine()
+                    if job.done: # Dibatalkan selama engine dibuka
+                        continue
+
+                self._running[worker_id] = job
+                task = job.task = asyncio.create_task(self._run(job, engine))
+                try:
+                    await asyncio.wait({task}) # Tidak ikut melempar saat task dibatalkan (cancel/preempt)
+                finally:
+                    self._running.pop(worker_id, None)
+                    if not task.done():
+                        task.cancel() # Worker sendiri dibatalkan (pool ditutup)
+                        job.future.cancel()
+                if not task.cancelled() and isinstance(task.exception(), chess.engine.EngineTerminatedError):
+                    log_event(logger, "engine_terminated", "Engine process died, reopening for the next job.",
+                              logging.WARNING, worker=worker_id, kind=job.kind)
+                    self._close_dead_engine(engine)
+                    engine = None # Dibuka ulang saat job berikutnya
+                    if not job.done:
+                        job.task = None
+                        job.preempted = False
+                        job.attempts += 1
+                        self._push(job) # Dicoba ulang dengan engine baru (deadline tetap berlaku)
+                        continue
+                self._finish(job, task)
+        finally:
+            if engine is not None:
+                try:
+                    await engine.quit()
+                except (chess.engine.EngineError, asyncio.CancelledError):
+                    pass
+
+    def _finish(self, job, task):
+        """Meneruskan hasil task pencarian ke future job (atau mengantrikan ulang job yang di-preempt)."""
+        job.task = None
+        if not job.done:
+            if task.cancelled():
+                if job.preempted:
+                    job.preempted = False
+                    self._push(job) # Dijalankan ulang dari awal setelah job prioritas tinggi selesai
+                    return
+                job.future.cancel()
+            elif task.exception() is not None:
+                job.future.set_exception(task.exception())
+            else:
+                job.future.set_result(task.result())
+        if job.key is not None and self._by_key.get(job.key) is job:
+            del self._by_key[job.key]
+
+    def _close_dead_engine(self, engine):
+        """Menutup transport engine yang prosesnya sudah mati (pipe dan objek proses tidak bocor)."""
+        transport = getattr(engine, "transport", None)
+        if transport is None:
+            return
+        try:
+            transport.close()
+        except (OSError, RuntimeError) as e:
+            logger.debug("Error closing dead engine transport: %s", e)
+
+    async def _open_engine(self):
+        try:
+            _, engine = await chess.engine.popen_uci(self.engine_path)
+            await engine.configure({name: value for name, value in ENGINE_OPTIONS.items() if name in engine.options})
+            return engine
+        except (OSError, chess.engine.EngineError) as e:
+            logger.error("Error starting engine %s: %s", self.engine_path, e)
+            self.engine_path = None
+            return None
+
+    async def _run(self, job, engine):
+        time_limit = max(0.01, job.remaining_time(time.perf_counter()))
+        if engine is not None and job.attempts >= ENGINE_MAX_ATTEMPTS:
+            engine = None # Posisi ini terus membuat engine mati; jangan coba lagi
+        if job.kind == JOB_PLAY:
+            if engine is None:
+                return await self._random_move(job.board, time_limit)
+            result = await engine.play(job.board, chess.engine.Limit(time=time_limit))
+            return result.move
+
+        if engine is None:
+            raise chess.engine.EngineError("No UCI engine available")
+        with await engine.analysis(job.board, chess.engine.Limit(time=time_limit), multipv=job.multipv) as analysis:
+            async for info in analysis:
+                if job.on_info is not None and not job.done: # Job dibatalkan -> info basi tidak diteruskan
+                    job.on_info(info)
+        return None
+
+    async def _random_move(self, board, thinking_time):
+        """AI sederhana (fallback tanpa engine): jeda 'berpikir' lalu langkah legal acak."""
+        await asyncio.sleep(thinking_time)
+        legal_moves = list(board.legal_moves)
+        return random.choice(legal_moves) if legal_moves else None
+
+    async def close(self):
+        """Membatalkan semua job dan worker, lalu menutup proses engine."""
+        for _, _, job in self._heap:
+            job.cancel()
+        for job in list(self._running.values()):
+            job.cancel()
+        self._heap = []
+        for worker in self._workers:
+            worker.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._by_key.clear()
@@ -0,0 +1,94 @@
+import logging
+
+import chess
+
+import chess_game
+import engine_pool
+from game_logging import log_event
+
+logger = logging.getLogger(__name__)
+
+EXHIBITION_BOARD_COUNT = 6 # Jumlah papan yang dimainkan operator sekaligus (simultan)
+AI_THINKING_TIME = 1.0 # Batas waktu berpikir per langkah (detik); sama dengan AI di mode VS COMPUTER
+
+class ExhibitionBoard:
+    """
+    Satu papan dalam mode eksibisi: ChessGame sendiri plus state seleksi/klik GUI-nya,
+    sehingga operator bisa berpindah papan di tengah permainan tanpa kehilangan pilihan bidak.
+    """
+    def __init__(self, index, ai_color):
+        self.index = index
+        self.chess_game = chess_game.ChessGame()
+        self.ai_color = ai_color
+
+        self.selected_square_gui = None
+        self.possible_moves_gui = []
+        self.click_state = "IDLE"
+
+    @property
+    def board(self):
+        return self.chess_game.get_board_state()
+
+    def clear_selection(self):
+        self.chess_game.selected_square = None
+        self.selected_square_gui = None
+        self.possible_moves_gui = []
+        self.click_state = "IDLE"
+
+    def reset(self):
+        self.chess_game.reset_game()
+        self.clear_selection()
+
+    def is_ai_turn(self):
+        return self.board.turn == self.ai_color and not self.board.is_game_over()
+
+class AIWorkerPool:
+    """
+    Penjadwal balasan AI untuk semua papan eksibisi di atas pool engine bersama (engine_pool.EnginePool).
+    Setiap papan punya key job sendiri sehingga paling banyak satu permintaan tertunda per papan, dan
+    job berprioritas sama dilayani FIFO: giliran dibagi adil dan satu papan tidak bisa memonopoli worker.
+    """
+    def __init__(self, pool, thinking_time=AI_THINKING_TIME):
+        self.pool = pool
+        self.thinking_time = thinking_time
+        self._jobs = {} # {indeks_papan: (EngineJob, position_version saat diminta)}
+
+    def request_move(self, exhibition_board):
+        """Meminta langkah AI untuk papan ini jika memang giliran AI dan belum ada permintaan untuk posisi ini."""
+        if not exhibition_board.is_ai_turn():
+            return
+        version = exhibition_board.chess_game.position_version
+        pending = self._jobs.get(exhibition_board.index)
+        if pending is not None and not pending[0].done and pending[1] == version:
+            return
+        job = self.pool.submit(engine_pool.JOB_PLAY, exhibition_board.board, engine_pool.PRIORITY_AI_MOVE,
+                               self.thinking_time, key=("exhibition", exhibition_board.index))
+        job.future.add_done_callback(lambda future: self._apply_move(exhibition_board, job, version, future))
+        self._jobs[exhibition_board.index] = (job, version)
+
+    def cancel(self, exhibition_board):
+        """Membatalkan balasan yang tertunda untuk papan ini (misal setelah Undo/Restart)."""
+        pending = self._jobs.pop(exhibition_board.index, None)
+        if pending is not None:
+            pending[0].cancel()
+
+    def _apply_move(self, exhibition_board, job, version, future):
+        if self._jobs.get(exhibition_board.index, (None,))[0] is job:
+            del self._jobs[exhibition_board.index]
+        if future.cancelled() or future.exception() is not None or future.result() is None:
+            return
+        if version != exhibition_board.chess_game.position_version or not exhibition_board.is_ai_turn():
+            logger.debug("Dropping stale AI reply for board %s.", exhibition_board.index)
+            return
+
+        move = future.result()
+        exhibition_board.clear_selection()
+        exhibition_board.chess_game.select_square(chess.square_name(move.from_square))
+        exhibition_board.chess_game.select_square(chess.square_name(move.to_square), move.promotion or chess.QUEEN)
+        log_event(logger, "exhibition_ai_move", "Exhibition AI moved.", board=exhibition_board.index, move=move.uci())
+
+    async def close(self):
+        """Membatalkan semua balasan yang tertunda (worker dan proses engine ditutup oleh pool)."""
+        for job, _ in self._jobs.values():
+            job.cancel()
+        self._jobs.clear()
@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+ACTIVE_FPS = 60 # Target FPS saat ada perubahan (kursor bergerak, bidak dipindah, dll.)
+IDLE_FPS = 15 # FPS render rendah saat tidak ada yang berubah
+IDLE_AFTER_SECONDS = 1.0 # Berapa lama tanpa aktivitas sebelum render turun ke IDLE_FPS
+HINTED_IDLE_AFTER_SECONDS = 0.25 # Sama, tetapi untuk layar yang ditandai idle_hint (misal homepage)
+
+class FrameScheduler:
+    """
+    Penjadwal frame untuk game loop asyncio.
+    Menggantikan kombinasi clock.tick(FPS) (yang memblokir event loop) + asyncio.sleep(0.01):
+    setiap frame punya deadline, dan scheduler hanya tidur sisa anggaran waktu secara kooperatif
+    sehingga task lain (misal AI) tetap mendapat giliran.
+    Loop (baca kamera, inferensi, input) selalu berjalan pada active_fps; hanya render yang
+    diturunkan ke idle_fps setelah beberapa saat tanpa aktivitas (lihat should_render).
+    """
+    def __init__(self, active_fps=ACTIVE_FPS, idle_fps=IDLE_FPS, idle_after=IDLE_AFTER_SECONDS):
+        self.active_fps = active_fps
+        self.idle_fps = idle_fps
+        self.idle_after = idle_after
+
+        self.idle_hint = False # Diset dari luar untuk layar statis (homepage); render boleh turun lebih cepat
+        self._last_activity = time.perf_counter()
+        self._last_render = None
+        self._frame_start = None
+        self.last_work_ms = 0.0 # Lama kerja frame terakhir (tanpa waktu tidur)
+        self.current_fps = active_fps
+
+    def mark_activity(self):
+        """Menandai bahwa ada sesuatu yang berubah, sehingga render kembali ke FPS penuh."""
+        self._last_activity = time.perf_counter()
+
+    def set_idle_hint(self, idle):
+        """
+        Memberi petunjuk bahwa layar ini statis (misal homepage), sehingga render boleh turun ke FPS
+        rendah lebih cepat. Aktivitas terbaru (mark_activity) tetap menang atas petunjuk ini.
+        """
+        self.idle_hint = idle
+
+    def _target_fps(self, now):
+        idle_after = min(self.idle_after, HINTED_IDLE_AFTER_SECONDS) if self.idle_hint else self.idle_after
+        if now - self._last_activity > idle_after:
+            return self.idle_fps
+        return self.active_fps
+
+    def should_render(self):
+        """
+        True jika frame ini perlu dirender: selalu saat aktif, atau sekali tiap 1/idle_fps saat idle.
+        Frame yang dilewati tetap menjalankan kamera dan input, hanya tanpa menggambar.
+        """
+        now = time.perf_counter()
+        self.current_fps = self._target_fps(now)
+        if self._last_render is None or self.current_fps == self.active_fps or \
+           now - self._last_render >= 1.0 / self.current_fps:
+            self._last_render = now
+            return True
+        return False
+
+    def begin_frame(self):
+        """Dipanggil di awal setiap iterasi game loop."""
+        self._frame_start = time.perf_counter()
+
+    async def end_frame(self):
+        """
+        Dipanggil di akhir setiap iterasi game loop. Tidur (asyncio.sleep) hanya selama sisa
+        anggaran frame. Jika frame sudah terlambat, tetap yield sekali (sleep(0)) agar task lain jalan.
+        Mengembalikan lama kerja frame dalam milidetik.
+        """
+        now = time.perf_counter()
+        if self._frame_start is None:
+            self._frame_start = now
+        self.last_work_ms = (now - self._frame_start) * 1000
+
+        deadline = self._frame_start + 1.0 / self.active_fps
+        await asyncio.sleep(max(0.0, deadline - now))
+        return self.last_work_ms
@@ -0,0 +1,115 @@
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+from collections import deque
+
+LOG_QUEUE_SIZE = 10000 # Batas antrian; jika penuh, record baru dibuang (tidak pernah memblokir frame)
+LOG_RING_SIZE = 2000 # Jumlah record terakhir yang disimpan di memori untuk dump post-mortem
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+_listener = None
+_queue_handler = None
+_ring_handler = None
+
+class StructuredFormatter(logging.Formatter):
+    """Formatter yang menambahkan field terstruktur (event, square, move, timing, ...) sebagai key=value."""
+    def format(self, record):
+        text = super().format(record)
+        event = getattr(record, "event", None)
+        fields = getattr(record, "fields", None)
+        parts = []
+        if event:
+            parts.append(f"event={event}")
+        if fields:
+            parts.extend(f"{key}={value}" for key, value in fields.items())
+        if parts:
+            text = f"{text} | {' '.join(parts)}"
+        return text
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler yang membuang record saat antrian penuh, alih-alih memblokir atau error."""
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class RingBufferHandler(logging.Handler):
+    """Menyimpan N record terakhir (sudah diformat) di memori untuk dump post-mortem."""
+    def __init__(self, capacity=LOG_RING_SIZE):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record):
+        self.records.append(self.format(record))
+
+def setup_logging(level=logging.INFO, stream=sys.stdout):
+    """
+    Memasang logging non-blocking untuk seluruh aplikasi: logger di thread game hanya memasukkan
+    record ke antrian; thread background (QueueListener) yang menulis ke terminal dan ring buffer.
+    Aman dipanggil lebih dari sekali.
+    """
+    global _listener, _queue_handler, _ring_handler
+    if _listener is not None:
+        return
+
+    formatter = StructuredFormatter(LOG_FORMAT)
+    console_handler = logging.StreamHandler(stream)
+    console_handler.setFormatter(formatter)
+    _ring_handler = RingBufferHandler()
+    _ring_handler.setFormatter(formatter)
+
+    _queue_handler = DroppingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, console_handler, _ring_handler,
+                                               respect_handler_level=True)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(_queue_handler)
+    _listener.start()
+
+def shutdown_logging():
+    """Menghentikan thread listener setelah semua record di antrian ditulis."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    logging.getLogger().removeHandler(_queue_handler)
+    if _queue_handler.dropped:
+        print(f"Logging: {_queue_handler.dropped} records dropped because the log queue was full.", file=sys.stderr)
+    _listener = None
+
+def log_event(logger, event, message, level=logging.INFO, **fields):
+    """
+    Mencatat record terstruktur. Level dicek lebih dulu sehingga record yang difilter hampir
+    tanpa biaya. Pesan sebaiknya statis; nilai per kejadian masuk ke field, contoh: log_event(logger, "move", "Move played.", move="e2e4").
+    """
+    if logger.isEnabledFor(level):
+        logger.log(level, message, extra={"event": event, "fields": fields})
+
+def get_recent_records():
+    """Mengembalikan salinan record terakhir dari ring buffer (list string)."""
+    if _ring_handler is None:
+        return []
+    return list(_ring_handler.records)
+
+def dump_recent_records(path=None):
+    """
+    Menulis isi ring buffer ke file (default: chess_gesture_postmortem_<timestamp>.log).
+    Mengembalikan path file, atau None jika tidak ada yang ditulis.
+    """
+    records = get_recent_records()
+    if not records:
+        return None
+    if path is None:
+        path = f"chess_gesture_postmortem_{time.strftime('%Y%m%d_%H%M%S')}.log"
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(records))
+        f.write("\n")
+    return path
@@ -1,19 +1,97 @@
-import cv2
-import mediapipe as mp
+import logging
 import math
+import sys
+import threading
+import time
+from collections import namedtuple
+
+import quality_control
+import hand_tracker
+from game_logging import log_event
+
+logger = logging.getLogger(__name__)
+
+# cv2 dan mediapipe sengaja tidak diimpor di sini: impor keduanya (terutama mediapipe)
+# memakan waktu lama, jadi dilakukan di thread background lewat _import_vision_modules()
+# supaya jendela game bisa tampil lebih dulu.
+cv2 = None
+mp = None
+
+def _import_vision_modules():
+    """Mengimpor cv2 dan mediapipe sekali saja (lazy), lalu menyimpannya di global modul."""
+    global cv2, mp
+    if cv2 is None:
+        import cv2 as _cv2
+        cv2 = _cv2
+    if mp is None:
+        import mediapipe as _mp
+        mp = _mp
+
+def _camera_backends():
+    """
+    Mengembalikan urutan backend kamera (nama, id) yang dicoba sesuai platform.
+    CAP_DSHOW hanya ada artinya di Windows, jadi tidak dicoba di Linux/macOS.
+    """
+    if sys.platform.startswith("win"):
+        names = ["CAP_DSHOW", "CAP_MSMF"]
+    elif sys.platform == "darwin":
+        names = ["CAP_AVFOUNDATION"]
+    else:
+        names = ["CAP_V4L2"]
+    names.append("CAP_ANY") # Fallback terakhir: biarkan OpenCV memilih sendiri
+    return [(name, getattr(cv2, name)) for name in names if hasattr(cv2, name)]
+
+# Satu tangan hasil deteksi: landmarks MediaPipe, label handedness ("Left"/"Right") dan skornya
+DetectedHand = namedtuple("DetectedHand", ["landmarks", "handedness", "score"])
+
+# Cara membagi tangan ke pemain di mode dua tangan
+ASSIGN_BY_SCREEN_HALF = "screen_half" # Tangan di separuh kiri layar -> pemain 0, kanan -> pemain 1
+ASSIGN_BY_HANDEDNESS = "handedness" # Tangan kiri -> pemain 0, tangan kanan -> pemain 1
 
 class GestureController:
-    def __init__(self, detection_confidence=0.7, tracking_confidence=0.5):
-        # Inisialisasi MediaPipe Hands
-        self.mp_hands = mp.solutions.hands # Mengakses modul hands dari MediaPipe
-        self.hands = self.mp_hands.Hands( # Membuat objek Hands detection
-            static_image_mode=False, # False berarti untuk video stream, True untuk gambar statis
-            max_num_hands=1, # Kita cuma mau deteksi satu tangan aja
-            min_detection_confidence=detection_confidence, # Konfidensi deteksi minimum
-            min_tracking_confidence=tracking_confidence # Konfidensi pelacakan minimum
-        )
-        self.mp_drawing = mp.solutions.drawing_utils # Modul buat gambar landmark tangan
+    def __init__(self, detection_confidence=0.7, tracking_confidence=0.5, max_num_hands=1):
+        """
+        max_num_hands: Jumlah tangan maksimum per frame. Gunakan 2 untuk mode dua pemain:
+                       satu kali inferensi MediaPipe melayani kedua tangan sekaligus.
+                       Bisa diubah saat berjalan lewat set_max_num_hands.
+        """
+        self.detection_confidence = detection_confidence
+        self.tracking_confidence = tracking_confidence
+        self.max_num_hands = max_num_hands
+
+        # Objek MediaPipe dibuat di load_model(), bukan di sini (lihat _import_vision_modules)
+        self.mp_hands = None
+        self.hands = None
+        self.mp_drawing = None
         self.cap = None # Variabel buat objek VideoCapture (kamera), awalnya None
+        self.backend_name = None # Nama backend kamera yang berhasil dipakai
+        self.camera_format = None # quality_control.CameraFormat hasil negosiasi, atau None (default kamera)
+
+        # Kualitas adaptif: resolusi capture, frekuensi inferensi, dan kompleksitas model
+        self.quality = quality_control.QualityController()
+        self.model_complexity = self.quality.level.model_complexity
+        self._frame_index = 0
+        self._last_hands = [] # Hasil inferensi terakhir (fallback jika optical flow tidak aktif)
+        self.last_frame_inferred = False # True jika frame terakhir diproses dengan inferensi penuh (bukan optical flow)
+        self.flow_tracker = hand_tracker.OpticalFlowHandTracker() # Melacak jempol/telunjuk di antara inferensi
+        self.use_optical_flow = True
+        self._flip_ms = 0.0 # Lama mirror frame terakhir (bagian dari waktu komputasi, bukan tunggu kamera)
+        self.last_frame_timestamp = None # time.perf_counter() saat frame terakhir diterima dari kamera
+        self._model_thread = None # Thread yang sedang membuat ulang model (ganti model_complexity / max_num_hands)
+        self._pending_hands = None # ((model_complexity, max_num_hands), Hands) siap ditukar di thread frame
+        self._hands_config = None # (model_complexity, max_num_hands) model yang sedang dipakai
+        self._failed_hands_config = None # Konfigurasi yang gagal dibuat; tidak dicoba ulang setiap frame
+        self._cap_lock = threading.Lock() # Dipegang thread resize selama cap.set; read_frame tidak menunggunya
+        self._resize_thread = None # Thread yang sedang mengganti resolusi capture
+        self._capture_size = None # (lebar, tinggi) target resolusi capture
+        self._capture_resized = False # Diset thread resize; flow_tracker di-reset di thread frame
+        self._last_frame = None # Frame terakhir (sudah di-mirror), dipakai ulang selama resize berjalan
+
+        # Status startup di background
+        self._startup_thread = None
+        self._ready_event = threading.Event()
+        self.startup_failed = False
+        self.startup_seconds = None # Lama waktu load model + buka kamera
 
         # Thresholds for gesture detection
         # Untuk pinch gesture (jari telunjuk dan jempol bersentuhan)
@@ -24,38 +102,240 @@ class GestureController:
         # Jika Anda ingin menggunakan is_hand_open untuk gestur hover, pastikan threshold ini pas
         self.OPEN_FINGER_THRESHOLD = 0.1 # Nilai normalized. Jarak antara ujung jari dan sendi di bawahnya.
 
+    def load_model(self):
+        """Mengimpor cv2/mediapipe dan membuat objek MediaPipe Hands."""
+        _import_vision_modules()
+        self.mp_hands = mp.solutions.hands # Mengakses modul hands dari MediaPipe
+        self._hands_config = self._model_config()
+        self.hands = self._create_hands(self._hands_config)
+        self.mp_drawing = mp.solutions.drawing_utils # Modul buat gambar landmark tangan
+
+    def _model_config(self):
+        return self.model_complexity, self.max_num_hands
+
+    def _create_hands(self, config):
+        model_complexity, max_num_hands = config
+        return self.mp_hands.Hands( # Membuat objek Hands detection
+            static_image_mode=False, # False berarti untuk video stream, True untuk gambar statis
+            model_complexity=model_complexity, # 1 akurat, 0 ringan (diatur oleh QualityController)
+            max_num_hands=max_num_hands, # 1 untuk satu pemain, 2 untuk mode dua tangan
+            min_detection_confidence=self.detection_confidence, # Konfidensi deteksi minimum
+            min_tracking_confidence=self.tracking_confidence # Konfidensi pelacakan minimum
+        )
+
+    def _start_model_rebuild(self):
+        """
+        Membuat Hands dengan konfigurasi sekarang di thread background (memuat graph MediaPipe bisa
+        ratusan ms). Thread frame tetap memakai model lama sampai model baru ditukar di detect_hands.
+        """
+        if self._model_thread is not None and self._model_thread.is_alive():
+            return # Selisih konfigurasi dicek lagi di detect_hands setelah model ini ditukar
+        config = self._model_config()
+        def rebuild():
+            try:
+                self._pending_hands = (config, self._create_hands(config))
+            except Exception as e:
+                # Diingat agar detect_hands tidak memulai thread gagal baru setiap frame
+                self._failed_hands_config = config
+                log_event(logger, "model_rebuild_failed", "Hand model rebuild failed, keeping current model.", logging.ERROR,
+                          model_complexity=config[0], max_num_hands=config[1], error=str(e))
+        self._model_thread = threading.Thread(target=rebuild, name="gesture-model-reload", daemon=True)
+        self._model_thread.start()
+
+    def _swap_pending_model(self):
+        """Menukar model hasil _start_model_rebuild (dipanggil dari thread frame, di antara inferensi)."""
+        config, hands = self._pending_hands
+        self._pending_hands = None
+        old_hands, self.hands = self.hands, hands
+        self._hands_config = config
+        threading.Thread(target=old_hands.close, name="gesture-model-close", daemon=True).start()
+        log_event(logger, "model_swapped", "Hand model swapped.", logging.DEBUG, model_complexity=config[0],
+                  max_num_hands=config[1])
+
+    def set_max_num_hands(self, max_num_hands):
+        """
+        Mengatur jumlah tangan yang dilacak per mode game (2 hanya untuk multiplayer dua tangan).
+        Murah dipanggil setiap frame; model dibuat ulang di background hanya jika nilainya berubah.
+        """
+        self.max_num_hands = max_num_hands
+
+    def start_in_background(self, camera_id=0):
+        """
+        Memuat model dan membuka kamera di thread background.
+        Gunakan is_ready() / has_failed() di game loop untuk mengecek hasilnya.
+        """
+        if self._startup_thread is not None:
+            return
+        self._startup_thread = threading.Thread(target=self._background_startup, args=(camera_id,),
+                                                name="gesture-startup", daemon=True)
+        self._startup_thread.start()
+
+    def _background_startup(self, camera_id):
+        start = time.perf_counter()
+        try:
+            self.load_model()
+            self.startup_failed = not self.start_camera(camera_id)
+        except Exception as e:
+            logger.exception("Gesture subsystem failed to start: %s", e)
+            self.startup_failed = True
+        self.startup_seconds = time.perf_counter() - start
+        self._ready_event.set()
+
+    def is_ready(self):
+        """True jika model sudah dimuat dan kamera siap dibaca."""
+        return self._ready_event.is_set() and not self.startup_failed
+
+    def has_failed(self):
+        """True jika startup di background sudah selesai tapi gagal."""
+        return self._ready_event.is_set() and self.startup_failed
 
     def start_camera(self, camera_id=0):
-        """Memulai stream dari kamera."""
-        # Coba gunakan backend DirectShow (cv2.CAP_DSHOW) sebagai alternatif dari default (MSMF)
-        # Ini seringkali bisa mengatasi masalah "Failed to grab frame" di Windows
-        self.cap = cv2.VideoCapture(camera_id, cv2.CAP_DSHOW) # PERUBAHAN DI SINI!
-        if not self.cap.isOpened(): # Mengecek apakah kamera berhasil dibuka dengan DSHOW
-            print(f"Error: Could not open camera {camera_id} with CAP_DSHOW backend. Trying default backend as a fallback...")
-            # Jika DSHOW gagal, coba backend default lagi (tanpa CAP_DSHOW) sebagai fallback
-            self.cap = cv2.VideoCapture(camera_id)
-            if not self.cap.isOpened():
-                print(f"Error: Could not open camera {camera_id} with default backend either.")
-                return False # Mengembalikan False kalo gagal
-        
-        # Tambahan pengecekan untuk memastikan kamera bisa membaca frame setelah dibuka
-        ret, frame = self.cap.read()
-        if not ret:
-            print("Error: Camera opened, but failed to grab first frame. It might be in use or corrupted.")
-            self.cap.release() # Lepaskan kamera jika gagal membaca frame pertama
-            return False
+        """Memulai stream dari kamera, mencoba backend sesuai urutan platform."""
+        _import_vision_modules()
+        for backend_name, backend_id in _camera_backends():
+            cap = cv2.VideoCapture(camera_id, backend_id)
+            if not cap.isOpened():
+                log_event(logger, "camera_open_failed", f"Could not open camera {camera_id} with {backend_name} backend, trying next backend...", logging.WARNING, camera=camera_id, backend=backend_name)
+                cap.release()
+                continue
+
+            # Tambahan pengecekan untuk memastikan kamera bisa membaca frame setelah dibuka
+            ret, frame = cap.read()
+            if not ret:
+                log_event(logger, "camera_read_failed", f"Camera opened with {backend_name}, but failed to grab first frame. Trying next backend...", logging.WARNING, camera=camera_id, backend=backend_name)
+                cap.release()
+                continue
 
-        print(f"Camera started successfully using backend: {'CAP_DSHOW' if cv2.CAP_DSHOW else 'Default'} for ID {camera_id}.")
-        return True # Mengembalikan True kalo berhasil
+            self.cap = cap
+            self.backend_name = backend_name
+            log_event(logger, "camera_started", f"Camera started successfully using backend: {backend_name} for ID {camera_id}.", camera=camera_id, backend=backend_name)
+
+            # Negosiasi format kamera, lalu mulai dari level kualitas tertinggi yang muat di format itu
+            self.camera_format = quality_control.negotiate_camera_format(cap)
+            if self.camera_format is not None:
+                for index, level in enumerate(self.quality.levels):
+                    if level.capture_size[0] <= self.camera_format.width and level.capture_size[1] <= self.camera_format.height:
+                        self.quality.level_index = index
+                        break
+                self._apply_quality_level(self.quality.level)
+            return True # Mengembalikan True kalo berhasil
+
+        log_event(logger, "camera_unavailable", f"Could not open camera {camera_id} with any backend. It might be in use or disconnected.", logging.ERROR, camera=camera_id)
+        return False # Mengembalikan False kalo gagal
 
     def stop_camera(self):
         """Menghentikan stream kamera."""
         if self.cap: # Kalo objek kamera (self.cap) ada
-            self.cap.release() # Melepas sumber daya kamera
-            self.cap = None # Mengatur ulang self.cap jadi None
+            with self._cap_lock: # Tunggu resize yang sedang berjalan selesai
+                self.cap.release() # Melepas sumber daya kamera
+                self.cap = None # Mengatur ulang self.cap jadi None
+
+    def read_frame(self):
+        """
+        Membaca satu frame dari kamera dan membaliknya secara horizontal (efek cermin).
+        Mengembalikan frame, atau None jika gagal.
+        Waktu tunggu cap.read() (menunggu frame sensor berikutnya) tidak ikut diukur untuk kualitas
+        adaptif: menurunkan resolusi atau model tidak memperpendeknya.
+        Selama resolusi capture sedang diganti di background, frame terakhir dikembalikan lagi.
+        """
+        if not self._cap_lock.acquire(blocking=self._last_frame is None):
+            return self._last_frame
+        try:
+            if self._capture_resized:
+                self._capture_resized = False
+                self.flow_tracker.reset() # Koordinat patch lama tidak berlaku di resolusi baru
+            ret, frame = self.cap.read()
+        finally:
+            self._cap_lock.release()
+        if not ret:
+            return None
+        start = self.last_frame_timestamp = time.perf_counter()
+        frame = cv2.flip(frame, 1)
+        self._flip_ms = (time.perf_counter() - start) * 1000
+        self._last_frame = frame
+        return frame
+
+    def _apply_quality_level(self, level):
+        """Menerapkan level kualitas: resolusi capture dan (jika berubah) kompleksitas model."""
+        if self.cap is not None:
+            self._start_capture_resize(level.capture_size)
+        # Model dengan complexity baru dibuat di background (lihat detect_hands), bukan di jalur frame
+        self.model_complexity = level.model_complexity
+
+    def _start_capture_resize(self, capture_size):
+        """
+        Mengganti resolusi capture di thread background: cap.set bisa membuka ulang stream kamera
+        (puluhan sampai ratusan ms). Thread ini memegang _cap_lock sehingga cap.set tidak pernah
+        berjalan bersamaan dengan cap.read; read_frame memakai frame terakhir sampai selesai.
+        """
+        self._capture_size = capture_size
+        if self._resize_thread is not None and self._resize_thread.is_alive():
+            return # Thread yang berjalan mengecek _capture_size lagi sebelum selesai
+        def resize():
+            with self._cap_lock:
+                while self.cap is not None:
+                    width, height = self._capture_size
+                    if (int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))) != (width, height):
+                        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+                        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+                        self._capture_resized = True
+                    if self._capture_size == (width, height):
+                        break
+        self._resize_thread = threading.Thread(target=resize, name="gesture-camera-resize", daemon=True)
+        self._resize_thread.start()
+
+    def show_debug_frame(self, frame):
+        """Menampilkan feed kamera untuk debugging. Mengembalikan True jika tombol 'q' ditekan."""
+        cv2.imshow('Camera Feed (Debug)', frame)
+        return cv2.waitKey(1) & 0xFF == ord('q')
+
+    def close_debug_windows(self):
+        """Menutup semua jendela debug OpenCV (jika cv2 sudah pernah dimuat)."""
+        if cv2 is not None:
+            cv2.destroyAllWindows()
 
     def process_frame(self, frame):
-        """Memproses satu frame untuk deteksi tangan dan gestur."""
+        """Memproses satu frame untuk deteksi tangan dan gestur. Mengembalikan tangan pertama saja."""
+        image, hands = self.detect_hands(frame)
+        return image, (hands[0].landmarks if hands else None)
+
+    def detect_hands(self, frame):
+        """
+        Memproses satu frame dengan SATU kali inferensi MediaPipe dan mengembalikan semua tangan
+        yang terdeteksi (maksimal max_num_hands) sebagai list DetectedHand.
+        Sesuai level kualitas, inferensi penuh hanya dijalankan tiap N frame. Di antaranya, ujung
+        jempol dan telunjuk dipropagasi dengan optical flow (hand_tracker); jika jejak hilang atau
+        skor rendah, inferensi penuh langsung dijalankan di frame itu juga.
+        """
+        start = time.perf_counter()
+        if self._pending_hands is not None:
+            self._swap_pending_model()
+        elif self._hands_config != self._model_config() and self._failed_hands_config != self._model_config():
+            self._start_model_rebuild() # Level kualitas / jumlah tangan berubah; model lama dipakai sampai yang baru siap
+        self._frame_index += 1
+        hands = None
+        image = frame
+        self.last_frame_inferred = False
+        if self._frame_index % self.quality.level.inference_interval != 0:
+            if self.use_optical_flow:
+                hands = self.flow_tracker.track(frame)
+            elif self._last_hands:
+                hands = self._last_hands
+        if hands is None:
+            image, hands = self._run_inference(frame)
+            self._last_hands = hands
+            self.last_frame_inferred = True
+            if self.use_optical_flow:
+                self.flow_tracker.start(frame, hands)
+
+        # Hanya waktu komputasi (mirror, konversi warna, inferensi, optical flow) yang dilaporkan
+        new_level = self.quality.report(self._flip_ms + (time.perf_counter() - start) * 1000)
+        if new_level is not None:
+            self._apply_quality_level(new_level)
+        return image, hands
+
+    def _run_inference(self, frame):
+        """Menjalankan MediaPipe Hands pada satu frame dan menggambar landmark untuk debug."""
         # Ubah BGR ke RGB (MediaPipe membutuhkan RGB)
         image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
         image.flags.writeable = False # Tandai gambar sebagai tidak dapat ditulis untuk performa
@@ -66,15 +346,46 @@ class GestureController:
         image.flags.writeable = True
         image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR) # Ubah kembali ke BGR
 
-        hand_landmarks = None
+        hands = []
         if results.multi_hand_landmarks:
-            # Kita hanya peduli pada tangan pertama yang terdeteksi
-            hand_landmarks = results.multi_hand_landmarks[0]
-            # Opsional: Gambarkan landmark di frame (untuk debugging visual)
-            # Anda bisa mengaktifkan ini jika ingin melihat landmark di jendela kamera debug
-            self.mp_drawing.draw_landmarks(image, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
+            for index, hand_landmarks in enumerate(results.multi_hand_landmarks):
+                handedness, score = None, 0.0
+                if results.multi_handedness and index < len(results.multi_handedness):
+                    classification = results.multi_handedness[index].classification[0]
+                    handedness, score = classification.label, classification.score
+                hands.append(DetectedHand(hand_landmarks, handedness, score))
+                # Opsional: Gambarkan landmark di frame (untuk debugging visual)
+                # Anda bisa mengaktifkan ini jika ingin melihat landmark di jendela kamera debug
+                self.mp_drawing.draw_landmarks(image, hand_landmarks, self.mp_hands.HAND_CONNECTIONS)
+
+        return image, hands
+
+    def assign_hands_to_players(self, hands, mode=ASSIGN_BY_SCREEN_HALF):
+        """
+        Membagi tangan yang terdeteksi ke dua pemain.
+        Mengembalikan list [landmarks_pemain_0, landmarks_pemain_1], masing-masing bisa None.
+        Frame sudah di-mirror sebelum diproses, jadi "kiri" di sini adalah kiri di layar.
+        """
+        players = [None, None]
+        if not hands:
+            return players
+
+        if mode == ASSIGN_BY_HANDEDNESS:
+            labels = [hand.handedness for hand in hands]
+            # Hanya dipakai jika label unik; dua tangan berlabel sama jatuh ke pembagian per separuh layar
+            if None not in labels and len(set(labels)) == len(labels):
+                for hand in hands:
+                    players[0 if hand.handedness == "Left" else 1] = hand.landmarks
+                return players
 
-        return image, hand_landmarks
+        index_tip = self.mp_hands.HandLandmark.INDEX_FINGER_TIP
+        if len(hands) >= 2:
+            ordered = sorted(hands[:2], key=lambda hand: hand.landmarks.landmark[index_tip].x)
+            players[0], players[1] = ordered[0].landmarks, ordered[1].landmarks
+        else:
+            hand = hands[0]
+            players[0 if hand.landmarks.landmark[index_tip].x < 0.5 else 1] = hand.landmarks
+        return players
 
     def get_hand_position(self, hand_landmarks, img_width, img_height):
         """
@@ -0,0 +1,215 @@
+import json
+import logging
+import os
+import time
+from collections import deque
+
+from game_logging import log_event
+
+logger = logging.getLogger(__name__)
+
+# Kosakata gestur. "none" adalah kelas latar (tangan biasa/mengarahkan kursor) dan tidak memicu apa pun.
+GESTURE_NONE = "none"
+GESTURE_LABELS = [GESTURE_NONE, "swipe_left", "swipe_right", "thumbs_down"]
+
+# Gestur -> nama tombol sidebar yang dijalankan (sama dengan gui_display.IN_GAME_BUTTON_NAMES)
+SHORTCUT_ACTIONS = {
+    "swipe_left": "Undo",
+    "swipe_right": "Redo",
+    "thumbs_down": "Restart",
+}
+
+MODEL_PATH = os.path.join("models", "gesture_shortcuts.npz") # Dihasilkan oleh train_gesture_shortcuts.py
+NUM_LANDMARKS = 21
+WRIST = 0
+MIDDLE_FINGER_MCP = 9
+
+MOTION_WINDOW_SECONDS = 0.25 # Rentang waktu riwayat pergelangan untuk fitur gerak (swipe), tidak bergantung FPS
+KNN_K = 5
+MIN_CONFIDENCE = 0.8 # Minimal proporsi tetangga dengan label sama
+STABLE_FRAMES = 3 # Gestur swipe harus terdeteksi sekian frame berturut-turut
+STATIC_HOLD_SECONDS = 0.8 # Gestur statis (misal thumbs_down) harus ditahan selama ini (lebih aman untuk Restart)
+SWIPE_LABELS = ("swipe_left", "swipe_right")
+COOLDOWN_SECONDS = 1.0 # Jeda setelah shortcut terpicu agar satu gestur tidak memicu dua kali
+
+def landmarks_to_array(hand_landmarks):
+    """Mengubah NormalizedLandmarkList MediaPipe menjadi array (21, 2) koordinat x, y ternormalisasi."""
+    import numpy as np
+
+    return np.array([(landmark.x, landmark.y) for landmark in hand_landmarks.landmark], dtype=np.float32)
+
+def extract_features(points, motion_origin=None):
+    """
+    Membuat vektor fitur dari satu frame:
+    - 21 titik relatif terhadap pergelangan, dibagi ukuran telapak (invarian posisi & jarak ke kamera);
+    - perpindahan pergelangan sejak motion_origin, juga dibagi ukuran telapak (fitur swipe).
+    points: array (21, 2); motion_origin: posisi pergelangan ~MOTION_WINDOW_SECONDS lalu, atau None.
+    """
+    import numpy as np
+
+    wrist = points[WRIST]
+    palm_size = float(np.linalg.norm(points[MIDDLE_FINGER_MCP] - wrist)) or 1e-6
+    shape = ((points - wrist) / palm_size).ravel()
+    if motion_origin is not None:
+        motion = (wrist - motion_origin) / palm_size
+    else:
+        motion = np.zeros(2, dtype=np.float32)
+    return np.concatenate([shape, motion]).astype(np.float32)
+
+class WristHistory:
+    """Riwayat posisi pergelangan berbasis waktu, sumber titik awal fitur gerak."""
+    def __init__(self, window_seconds=MOTION_WINDOW_SECONDS):
+        self.window_seconds = window_seconds
+        self._entries = deque() # (timestamp, posisi pergelangan)
+
+    def clear(self):
+        self._entries.clear()
+
+    def origin(self, timestamp):
+        """Posisi pergelangan tertua yang masih di dalam jendela waktu, atau None."""
+        while self._entries and timestamp - self._entries[0][0] > self.window_seconds:
+            self._entries.popleft()
+        return self._entries[0][1] if self._entries else None
+
+    def append(self, timestamp, wrist):
+        self._entries.append((timestamp, wrist))
+
+def iter_session_features(session_path):
+    """
+    Membaca satu sesi rekaman (JSON Lines, satu frame per baris: {"t", "label", "landmarks"}) dan
+    menghasilkan (fitur, label) dengan riwayat gerak yang sama persis seperti saat runtime.
+    """
+    import numpy as np
+
+    wrist_history = WristHistory()
+    with open(session_path, encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            if record.get("landmarks") is None:
+                wrist_history.clear() # Tangan hilang memutus riwayat gerak, sama seperti runtime
+                continue
+            points = np.array(record["landmarks"], dtype=np.float32)[:, :2]
+            timestamp = record["t"]
+            yield extract_features(points, wrist_history.origin(timestamp)), record.get("label", GESTURE_NONE)
+            wrist_history.append(timestamp, points[WRIST])
+
+class KNNGestureModel:
+    """
+    Klasifikasi k-nearest-neighbour di atas fitur terstandarisasi. Dengan beberapa ratus sampel
+    dan 44 dimensi, satu prediksi adalah satu operasi matriks NumPy (jauh di bawah 1 ms).
+    """
+    def __init__(self, features, labels, mean, std, k=KNN_K):
+        self.features = features
+        self.labels = labels
+        self.mean = mean
+        self.std = std
+        self.k = k
+
+    @classmethod
+    def fit(cls, features, labels, k=KNN_K):
+        import numpy as np
+
+        features = np.asarray(features, dtype=np.float32)
+        mean = features.mean(axis=0)
+        std = features.std(axis=0) + 1e-6
+        return cls((features - mean) / std, np.asarray(labels), mean, std, k)
+
+    def predict(self, feature):
+        """Mengembalikan (label, confidence) untuk satu vektor fitur."""
+        import numpy as np
+
+        distances = ((self.features - (feature - self.mean) / self.std) ** 2).sum(axis=1)
+        k = min(self.k, len(distances))
+        nearest = np.argpartition(distances, k - 1)[:k]
+        values, counts = np.unique(self.labels[nearest], return_counts=True)
+        best = counts.argmax()
+        return str(values[best]), counts[best] / k
+
+    def save(self, path):
+        import numpy as np
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(path, features=self.features, labels=self.labels, mean=self.mean, std=self.std,
+                            k=np.array(self.k))
+
+    @classmethod
+    def load(cls, path):
+        import numpy as np
+
+        with np.load(path) as data:
+            return cls(data["features"], data["labels"], data["mean"], data["std"], int(data["k"]))
+
+class GestureShortcutRecognizer:
+    """
+    Mengubah landmark tangan per frame menjadi aksi shortcut (nama tombol, misal "Undo").
+    Hasil klasifikasi di-debounce: swipe harus stabil beberapa frame, gestur statis harus ditahan,
+    dan ada cooldown setelah setiap aksi. Tidak aktif (update selalu None) jika model belum dilatih.
+    """
+    def __init__(self, model_path=MODEL_PATH):
+        self.model = None
+        if os.path.exists(model_path):
+            try:
+                self.model = KNNGestureModel.load(model_path)
+                log_event(logger, "shortcut_model", "Gesture shortcut model loaded.", path=model_path,
+                          samples=len(self.model.labels))
+            except (OSError, KeyError, ValueError) as e:
+                logger.warning("Could not load gesture shortcut model %s: %s", model_path, e)
+        else:
+            logger.info("No gesture shortcut model at %s, shortcuts disabled.", model_path)
+
+        self._wrist_history = WristHistory()
+        self._current_label = GESTURE_NONE
+        self._label_frames = 0
+        self._label_since = 0.0
+        self._cooldown_until = 0.0
+
+    @property
+    def enabled(self):
+        return self.model is not None
+
+    def reset(self):
+        """Melupakan riwayat gerak (dipanggil saat tangan hilang atau sedang pinch/drag)."""
+        self._wrist_history.clear()
+        self._current_label = GESTURE_NONE
+        self._label_frames = 0
+
+    def update(self, hand_landmarks, timestamp=None):
+        """
+        Mengklasifikasi satu frame hasil inferensi penuh (frame optical flow hanya memperbarui ujung
+        jari, jadi tidak dipakai di sini). Mengembalikan nama aksi (lihat SHORTCUT_ACTIONS) saat gestur
+        terkonfirmasi, atau None.
+        """
+        if self.model is None:
+            return None
+        if not hand_landmarks:
+            self.reset()
+            return None
+        if timestamp is None:
+            timestamp = time.perf_counter()
+
+        points = landmarks_to_array(hand_landmarks)
+        label, confidence = self.model.predict(extract_features(points, self._wrist_history.origin(timestamp)))
+        self._wrist_history.append(timestamp, points[WRIST])
+        if confidence < MIN_CONFIDENCE:
+            label = GESTURE_NONE
+
+        if label != self._current_label:
+            self._current_label = label
+            self._label_frames = 0
+            self._label_since = timestamp
+        self._label_frames += 1
+
+        if label == GESTURE_NONE or timestamp < self._cooldown_until:
+            return None
+        if label in SWIPE_LABELS:
+            confirmed = self._label_frames >= STABLE_FRAMES
+        else:
+            confirmed = timestamp - self._label_since >= STATIC_HOLD_SECONDS
+        if not confirmed:
+            return None
+
+        self._cooldown_until = timestamp + COOLDOWN_SECONDS
+        self.reset()
+        action = SHORTCUT_ACTIONS.get(label)
+        log_event(logger, "gesture_shortcut", "Gesture shortcut recognised.", gesture=label, action=action)
+        return action
@@ -1,16 +1,41 @@
+import logging
+import math
 import pygame
 import os
 import chess
+from collections import OrderedDict
+
+import asset_cache
+import hit_test
+from game_logging import log_event
+
+logger = logging.getLogger(__name__)
 
 # --- KONSTANTA PYGAME ---
+# Ukuran di bawah ini adalah ukuran AWAL jendela (desain referensi). Jendela bisa di-resize /
+# fullscreen; layout aktual dihitung ulang di ChessGUI._compute_layout() dan disimpan di atribut
+# instance (self.width, self.height, self.square_size, dst).
 BOARD_RENDER_SIZE = 800 # Ukuran sisi papan catur yang akan dirender (persegi)
 SIDEBAR_WIDTH = 300 # Lebar sidebar untuk tombol dan info
 WIDTH = BOARD_RENDER_SIZE + SIDEBAR_WIDTH # Total lebar jendela (800 + 300 = 1100)
 HEIGHT = BOARD_RENDER_SIZE # Total tinggi jendela (sama dengan tinggi papan, 800)
+MIN_WIDTH, MIN_HEIGHT = 640, 400 # Ukuran jendela minimum saat di-resize
 
 BOARD_SIZE = 8 # Papan catur 8x8
 SQUARE_SIZE = BOARD_RENDER_SIZE // BOARD_SIZE # Ukuran setiap kotak di papan (800 / 8 = 100)
 FPS = 60 # Frames per second
+WINDOW_CAPTION = "Chess Gesture Game"
+
+# Cache sprite bidak per ukuran kotak (resize bolak-balik tidak memicu transform.scale ulang)
+SPRITE_CACHE_SIZE = 4
+OVERLAY_CACHE_SIZE = 32 # Jumlah surface highlight (warna x ukuran kotak) yang disimpan
+
+# Render papan dengan resolusi internal lebih rendah lalu di-upscale saat mesin kewalahan
+LOW_RENDER_SCALE = 0.5 # Skala resolusi internal papan saat mode hemat aktif
+FRAME_BUDGET_MS = 1000 / FPS # Anggaran waktu kerja per frame
+RENDER_SCALE_DOWN_RATIO = 1.2 # Turunkan resolusi jika rata-rata frame > budget * rasio ini
+RENDER_SCALE_UP_RATIO = 0.6 # Naikkan lagi jika rata-rata frame < budget * rasio ini
+RENDER_SCALE_COOLDOWN_FRAMES = 60 # Jeda minimal (frame) antar perubahan resolusi internal
 
 # Warna UI
 UI_BACKGROUND_COLOR = (100, 100, 100) # Abu-abu medium-dark
@@ -23,203 +48,487 @@ DARK_SQUARE_COLOR = (110, 140, 100) # Hijau gelap
 HIGHLIGHT_COLOR_SELECTED = (0, 255, 0, 100) # Hijau transparan untuk kotak terpilih
 HIGHLIGHT_COLOR_POSSIBLE = (255, 255, 0, 100) # Kuning transparan untuk langkah valid
 CHECK_COLOR = (255, 0, 0, 100) # Merah transparan untuk Raja yang di-check
+HINT_COLOR = (0, 120, 255, 110) # Biru transparan untuk kotak asal/tujuan langkah hint
+CURSOR_OPEN_COLORS = [(0, 255, 0), (0, 160, 255)] # Warna kursor terbuka per tangan (pemain 0, pemain 1)
 
 # --- KONSTANTA TOMBOL ---
 BUTTON_MARGIN = 25 # Margin antar tombol dan dari sisi sidebar
 BUTTON_WIDTH = SIDEBAR_WIDTH - (2 * BUTTON_MARGIN) # Lebar tombol disesuaikan dengan sidebar_width (300 - 50 = 250)
 BUTTON_HEIGHT = 70
 
+# Tombol in-game di sidebar disusun dalam grid 2 kolom agar ada ruang untuk panel info di bawahnya
+IN_GAME_BUTTON_NAMES = ["Restart", "Undo", "Redo", "Quit", "Analysis", "Hint"]
+SIDEBAR_BUTTON_COLUMNS = 2
+SIDEBAR_BUTTON_HEIGHT = 55
+BUTTON_ACTIVE_COLOR = (0, 150, 150) # Warna tombol toggle yang sedang aktif (misal Analysis)
+
+# Panel analisis di sidebar
+ANALYSIS_TEXT_COLOR = (220, 220, 220)
+ANALYSIS_LINE_SPACING = 4
+
 BUTTON_COLOR = (70, 70, 70) # Warna dasar tombol (abu-abu gelap)
 BUTTON_HOVER_COLOR = (100, 100, 100) # Warna tombol saat di-hover
 BUTTON_TEXT_COLOR = (255, 255, 255) # Warna teks tombol
 
+BOARD_HIT_TARGET = "BOARD" # Nama entri grid papan di indeks hit-test
+
+# Scrubber timeline riwayat langkah di sidebar (di bawah tombol)
+HISTORY_SCRUBBER_TARGET = "Timeline" # Nama entri scrubber di indeks hit-test (event berjenis tombol)
+SCRUBBER_HEIGHT = 50
+SCRUBBER_TRACK_HEIGHT = 10
+SCRUBBER_BRANCH_COLOR = (230, 180, 40) # Penanda ply yang punya variasi lain
+
+# Mode eksibisi (banyak papan sekaligus, lihat exhibition.py)
+EXHIBITION_STATE = "PLAYING_EXHIBITION"
+EXHIBITION_TILE_GAP = 10 # Jarak antar papan di grid eksibisi (piksel, pada skala desain)
+EXHIBITION_FOCUS_COLOR = (0, 150, 150) # Bingkai papan eksibisi yang sedang aktif
+PLAYING_STATES = ["PLAYING_VS_COMPUTER", "PLAYING_MULTIPLAYER", EXHIBITION_STATE]
+
 PIECE_IMAGES = {
     'P': 'wp.png', 'R': 'wr.png', 'N': 'wn.png', 'B': 'wb.png', 'Q': 'wq.png', 'K': 'wk.png',
     'p': 'bp.png', 'r': 'br.png', 'n': 'bn.png', 'b': 'bb.png', 'q': 'bq.png', 'k': 'bk.png'
 }
 
 class ChessGUI:
-    def __init__(self):
+    def __init__(self, fullscreen=False, adaptive_resolution=False, caption=WINDOW_CAPTION):
+        """
+        fullscreen: Jika True, jendela dibuka fullscreen pada resolusi desktop.
+        adaptive_resolution: Jika True, papan dirender pada resolusi internal lebih rendah
+                             (lalu di-upscale) saat waktu frame melebihi anggaran.
+        caption: Judul jendela (mode host memberi nama meja, misal "Chess Gesture Game - Table 2").
+        """
         pygame.init()
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        pygame.display.set_caption("Chess Gesture Game")
-        self.clock = pygame.time.Clock()
+        self.fullscreen = fullscreen
+        self.screen = self._create_window(WIDTH, HEIGHT)
+        pygame.display.set_caption(caption)
+        # Pacing frame tidak lagi di sini (clock.tick memblokir event loop asyncio), lihat frame_scheduler
 
-        self.images = {} # Untuk bidak catur
+        self.images = {} # Untuk bidak catur (sesuai self.square_size saat ini)
         self.ui_graphics = {} # Untuk gambar UI seperti tangan dan bidak di homepage/color selection
-        self.load_images()
-        self.load_ui_graphics() 
-        
-        # Inisialisasi Font
-        self.font = pygame.font.Font(None, 36) # Font default untuk status game
-        self.button_font = pygame.font.Font(None, 30) # Font untuk teks tombol
-        self.homepage_font_title = pygame.font.Font(None, 80) # Font besar untuk judul homepage
-        self.mode_selection_font_title = pygame.font.Font(None, 60) # Font untuk judul layar pemilihan mode/warna
+        self._sprite_cache = OrderedDict() # {ukuran_kotak: {simbol: Surface}}, LRU
+        self._overlay_cache = {} # {(warna, ukuran_kotak): Surface} highlight transparan siap-blit
+        self._ui_graphics_cache = OrderedDict() # {(lebar, tinggi): {nama: Surface}}, LRU
+
+        # Resolusi internal papan (1.0 = penuh). Diatur otomatis jika adaptive_resolution aktif.
+        self.adaptive_resolution = adaptive_resolution
+        self.render_scale = 1.0
+        self._board_surface = None # Surface offscreen untuk render resolusi rendah
+        self._avg_frame_ms = 0.0
+        self._frames_since_scale_change = 0
+
+        # Grid papan mode eksibisi (0 = tidak aktif), lihat set_exhibition_board_count
+        self.exhibition_board_count = 0
+
+        # Cache aset di disk hanya untuk ukuran startup; ukuran saat resize/skala adaptif cukup di LRU memori
+        self._persist_asset_cache = True
+        self._compute_layout(*self.screen.get_size())
+        self._persist_asset_cache = False
+
+    def _create_window(self, width, height):
+        """Membuat (ulang) surface jendela sesuai mode fullscreen/resizable."""
+        if self.fullscreen:
+            return pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        return pygame.display.set_mode((width, height), pygame.RESIZABLE)
+
+    def _compute_layout(self, width, height):
+        """
+        Menghitung ulang semua ukuran dan posisi elemen (papan, sidebar, tombol, font)
+        berdasarkan ukuran jendela. Dipanggil saat startup dan setiap kali jendela di-resize.
+        """
+        self.width, self.height = width, height
+        self.ui_scale = min(width / WIDTH, height / HEIGHT) # Skala relatif terhadap desain 1100x800
+
+        # Papan selalu persegi dan kelipatan 8, mengisi sisa ruang di kiri sidebar
+        sidebar_min = int(SIDEBAR_WIDTH * self.ui_scale)
+        self.square_size = max(1, min(height, width - sidebar_min) // BOARD_SIZE)
+        self.board_render_size = self.square_size * BOARD_SIZE
+        self.board_origin = (0, (height - self.board_render_size) // 2) # Papan di tengah secara vertikal
+        self.sidebar_x = self.board_render_size
+        self.sidebar_width = width - self.board_render_size
+
+        margin = int(BUTTON_MARGIN * self.ui_scale)
+        button_height = int(BUTTON_HEIGHT * self.ui_scale)
+        button_width = int(BUTTON_WIDTH * self.ui_scale)
+        self.cursor_radius = max(6, int(15 * self.ui_scale))
+
+        # Inisialisasi Font (ukuran ikut skala)
+        self.font = pygame.font.Font(None, max(12, int(36 * self.ui_scale))) # Font default untuk status game
+        self.button_font = pygame.font.Font(None, max(12, int(30 * self.ui_scale))) # Font untuk teks tombol
+        self.homepage_font_title = pygame.font.Font(None, max(12, int(80 * self.ui_scale))) # Font besar untuk judul homepage
+        self.mode_selection_font_title = pygame.font.Font(None, max(12, int(60 * self.ui_scale))) # Font untuk judul layar pemilihan mode/warna
+        self.small_font = pygame.font.Font(None, max(12, int(22 * self.ui_scale))) # Font kecil untuk panel analisis
+        self._analysis_surfaces = None # Cache teks panel analisis: (versi_snapshot, [surface, ...])
 
         # Definisi tombol homepage (di tengah seluruh jendela)
+        center_x = width // 2 - button_width // 2
+        # Tiga tombol ditumpuk lebih rapat agar tidak menabrak teks status di bawahnya
+        homepage_gap = margin // 2
         self.homepage_buttons = {
-            "VS COMPUTER": pygame.Rect(WIDTH // 2 - BUTTON_WIDTH // 2, HEIGHT * 0.65, BUTTON_WIDTH, BUTTON_HEIGHT),
-            "MULTIPLAYER": pygame.Rect(WIDTH // 2 - BUTTON_WIDTH // 2, HEIGHT * 0.65 + BUTTON_HEIGHT + BUTTON_MARGIN, BUTTON_WIDTH, BUTTON_HEIGHT),
+            "VS COMPUTER": pygame.Rect(center_x, height * 0.62, button_width, button_height),
+            "MULTIPLAYER": pygame.Rect(center_x, height * 0.62 + button_height + homepage_gap, button_width, button_height),
+            "EXHIBITION": pygame.Rect(center_x, height * 0.62 + 2 * (button_height + homepage_gap), button_width, button_height),
         }
 
         # Tombol pemilihan warna (posisi di tengah seluruh jendela)
         self.player_color_buttons = {
-            "PLAY AS A WHITE": pygame.Rect(WIDTH // 2 - BUTTON_WIDTH // 2, HEIGHT * 0.65, BUTTON_WIDTH, BUTTON_HEIGHT),
-            "PLAY AS A BLACK": pygame.Rect(WIDTH // 2 - BUTTON_WIDTH // 2, HEIGHT * 0.65 + BUTTON_HEIGHT + BUTTON_MARGIN, BUTTON_WIDTH, BUTTON_HEIGHT),
+            "PLAY AS A WHITE": pygame.Rect(center_x, height * 0.65, button_width, button_height),
+            "PLAY AS A BLACK": pygame.Rect(center_x, height * 0.65 + button_height + margin, button_width, button_height),
         }
 
-        # Definisi tombol in-game (di dalam sidebar), tanpa Pause/Resume
-        self.in_game_buttons = {
-            "Restart": pygame.Rect(BOARD_RENDER_SIZE + BUTTON_MARGIN, BUTTON_MARGIN, BUTTON_WIDTH, BUTTON_HEIGHT),
-            "Undo": pygame.Rect(BOARD_RENDER_SIZE + BUTTON_MARGIN, BUTTON_MARGIN * 2 + BUTTON_HEIGHT, BUTTON_WIDTH, BUTTON_HEIGHT),
-            "Redo": pygame.Rect(BOARD_RENDER_SIZE + BUTTON_MARGIN, BUTTON_MARGIN * 3 + BUTTON_HEIGHT * 2, BUTTON_WIDTH, BUTTON_HEIGHT),
-            "Quit": pygame.Rect(BOARD_RENDER_SIZE + BUTTON_MARGIN, BUTTON_MARGIN * 4 + BUTTON_HEIGHT * 3, BUTTON_WIDTH, BUTTON_HEIGHT), # Quit dipindahkan ke sini
-        }
+        # Definisi tombol in-game (di dalam sidebar, grid SIDEBAR_BUTTON_COLUMNS kolom), tanpa Pause/Resume
+        sidebar_button_height = int(SIDEBAR_BUTTON_HEIGHT * self.ui_scale)
+        sidebar_button_width = (self.sidebar_width - margin * (SIDEBAR_BUTTON_COLUMNS + 1)) // SIDEBAR_BUTTON_COLUMNS
+        self.in_game_buttons = {}
+        for index, button_name in enumerate(IN_GAME_BUTTON_NAMES):
+            col, row = index % SIDEBAR_BUTTON_COLUMNS, index // SIDEBAR_BUTTON_COLUMNS
+            self.in_game_buttons[button_name] = pygame.Rect(self.sidebar_x + margin + col * (sidebar_button_width + margin),
+                                                            margin + row * (sidebar_button_height + margin),
+                                                            sidebar_button_width, sidebar_button_height)
+        # Scrubber timeline tepat di bawah grid tombol sidebar
+        buttons_bottom = max(rect.bottom for rect in self.in_game_buttons.values()) + margin
+        self.history_scrubber_rect = pygame.Rect(self.sidebar_x + margin, buttons_bottom,
+                                                 self.sidebar_width - 2 * margin, int(SCRUBBER_HEIGHT * self.ui_scale))
+        self._scrubber_label = None # Cache teks scrubber: ((ply, total), Surface)
+        # Batas bawah area tombol + scrubber sidebar; panel info (analisis, dll.) digambar di bawahnya
+        self.sidebar_content_top = self.history_scrubber_rect.bottom + margin
         # Definisi tombol di menu overlay, tanpa Pause/Resume
         self.menu_buttons = {
-            "Restart": pygame.Rect(WIDTH // 2 - BUTTON_WIDTH // 2, HEIGHT // 2 - BUTTON_HEIGHT * 1.5 - BUTTON_MARGIN * 1.5, BUTTON_WIDTH, BUTTON_HEIGHT), # Posisi disesuaikan
-            "Undo": pygame.Rect(WIDTH // 2 - BUTTON_WIDTH // 2, HEIGHT // 2 - BUTTON_HEIGHT * 0.5 - BUTTON_MARGIN * 0.5, BUTTON_WIDTH, BUTTON_HEIGHT), # Posisi disesuaikan
-            "Redo": pygame.Rect(WIDTH // 2 - BUTTON_WIDTH // 2, HEIGHT // 2 + BUTTON_HEIGHT * 0.5 + BUTTON_MARGIN * 0.5, BUTTON_WIDTH, BUTTON_HEIGHT), # Posisi disesuaikan
-            "Quit": pygame.Rect(WIDTH // 2 - BUTTON_WIDTH // 2, HEIGHT // 2 + BUTTON_HEIGHT * 1.5 + BUTTON_MARGIN * 1.5, BUTTON_WIDTH, BUTTON_HEIGHT), # Posisi disesuaikan
+            "Restart": pygame.Rect(center_x, height // 2 - button_height * 1.5 - margin * 1.5, button_width, button_height), # Posisi disesuaikan
+            "Undo": pygame.Rect(center_x, height // 2 - button_height * 0.5 - margin * 0.5, button_width, button_height), # Posisi disesuaikan
+            "Redo": pygame.Rect(center_x, height // 2 + button_height * 0.5 + margin * 0.5, button_width, button_height), # Posisi disesuaikan
+            "Quit": pygame.Rect(center_x, height // 2 + button_height * 1.5 + margin * 1.5, button_width, button_height), # Posisi disesuaikan
         }
 
+        self.load_images()
+        self.load_ui_graphics()
+        self._board_surface = None # Ukuran papan berubah, surface offscreen dibuat ulang saat dibutuhkan
+        self._compute_exhibition_layout()
+        self._build_hit_indexes()
+
+    def _compute_exhibition_layout(self):
+        """
+        Membagi area papan menjadi grid persegi untuk self.exhibition_board_count papan.
+        Setiap papan (tile) berukuran kelipatan 8 dan grid diletakkan di tengah area papan.
+        Cache surface per papan ikut dikosongkan karena ukuran tile berubah.
+        """
+        self.exhibition_tiles = []
+        self._exhibition_surfaces = {} # {indeks_papan: (signature, Surface)}
+        count = self.exhibition_board_count
+        if count <= 0:
+            self.exhibition_square_size = 0
+            return
+
+        cols = math.ceil(math.sqrt(count))
+        rows = math.ceil(count / cols)
+        gap = max(2, int(EXHIBITION_TILE_GAP * self.ui_scale))
+        tile_px = min((self.board_render_size - gap * (cols + 1)) // cols, (self.height - gap * (rows + 1)) // rows)
+        self.exhibition_square_size = max(1, tile_px // BOARD_SIZE)
+        tile_px = self.exhibition_square_size * BOARD_SIZE
+
+        grid_x = (self.board_render_size - (cols * tile_px + (cols - 1) * gap)) // 2
+        grid_y = (self.height - (rows * tile_px + (rows - 1) * gap)) // 2
+        for index in range(count):
+            col, row = index % cols, index // cols
+            self.exhibition_tiles.append(pygame.Rect(grid_x + col * (tile_px + gap), grid_y + row * (tile_px + gap),
+                                                     tile_px, tile_px))
+
+    def set_exhibition_board_count(self, count):
+        """Mengatur jumlah papan di grid eksibisi (0 untuk menonaktifkan) dan membangun ulang hit-test."""
+        if count == self.exhibition_board_count:
+            return
+        self.exhibition_board_count = count
+        self._compute_exhibition_layout()
+        self._build_hit_indexes()
+
+    def _build_hit_indexes(self):
+        """
+        Membangun indeks hit-test per layar (lihat hit_test.HitTestIndex). Hanya dipanggil saat
+        layout berubah; hover, klik tombol, dan konversi piksel->kotak semuanya memakai indeks ini.
+        """
+        def index_for(buttons):
+            index = hit_test.HitTestIndex()
+            for button_name, button_rect in buttons.items():
+                index.add_rect(button_name, button_rect)
+            return index
+
+        # Layar bermain: tombol sidebar + grid papan 8x8 (dipakai bersama kedua mode bermain)
+        self._playing_hit_index = index_for(self.in_game_buttons)
+        self._playing_hit_index.add_rect(HISTORY_SCRUBBER_TARGET, self.history_scrubber_rect)
+        board_rect = pygame.Rect(*self.board_origin, self.board_render_size, self.board_render_size)
+        self._playing_hit_index.add_grid(BOARD_HIT_TARGET, board_rect, BOARD_SIZE, BOARD_SIZE)
+
+        # Layar eksibisi: tombol sidebar (berlaku untuk papan aktif) + satu grid 8x8 per papan
+        exhibition_hit_index = index_for(self.in_game_buttons)
+        exhibition_hit_index.add_rect(HISTORY_SCRUBBER_TARGET, self.history_scrubber_rect)
+        for board_index, tile in enumerate(self.exhibition_tiles):
+            exhibition_hit_index.add_grid((BOARD_HIT_TARGET, board_index), tile, BOARD_SIZE, BOARD_SIZE)
+
+        self.hit_indexes = {
+            "HOMEPAGE": index_for(self.homepage_buttons),
+            "PLAYER_COLOR_SELECTION": index_for(self.player_color_buttons),
+            "PLAYING_VS_COMPUTER": self._playing_hit_index,
+            "PLAYING_MULTIPLAYER": self._playing_hit_index,
+            EXHIBITION_STATE: exhibition_hit_index,
+            "IN_GAME_MENU": index_for(self.menu_buttons),
+        }
+
+    def handle_resize(self, width, height):
+        """Menangani event VIDEORESIZE: membuat ulang jendela dan menghitung ulang layout."""
+        if self.fullscreen:
+            return
+        width, height = max(MIN_WIDTH, width), max(MIN_HEIGHT, height)
+        if (width, height) == (self.width, self.height):
+            return
+        self.screen = self._create_window(width, height)
+        self._compute_layout(width, height)
+
+    def toggle_fullscreen(self):
+        """Beralih antara mode fullscreen dan jendela biasa."""
+        self.fullscreen = not self.fullscreen
+        self.screen = self._create_window(WIDTH, HEIGHT)
+        self._compute_layout(*self.screen.get_size())
+
+    def _get_piece_sprites(self, square_size):
+        """
+        Mengambil sprite bidak untuk ukuran kotak tertentu dari cache LRU in-memory,
+        atau memuatnya dari atlas (di-cache di disk hanya untuk ukuran startup) jika belum ada.
+        """
+        if square_size in self._sprite_cache:
+            self._sprite_cache.move_to_end(square_size)
+            return self._sprite_cache[square_size]
+        sprites = asset_cache.load_piece_atlas(PIECE_IMAGES, square_size, persist=self._persist_asset_cache)
+        self._sprite_cache[square_size] = sprites
+        if len(self._sprite_cache) > SPRITE_CACHE_SIZE:
+            self._sprite_cache.popitem(last=False)
+        return sprites
+
+    def _get_overlay(self, color, square_size):
+        """Surface highlight transparan satu kotak; dibuat sekali per warna dan ukuran, bukan per frame."""
+        key = (color, square_size)
+        overlay = self._overlay_cache.get(key)
+        if overlay is None:
+            overlay = pygame.Surface((square_size, square_size), pygame.SRCALPHA)
+            overlay.fill(color)
+            if len(self._overlay_cache) >= OVERLAY_CACHE_SIZE:
+                self._overlay_cache.clear() # Ukuran lama (sebelum resize/skala adaptif) tidak dipakai lagi
+            self._overlay_cache[key] = overlay
+        return overlay
+
+    def prefetch_overlays(self, square_size=None):
+        """
+        Menyiapkan surface highlight untuk ukuran kotak tertentu (default: papan utama saat ini)
+        agar frame pinch pertama tidak perlu membuat surface baru.
+        """
+        if square_size is None:
+            _, square_size, _ = self._get_board_target()
+        for color in (HIGHLIGHT_COLOR_SELECTED, HIGHLIGHT_COLOR_POSSIBLE):
+            self._get_overlay(color, square_size)
 
     def load_images(self):
-        """Memuat semua gambar bidak catur."""
-        for piece_char, filename in PIECE_IMAGES.items():
-            path = os.path.join("assets", filename)
-            try:
-                image = pygame.image.load(path).convert_alpha()
-                self.images[piece_char] = pygame.transform.scale(image, (SQUARE_SIZE, SQUARE_SIZE)) 
-            except pygame.error as e:
-                print(f"Error loading piece image {path}: {e}")
-                self.images[piece_char] = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
-                self.images[piece_char].fill((255, 0, 0, 128))
-                pygame.font.init()
-                font = pygame.font.Font(None, 24)
-                text_surface = font.render(piece_char, True, (0, 0, 0))
-                text_rect = text_surface.get_rect(center=(SQUARE_SIZE // 2, SQUARE_SIZE // 2))
-                self.images[piece_char].blit(text_surface, text_rect)
+        """Memuat semua gambar bidak catur untuk ukuran kotak saat ini (lihat _get_piece_sprites)."""
+        self.images = self._get_piece_sprites(self.square_size)
 
     def load_ui_graphics(self):
         """Memuat gambar grafis UI seperti tangan dan bidak untuk halaman menu."""
+        size_key = (self.width, self.height)
+        if size_key in self._ui_graphics_cache:
+            self._ui_graphics_cache.move_to_end(size_key)
+            self.ui_graphics = self._ui_graphics_cache[size_key]
+            return
+
         ui_graphic_files = {
-            "homepage_graphic": "1.png",      
-            "color_select_graphic": "2.png"   
+            "homepage_graphic": ("1.png", 0.4),
+            "color_select_graphic": ("2.png", 0.35)
         }
-        for name, filename in ui_graphic_files.items():
-            path = os.path.join("assets", filename)
+        graphics = {}
+        for name, (filename, ratio) in ui_graphic_files.items():
+            size = (int(self.width * ratio), int(self.height * ratio))
             try:
-                image = pygame.image.load(path).convert_alpha()
-                if name == "homepage_graphic":
-                    self.ui_graphics[name] = pygame.transform.scale(image, (int(WIDTH * 0.4), int(HEIGHT * 0.4)))
-                elif name == "color_select_graphic":
-                    self.ui_graphics[name] = pygame.transform.scale(image, (int(WIDTH * 0.35), int(HEIGHT * 0.35))) 
+                graphics[name] = asset_cache.load_scaled_image(filename, size, persist=self._persist_asset_cache)
             except pygame.error as e:
-                print(f"Error loading UI graphic {path}: {e}")
-                self.ui_graphics[name] = None 
+                logger.error("Error loading UI graphic %s: %s", os.path.join(asset_cache.ASSET_DIR, filename), e)
+                graphics[name] = None
+
+        self._ui_graphics_cache[size_key] = graphics
+        if len(self._ui_graphics_cache) > SPRITE_CACHE_SIZE:
+            self._ui_graphics_cache.popitem(last=False)
+        self.ui_graphics = graphics
+
+    def _square_to_display(self, square, player_is_black_view):
+        """Mengonversi square python-chess ke (kolom, baris) tampilan sesuai orientasi papan."""
+        display_col = chess.square_file(square)
+        actual_row = chess.square_rank(square)
+        display_row = (7 - actual_row) if not player_is_black_view else actual_row
+        return display_col, display_row
+
+    def _get_board_target(self):
+        """
+        Mengembalikan (surface, ukuran_kotak, origin) tempat papan digambar.
+        Pada resolusi penuh papan digambar langsung ke layar; pada resolusi rendah
+        digambar ke surface offscreen yang kemudian di-upscale di draw_board.
+        """
+        if self.render_scale >= 1.0:
+            return self.screen, self.square_size, self.board_origin
 
+        square_size = max(1, int(self.square_size * self.render_scale))
+        board_px = square_size * BOARD_SIZE
+        if self._board_surface is None or self._board_surface.get_width() != board_px:
+            self._board_surface = pygame.Surface((board_px, board_px)).convert()
+        return self._board_surface, square_size, (0, 0)
 
-    def draw_board(self, board, selected_square=None, legal_moves=None, game_status=None, player_is_black_view=False):
+    def draw_board(self, board, selected_square=None, legal_moves=None, game_status=None, player_is_black_view=False,
+                   hint_move=None, drag_pos=None):
         """
         Menggambar papan catur dan bidak-bidaknya.
         player_is_black_view: Jika True, papan dibalik untuk tampilan pemain Hitam.
+        hint_move: chess.Move saran engine (kotak asal dan tujuannya disorot), atau None.
+        drag_pos: Posisi kursor (x, y) saat bidak terpilih sedang di-drag; bidak itu "diangkat" dan
+                  digambar mengikuti kursor, bukan di kotak asalnya.
         """
         # Gambar background untuk area papan catur
-        pygame.draw.rect(self.screen, (0, 0, 0), (0, 0, BOARD_RENDER_SIZE, HEIGHT)) # Clear board area with black
-        
+        pygame.draw.rect(self.screen, (0, 0, 0), (0, 0, self.board_render_size, self.height)) # Clear board area with black
+
+        target, square_size, origin = self._get_board_target()
+        images = self.images if square_size == self.square_size else self._get_piece_sprites(square_size)
+        lifted_square = selected_square if drag_pos is not None else None
+        self._render_board(target, square_size, origin, images, board, selected_square, legal_moves,
+                           game_status, player_is_black_view, hint_move, lifted_square)
+
+        # Upscale papan resolusi rendah ke ukuran tampilan
+        if target is not self.screen:
+            upscaled = pygame.transform.scale(target, (self.board_render_size, self.board_render_size))
+            self.screen.blit(upscaled, self.board_origin)
+
+        # Bidak yang diangkat digambar terakhir (resolusi penuh), berpusat di kursor
+        if lifted_square is not None:
+            piece = board.piece_at(lifted_square)
+            if piece and piece.symbol() in self.images:
+                sprite = self.images[piece.symbol()]
+                self.screen.blit(sprite, sprite.get_rect(center=drag_pos))
+
+        self._draw_sidebar(game_status)
+
+    def _render_board(self, target, square_size, origin, images, board, selected_square, legal_moves,
+                      game_status, player_is_black_view, hint_move=None, lifted_square=None):
+        """
+        Menggambar kotak, highlight, dan bidak satu papan ke target dengan ukuran kotak dan origin tertentu.
+        lifted_square: Kotak yang bidaknya sedang di-drag (tidak digambar di papan), atau None.
+        """
+        origin_x, origin_y = origin
+
+        def square_pos(display_col, display_row):
+            return origin_x + display_col * square_size, origin_y + display_row * square_size
+
         # Gambar kotak papan
         for r_idx in range(BOARD_SIZE):
             for c_idx in range(BOARD_SIZE):
                 color = LIGHT_SQUARE_COLOR if (r_idx + c_idx) % 2 == 0 else DARK_SQUARE_COLOR
-                
+
                 # Tentukan posisi tampilan baris/kolom berdasarkan orientasi
                 display_col = c_idx
                 display_row = r_idx if not player_is_black_view else (7 - r_idx)
-                
-                pygame.draw.rect(self.screen, color, (display_col * SQUARE_SIZE, display_row * SQUARE_SIZE, SQUARE_SIZE, SQUARE_SIZE))
+
+                pygame.draw.rect(target, color, (*square_pos(display_col, display_row), square_size, square_size))
 
         # Gambar highlight untuk kotak yang dipilih
         if selected_square is not None:
-            actual_col = chess.square_file(selected_square)
-            actual_row = chess.square_rank(selected_square)
-            
-            display_col = actual_col
-            display_row = (7 - actual_row) if not player_is_black_view else actual_row
-            
-            s = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
-            s.fill(HIGHLIGHT_COLOR_SELECTED)
-            self.screen.blit(s, (display_col * SQUARE_SIZE, display_row * SQUARE_SIZE))
+            s = self._get_overlay(HIGHLIGHT_COLOR_SELECTED, square_size)
+            target.blit(s, square_pos(*self._square_to_display(selected_square, player_is_black_view)))
 
         # Gambar highlight untuk langkah yang sah
         if legal_moves:
-            s = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
-            s.fill(HIGHLIGHT_COLOR_POSSIBLE)
+            s = self._get_overlay(HIGHLIGHT_COLOR_POSSIBLE, square_size)
             for move_to_square in legal_moves:
-                actual_col = chess.square_file(move_to_square)
-                actual_row = chess.square_rank(move_to_square)
-                
-                display_col = actual_col
-                display_row = (7 - actual_row) if not player_is_black_view else actual_row
-                
-                self.screen.blit(s, (display_col * SQUARE_SIZE, display_row * SQUARE_SIZE))
-        
+                target.blit(s, square_pos(*self._square_to_display(move_to_square, player_is_black_view)))
+
+        # Gambar highlight untuk langkah hint
+        if hint_move is not None:
+            s = self._get_overlay(HINT_COLOR, square_size)
+            for hint_square in (hint_move.from_square, hint_move.to_square):
+                target.blit(s, square_pos(*self._square_to_display(hint_square, player_is_black_view)))
+
         # Gambar bidak
         for square in chess.SQUARES:
             piece = board.piece_at(square)
-            if piece:
-                actual_col = chess.square_file(square)
-                actual_row = chess.square_rank(square) 
-
-                display_col = actual_col 
-                display_row = (7 - actual_row) if not player_is_black_view else actual_row 
-
+            if piece and square != lifted_square:
                 piece_char = piece.symbol()
-                if piece_char in self.images:
-                    self.screen.blit(self.images[piece_char], (display_col * SQUARE_SIZE, display_row * SQUARE_SIZE)) 
+                if piece_char in images:
+                    target.blit(images[piece_char], square_pos(*self._square_to_display(square, player_is_black_view)))
                 else:
-                    print(f"Warning: Image for piece '{piece_char}' not found.")
+                    logger.warning("Image for piece '%s' not found.", piece_char)
 
         # Gambar highlight untuk Raja yang di-check
         if game_status and game_status["check"]:
             king_square = board.king(board.turn)
-            if king_square:
-                actual_col = chess.square_file(king_square)
-                actual_row = chess.square_rank(king_square)
-
-                display_col = actual_col
-                display_row = (7 - actual_row) if not player_is_black_view else actual_row
-
-                s = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE), pygame.SRCALPHA)
-                s.fill(CHECK_COLOR)
-                self.screen.blit(s, (display_col * SQUARE_SIZE, display_row * SQUARE_SIZE))
+            if king_square is not None:
+                s = self._get_overlay(CHECK_COLOR, square_size)
+                target.blit(s, square_pos(*self._square_to_display(king_square, player_is_black_view)))
 
-        # --- Gambar Sidebar ---
-        pygame.draw.rect(self.screen, SIDEBAR_COLOR, (BOARD_RENDER_SIZE, 0, SIDEBAR_WIDTH, HEIGHT))
+    def _draw_sidebar(self, game_status):
+        """Menggambar latar sidebar dan pesan status game di bagian bawahnya."""
+        pygame.draw.rect(self.screen, SIDEBAR_COLOR, (self.sidebar_x, 0, self.sidebar_width, self.height))
 
         # Tampilkan status game (misalnya, giliran siapa, checkmate, dll.) di sidebar
         if game_status and "message" in game_status:
-            status_text_surface = self.font.render(game_status["message"], True, TEXT_COLOR) 
-            status_text_rect = status_text_surface.get_rect(center=(BOARD_RENDER_SIZE + SIDEBAR_WIDTH // 2, HEIGHT - 50))
+            status_text_surface = self.font.render(game_status["message"], True, TEXT_COLOR)
+            status_text_rect = status_text_surface.get_rect(center=(self.sidebar_x + self.sidebar_width // 2, self.height - int(50 * self.ui_scale)))
             self.screen.blit(status_text_surface, status_text_rect)
-            
-    def draw_buttons(self, cursor_pos=None, game_state="playing"):
+
+    def draw_exhibition(self, boards, focused_index=None, game_status=None):
+        """
+        Menggambar semua papan eksibisi sebagai grid (lihat set_exhibition_board_count).
+        boards: list (chess_game, selected_square, legal_moves, game_status, player_is_black_view, hint_move) per papan.
+        Setiap papan dirender ke surface sendiri yang di-cache dan hanya digambar ulang jika posisi
+        (chess_game.position_version), seleksi, atau ukuran tile berubah; frame biasa hanya berupa blit.
+        focused_index: Papan yang sedang aktif (diberi bingkai); game_status: status papan itu untuk sidebar.
+        """
+        pygame.draw.rect(self.screen, (0, 0, 0), (0, 0, self.board_render_size, self.height))
+        square_size = self.exhibition_square_size
+        images = None
+
+        for board_index, (tile, board_state) in enumerate(zip(self.exhibition_tiles, boards)):
+            chess_game, selected_square, legal_moves, board_status, player_is_black_view, hint_move = board_state
+            # Objek game ikut dibandingkan (identitas): versi posisi hanya unik per ChessGame
+            signature = (chess_game, chess_game.position_version, selected_square, tuple(legal_moves or ()),
+                         bool(board_status and board_status["check"]), player_is_black_view, hint_move, square_size)
+            cached = self._exhibition_surfaces.get(board_index)
+            if cached is None or cached[0] != signature:
+                if images is None:
+                    images = self._get_piece_sprites(square_size)
+                surface = cached[1] if cached is not None else pygame.Surface(tile.size).convert()
+                self._render_board(surface, square_size, (0, 0), images, chess_game.get_board_state(), selected_square, legal_moves,
+                                   board_status, player_is_black_view, hint_move)
+                self._exhibition_surfaces[board_index] = (signature, surface)
+            self.screen.blit(self._exhibition_surfaces[board_index][1], tile.topleft)
+
+        if focused_index is not None and 0 <= focused_index < len(self.exhibition_tiles):
+            border = max(2, int(4 * self.ui_scale))
+            pygame.draw.rect(self.screen, EXHIBITION_FOCUS_COLOR,
+                             self.exhibition_tiles[focused_index].inflate(border * 2, border * 2), border)
+
+        self._draw_sidebar(game_status)
+
+    def draw_buttons(self, cursor_pos=None, game_state="playing", active_buttons=()):
         """
-        Menggambar tombol-tombol kontrol (Restart, Undo, Redo, Quit).
+        Menggambar tombol-tombol kontrol (Restart, Undo, Redo, Quit, Analysis, Hint).
         cursor_pos: Posisi kursor untuk highlight hover.
         game_state: Digunakan untuk menentukan set tombol.
+        active_buttons: Nama tombol toggle yang sedang aktif (digambar dengan BUTTON_ACTIVE_COLOR).
         """
         buttons_to_draw = {}
-        if game_state in ["PLAYING_VS_COMPUTER", "PLAYING_MULTIPLAYER"]: 
+        if game_state in PLAYING_STATES:
             buttons_to_draw = self.in_game_buttons
         elif game_state == "IN_GAME_MENU": # Ini adalah menu overlay saat game "di-pause"
             buttons_to_draw = self.menu_buttons
 
+        hovered_button = self.get_button_clicked(cursor_pos, game_state)
         for button_name, button_rect in buttons_to_draw.items():
             current_button_color = BUTTON_COLOR
-            if cursor_pos is not None and button_rect.collidepoint(cursor_pos): 
+            if button_name == hovered_button:
                 current_button_color = BUTTON_HOVER_COLOR
-            
+            if button_name in active_buttons:
+                current_button_color = BUTTON_ACTIVE_COLOR
+
             pygame.draw.rect(self.screen, current_button_color, button_rect, border_radius=5)
 
             # Teks tombol sama dengan namanya
@@ -227,73 +536,136 @@ class ChessGUI:
             text_rect = text_surface.get_rect(center=button_rect.center)
             self.screen.blit(text_surface, text_rect)
 
-    def draw_homepage(self, cursor_pos=None):
+    def draw_history_scrubber(self, current_ply, total_plies, branch_plies=()):
+        """
+        Menggambar scrubber timeline riwayat langkah: label posisi, track dengan bagian yang sudah
+        dimainkan, penanda ply bercabang (variasi), dan handle di posisi sekarang.
+        Label hanya di-render ulang saat ply atau panjang timeline berubah.
+        """
+        rect = self.history_scrubber_rect
+        label_key = (current_ply, total_plies)
+        if self._scrubber_label is None or self._scrubber_label[0] != label_key:
+            label = f"Ply {current_ply}/{total_plies}" if total_plies else "No moves yet"
+            self._scrubber_label = (label_key, self.small_font.render(label, True, TEXT_COLOR))
+        self.screen.blit(self._scrubber_label[1], rect.topleft)
+
+        track_height = max(4, int(SCRUBBER_TRACK_HEIGHT * self.ui_scale))
+        track = pygame.Rect(rect.x, rect.bottom - track_height - self.cursor_radius // 2, rect.width, track_height)
+        pygame.draw.rect(self.screen, BUTTON_COLOR, track, border_radius=track_height // 2)
+        if total_plies <= 0:
+            return
+
+        def ply_x(ply):
+            return track.x + track.width * ply // total_plies
+
+        played = pygame.Rect(track.x, track.y, ply_x(current_ply) - track.x, track_height)
+        pygame.draw.rect(self.screen, BUTTON_ACTIVE_COLOR, played, border_radius=track_height // 2)
+        for ply in branch_plies:
+            pygame.draw.line(self.screen, SCRUBBER_BRANCH_COLOR, (ply_x(ply), track.y - track_height // 2),
+                             (ply_x(ply), track.bottom + track_height // 2), 2)
+        pygame.draw.circle(self.screen, TEXT_COLOR, (ply_x(current_ply), track.centery), track_height)
+
+    def scrubber_ply_from_pixels(self, px, total_plies):
+        """Mengonversi posisi x piksel di scrubber ke ply (0..total_plies)."""
+        rect = self.history_scrubber_rect
+        fraction = min(1.0, max(0.0, (px - rect.x) / max(1, rect.width)))
+        return round(fraction * total_plies)
+
+    def draw_analysis_panel(self, status_message, lines, snapshot_version):
+        """
+        Menggambar panel analisis engine di sidebar (di bawah tombol).
+        lines: list analysis.AnalysisLine. Teks hanya di-render ulang jika snapshot_version berubah,
+        jadi biaya per frame hanya blit.
+        """
+        if self._analysis_surfaces is None or self._analysis_surfaces[0] != snapshot_version:
+            surfaces = [self.small_font.render(status_message, True, TEXT_COLOR)]
+            for line in lines:
+                surfaces.append(self.small_font.render(f"{line.rank}. {line.score}  (d{line.depth})", True, TEXT_COLOR))
+                surfaces.append(self.small_font.render(f"   {line.pv_san}", True, ANALYSIS_TEXT_COLOR))
+            self._analysis_surfaces = (snapshot_version, surfaces)
+
+        x = self.sidebar_x + int(BUTTON_MARGIN * self.ui_scale)
+        y = self.sidebar_content_top
+        max_width = self.sidebar_width - 2 * int(BUTTON_MARGIN * self.ui_scale)
+        for surface in self._analysis_surfaces[1]:
+            self.screen.blit(surface, (x, y), area=pygame.Rect(0, 0, max_width, surface.get_height()))
+            y += surface.get_height() + ANALYSIS_LINE_SPACING
+
+    def draw_homepage(self, cursor_pos=None, status_text=None):
         """
         Menggambar halaman utama game dengan grafis UI, background solid, dan tombol.
+        status_text: Pesan opsional di bawah tombol (misal saat kamera masih dimuat).
         """
-        self.screen.fill(UI_BACKGROUND_COLOR) 
-        
+        self.screen.fill(UI_BACKGROUND_COLOR)
+
         if self.ui_graphics.get("homepage_graphic"):
             graphic = self.ui_graphics["homepage_graphic"]
-            graphic_rect = graphic.get_rect(center=(WIDTH // 2, HEIGHT * 0.45)) 
+            graphic_rect = graphic.get_rect(center=(self.width // 2, self.height * 0.45))
             self.screen.blit(graphic, graphic_rect)
-        
+
         title_part1 = self.homepage_font_title.render("CHESS HAND", True, TEXT_COLOR)
         title_part2 = self.homepage_font_title.render("GESTURE", True, TEXT_COLOR)
 
-        title1_rect = title_part1.get_rect(center=(WIDTH // 2, HEIGHT * 0.15)) 
-        title2_rect = title_part2.get_rect(center=(WIDTH // 2, HEIGHT * 0.25)) 
+        title1_rect = title_part1.get_rect(center=(self.width // 2, self.height * 0.15))
+        title2_rect = title_part2.get_rect(center=(self.width // 2, self.height * 0.25))
         self.screen.blit(title_part1, title1_rect)
         self.screen.blit(title_part2, title2_rect)
 
+        hovered_button = self.get_button_clicked(cursor_pos, "HOMEPAGE")
         for button_name, button_rect in self.homepage_buttons.items():
             current_button_color = BUTTON_COLOR
-            if cursor_pos is not None and button_rect.collidepoint(cursor_pos): 
+            if button_name == hovered_button:
                 current_button_color = BUTTON_HOVER_COLOR
-            
+
             pygame.draw.rect(self.screen, current_button_color, button_rect, border_radius=5)
-            
+
             text_surface = self.button_font.render(button_name, True, BUTTON_TEXT_COLOR)
             text_rect = text_surface.get_rect(center=button_rect.center)
             self.screen.blit(text_surface, text_rect)
 
+        if status_text:
+            status_surface = self.button_font.render(status_text, True, TEXT_COLOR)
+            status_rect = status_surface.get_rect(center=(self.width // 2, self.height - int(30 * self.ui_scale)))
+            self.screen.blit(status_surface, status_rect)
+
 
     def draw_color_selection(self, cursor_pos=None, selected_mode=None, selected_player_color_name=None):
         """
         Menggambar layar pemilihan warna pemain.
         selected_mode: 'VS COMPUTER' atau 'MULTIPLAYER'
         """
-        self.screen.fill(UI_BACKGROUND_COLOR) 
+        self.screen.fill(UI_BACKGROUND_COLOR)
 
         if self.ui_graphics.get("color_select_graphic"):
             graphic = self.ui_graphics["color_select_graphic"]
-            graphic_rect = graphic.get_rect(center=(WIDTH // 2, HEIGHT * 0.45)) 
+            graphic_rect = graphic.get_rect(center=(self.width // 2, self.height * 0.45))
             self.screen.blit(graphic, graphic_rect)
 
         title_text = self.mode_selection_font_title.render(selected_mode, True, TEXT_COLOR)
-        title_rect = title_text.get_rect(center=(WIDTH // 2, HEIGHT * 0.15)) 
+        title_rect = title_text.get_rect(center=(self.width // 2, self.height * 0.15))
         self.screen.blit(title_text, title_rect)
 
+        hovered_button = self.get_button_clicked(cursor_pos, "PLAYER_COLOR_SELECTION")
         for button_name, button_rect in self.player_color_buttons.items():
             current_button_color = BUTTON_COLOR
-            if cursor_pos is not None and button_rect.collidepoint(cursor_pos):
+            if button_name == hovered_button:
                 current_button_color = BUTTON_HOVER_COLOR
-            if selected_player_color_name == button_name: 
-                current_button_color = (0, 150, 150) 
+            if selected_player_color_name == button_name:
+                current_button_color = (0, 150, 150)
 
             pygame.draw.rect(self.screen, current_button_color, button_rect, border_radius=5)
             text_surface = self.button_font.render(button_name, True, BUTTON_TEXT_COLOR)
             text_rect = text_surface.get_rect(center=button_rect.center)
             self.screen.blit(text_surface, text_rect)
-        
+
     def draw_pause_overlay(self):
         """Menggambar overlay saat game di-pause (untuk menu in-game)."""
-        overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA) 
+        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 150))
         self.screen.blit(overlay, (0, 0))
 
         menu_text = self.font.render("MENU", True, TEXT_COLOR) # Ganti "PAUSE" menjadi "MENU"
-        menu_text_rect = menu_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 200)) 
+        menu_text_rect = menu_text.get_rect(center=(self.width // 2, self.height // 2 - int(200 * self.ui_scale)))
         self.screen.blit(menu_text, menu_text_rect)
 
     def get_button_clicked(self, click_pos, current_game_state):
@@ -301,36 +673,48 @@ class ChessGUI:
         Mengecek tombol mana yang diklik berdasarkan posisi piksel dan state game.
         Mengembalikan nama tombol (string) atau None jika tidak ada tombol.
         """
-        buttons_to_check = {}
-        if current_game_state == "HOMEPAGE":
-            buttons_to_check = self.homepage_buttons
-        elif current_game_state == "PLAYER_COLOR_SELECTION": 
-            buttons_to_check = self.player_color_buttons
-        elif current_game_state in ["PLAYING_VS_COMPUTER", "PLAYING_MULTIPLAYER"]:
-            buttons_to_check = self.in_game_buttons
-        elif current_game_state == "IN_GAME_MENU":
-            buttons_to_check = self.menu_buttons
-
-        if click_pos is None: 
+        index = self.hit_indexes.get(current_game_state)
+        if index is None or click_pos is None:
             return None
 
-        for button_name, button_rect in buttons_to_check.items():
-            if button_rect.collidepoint(click_pos):
-                return button_name
-        return None
-    
-    def draw_cursor(self, cursor_x, cursor_y, is_closed=False):
+        target_name, grid_cell = index.query(click_pos)
+        if grid_cell is not None: # Grid papan, bukan tombol
+            return None
+        return target_name
+
+    def draw_cursor(self, cursor_x, cursor_y, is_closed=False, player_slot=0):
         """
         Menggambar kursor gestur di layar.
+        player_slot: Indeks tangan/pemain (0/1), menentukan warna kursor saat tangan terbuka.
         """
-        cursor_color = (0, 255, 0) if not is_closed else (255, 0, 0)
-        pygame.draw.circle(self.screen, cursor_color, (cursor_x, cursor_y), 15)
+        cursor_color = CURSOR_OPEN_COLORS[player_slot % len(CURSOR_OPEN_COLORS)] if not is_closed else (255, 0, 0)
+        pygame.draw.circle(self.screen, cursor_color, (cursor_x, cursor_y), self.cursor_radius)
 
+    def report_frame_time(self, frame_ms):
+        """
+        Dipanggil sekali per frame dengan lama kerja frame (ms, tanpa waktu tidur).
+        Menyesuaikan resolusi internal papan berdasarkan rata-rata waktu kerja per frame
+        (hanya jika adaptive_resolution aktif). Menggunakan hysteresis + cooldown agar tidak berkedip.
+        """
+        if not self.adaptive_resolution:
+            return
+        self._avg_frame_ms = self._avg_frame_ms * 0.9 + frame_ms * 0.1
+        self._frames_since_scale_change += 1
+        if self._frames_since_scale_change < RENDER_SCALE_COOLDOWN_FRAMES:
+            return
+
+        if self.render_scale >= 1.0 and self._avg_frame_ms > FRAME_BUDGET_MS * RENDER_SCALE_DOWN_RATIO:
+            self.render_scale = LOW_RENDER_SCALE
+            self._frames_since_scale_change = 0
+            log_event(logger, "render_scale", "Frame time over budget, lowering board internal resolution.", frame_ms=round(self._avg_frame_ms, 1), scale=LOW_RENDER_SCALE)
+        elif self.render_scale < 1.0 and self._avg_frame_ms < FRAME_BUDGET_MS * RENDER_SCALE_UP_RATIO:
+            self.render_scale = 1.0
+            self._frames_since_scale_change = 0
+            log_event(logger, "render_scale", "Frame time back within budget, restoring board internal resolution.", frame_ms=round(self._avg_frame_ms, 1), scale=1.0)
 
     def update_display(self):
         """Memperbarui tampilan layar Pygame."""
         pygame.display.flip()
-        self.clock.tick(FPS)
 
     def quit(self):
         """Keluar dari Pygame."""
@@ -345,18 +729,34 @@ class ChessGUI:
         if px is None or py is None:
             return None
 
-        # Hanya deteksi klik jika berada di area papan catur (0 hingga BOARD_RENDER_SIZE di sumbu X)
-        if 0 <= px < BOARD_RENDER_SIZE and 0 <= py < HEIGHT:
-            col = px // SQUARE_SIZE
-            if not player_is_black_view: 
-                row = 7 - (py // SQUARE_SIZE)
-            else: 
-                row = py // SQUARE_SIZE 
-            
+        # Hanya deteksi klik jika berada di area papan catur (grid papan di indeks hit-test)
+        target_name, grid_cell = self._playing_hit_index.query((px, py))
+        if target_name == BOARD_HIT_TARGET:
+            col, display_row = grid_cell
+            if not player_is_black_view:
+                row = 7 - display_row
+            else:
+                row = display_row
+
             square = chess.square(col, row)
             return square
         return None
 
+    def get_exhibition_square_from_pixels(self, px, py, player_is_black_view=False):
+        """
+        Mengonversi koordinat piksel di layar eksibisi ke (indeks_papan, nama_kotak),
+        atau None jika tidak berada di atas salah satu papan.
+        """
+        if px is None or py is None:
+            return None
+        target_name, grid_cell = self.hit_indexes[EXHIBITION_STATE].query((px, py))
+        if grid_cell is None:
+            return None
+        _, board_index = target_name
+        col, display_row = grid_cell
+        row = 7 - display_row if not player_is_black_view else display_row
+        return board_index, chess.square_name(chess.square(col, row))
+
     def get_square_name_from_pixels(self, px, py, player_is_black_view=False):
         """
         Mengonversi koordinat piksel ke nama kotak catur (e.g., 'e2').
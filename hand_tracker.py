@@ -0,0 +1,116 @@
+# Landmark yang dilacak dengan optical flow di antara frame inferensi (indeks MediaPipe HandLandmark)
+THUMB_TIP = 4
+INDEX_FINGER_TIP = 8
+TRACKED_LANDMARKS = (THUMB_TIP, INDEX_FINGER_TIP)
+
+PATCH_PADDING = 48 # Piksel di sekitar titik yang ikut dipotong sebagai patch grayscale
+LK_WINDOW_SIZE = (15, 15)
+LK_MAX_LEVEL = 2
+LK_MAX_ERROR = 30.0 # Error LK di atas ini dianggap kehilangan jejak -> paksa inferensi penuh
+MIN_HANDEDNESS_SCORE = 0.6 # Hasil inferensi dengan skor di bawah ini tidak dilacak dengan optical flow
+
+class OpticalFlowHandTracker:
+    """
+    Melacak ujung jempol dan ujung telunjuk di antara frame inferensi MediaPipe dengan sparse
+    optical flow (cv2.calcOpticalFlowPyrLK) pada patch grayscale kecil di sekitar titik tersebut.
+    Hasilnya adalah salinan landmark dari inferensi terakhir dengan dua titik itu diperbarui,
+    sehingga get_hand_position dan is_hand_closed tetap bekerja tanpa perubahan.
+    """
+    def __init__(self):
+        self._tracks = [] # Per tangan: (DetectedHand asal, patch_gray, origin_patch, titik float32 relatif patch)
+
+    @property
+    def is_tracking(self):
+        return bool(self._tracks)
+
+    def reset(self):
+        self._tracks = []
+
+    def _crop_patch(self, frame, points):
+        """Memotong patch grayscale di sekitar titik (piksel frame). Mengembalikan (patch, (x0, y0))."""
+        import cv2 # Sudah dimuat oleh gesture_control sebelum tracker dipakai
+
+        frame_h, frame_w = frame.shape[:2]
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        x0 = max(0, int(min(xs)) - PATCH_PADDING)
+        y0 = max(0, int(min(ys)) - PATCH_PADDING)
+        x1 = min(frame_w, int(max(xs)) + PATCH_PADDING)
+        y1 = min(frame_h, int(max(ys)) + PATCH_PADDING)
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            return None, (x0, y0)
+        return cv2.cvtColor(frame[y0:y1, x0:x1], cv2.COLOR_BGR2GRAY), (x0, y0)
+
+    def start(self, frame, hands):
+        """
+        Memulai pelacakan dari hasil inferensi penuh (list DetectedHand) pada frame ini.
+        Jika ada satu tangan saja yang tidak bisa dilacak (skor rendah atau patch tidak valid), tidak
+        ada yang dilacak: track() mengembalikan None sehingga frame berikutnya memakai inferensi penuh.
+        Melacak sebagian tangan saja akan membuat tangan lainnya hilang di frame optical flow.
+        """
+        import numpy as np
+
+        self._tracks = []
+        frame_h, frame_w = frame.shape[:2]
+        tracks = []
+        for hand in hands:
+            if hand.handedness is not None and hand.score < MIN_HANDEDNESS_SCORE:
+                return
+            points = [(hand.landmarks.landmark[i].x * frame_w, hand.landmarks.landmark[i].y * frame_h)
+                      for i in TRACKED_LANDMARKS]
+            patch, (x0, y0) = self._crop_patch(frame, points)
+            if patch is None:
+                return
+            relative = np.array([[[x - x0, y - y0]] for x, y in points], dtype=np.float32)
+            tracks.append((hand, patch, (x0, y0), relative))
+        self._tracks = tracks
+
+    def track(self, frame):
+        """
+        Memperbarui titik yang dilacak ke frame ini.
+        Mengembalikan list DetectedHand (landmark salinan dengan titik terbaru), atau None jika
+        jejak hilang/tidak yakin sehingga pemanggil sebaiknya menjalankan inferensi penuh.
+        """
+        import cv2
+        import numpy as np
+
+        if not self._tracks:
+            return None
+
+        frame_h, frame_w = frame.shape[:2]
+        updated_tracks = []
+        hands = []
+        for hand, prev_patch, (x0, y0), prev_points in self._tracks:
+            patch_h, patch_w = prev_patch.shape[:2]
+            current_region = frame[y0:y0 + patch_h, x0:x0 + patch_w]
+            if current_region.shape[:2] != (patch_h, patch_w):
+                self.reset()
+                return None
+            current_patch = cv2.cvtColor(current_region, cv2.COLOR_BGR2GRAY)
+            next_points, status, error = cv2.calcOpticalFlowPyrLK(prev_patch, current_patch, prev_points, None,
+                                                                  winSize=LK_WINDOW_SIZE, maxLevel=LK_MAX_LEVEL)
+            if next_points is None or not status.all() or float(error.max()) > LK_MAX_ERROR:
+                self.reset()
+                return None
+
+            absolute = [(float(p[0][0]) + x0, float(p[0][1]) + y0) for p in next_points]
+
+            # Salin landmark inferensi terakhir, lalu perbarui titik yang dilacak (koordinat ternormalisasi)
+            landmarks = type(hand.landmarks)()
+            landmarks.CopyFrom(hand.landmarks)
+            for landmark_index, (x, y) in zip(TRACKED_LANDMARKS, absolute):
+                landmarks.landmark[landmark_index].x = x / frame_w
+                landmarks.landmark[landmark_index].y = y / frame_h
+            tracked_hand = hand._replace(landmarks=landmarks)
+            hands.append(tracked_hand)
+
+            # Patch berikutnya dipusatkan ulang di posisi titik yang baru
+            patch, (new_x0, new_y0) = self._crop_patch(frame, absolute)
+            if patch is None:
+                self.reset()
+                return None
+            relative = np.array([[[x - new_x0, y - new_y0]] for x, y in absolute], dtype=np.float32)
+            updated_tracks.append((tracked_hand, patch, (new_x0, new_y0), relative))
+
+        self._tracks = updated_tracks
+        return hands
@@ -0,0 +1,57 @@
+HIT_TEST_CELL_SIZE = 64 # Ukuran sel grid lookup (piksel)
+
+class HitTestIndex:
+    """
+    Indeks hit-test untuk satu layar, berupa grid lookup yang dihitung sekali saat layout berubah.
+    Setiap sel grid menyimpan daftar widget yang menyentuh sel itu, sehingga query(pos) hanya
+    memeriksa beberapa kandidat, tidak peduli berapa banyak widget di layar.
+
+    Dua jenis entri:
+    - rect: widget biasa (misal tombol), query mengembalikan (nama, None).
+    - grid: area yang dibagi rata menjadi kolom x baris (misal papan catur),
+            query mengembalikan (nama, (kolom, baris)) dihitung secara aritmetika.
+    """
+    def __init__(self, cell_size=HIT_TEST_CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells = {} # {(cx, cy): [(nama, rect, grid_dims atau None), ...]}
+
+    def _cell_range(self, rect):
+        first_cx, first_cy = rect.left // self.cell_size, rect.top // self.cell_size
+        last_cx, last_cy = (rect.right - 1) // self.cell_size, (rect.bottom - 1) // self.cell_size
+        for cx in range(first_cx, last_cx + 1):
+            for cy in range(first_cy, last_cy + 1):
+                yield cx, cy
+
+    def _add(self, name, rect, grid_dims):
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        entry = (name, rect, grid_dims)
+        for cell in self._cell_range(rect):
+            self._cells.setdefault(cell, []).append(entry)
+
+    def add_rect(self, name, rect):
+        """Mendaftarkan widget persegi panjang (pygame.Rect)."""
+        self._add(name, rect, None)
+
+    def add_grid(self, name, rect, cols, rows):
+        """Mendaftarkan area grid (misal papan 8x8) dengan cols x rows sel berukuran sama."""
+        self._add(name, rect, (cols, rows))
+
+    def query(self, pos):
+        """
+        Mengembalikan (nama, sel) untuk widget di posisi pos, atau (None, None).
+        sel adalah (kolom, baris) untuk entri grid, None untuk entri rect.
+        Jika widget bertumpuk, entri yang didaftarkan lebih dulu menang.
+        """
+        if pos is None:
+            return None, None
+        x, y = int(pos[0]), int(pos[1])
+        for name, rect, grid_dims in self._cells.get((x // self.cell_size, y // self.cell_size), ()):
+            if rect.collidepoint(x, y):
+                if grid_dims is None:
+                    return name, None
+                cols, rows = grid_dims
+                col = (x - rect.left) * cols // rect.width
+                row = (y - rect.top) * rows // rect.height
+                return name, (col, row)
+        return None, None
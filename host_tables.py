@@ -0,0 +1,77 @@
+# host_tables.py
+# Mode host: satu mesin menjalankan beberapa meja catur sekaligus, satu kamera per meja.
+# Setiap meja terdiri dari satu proses game (jendela pygame, logika, pool engine sendiri) dan satu
+# proses kamera (capture + inferensi MediaPipe, lihat camera_process) yang mengirim landmark lewat pipe.
+# Tidak ada GIL yang dipakai bersama, jadi meja tidak saling memperlambat selama core masih cukup
+# (per meja: ~1 core game, ~1 core inferensi, dan engine_pool.ENGINE_POOL_SIZE core saat AI berpikir).
+#
+#   python host_tables.py --cameras 0 1 2      # tiga meja: kamera 0, 1, dan 2
+#
+# Ctrl+C menghentikan semua meja.
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+
+import game_logging
+import gui_display
+import main as chess_main
+from game_logging import log_event
+
+logger = logging.getLogger(__name__)
+
+WINDOW_CASCADE_OFFSET = 40 # Piksel; jendela meja berikutnya digeser agar judul jendela sebelumnya tetap terlihat
+STOP_TIMEOUT = 5.0 # Detik menunggu meja berhenti setelah Ctrl+C sebelum di-terminate
+
+def _run_table(table_index, camera_id):
+    """Isi proses satu meja: MainGame dengan inferensi di proses kamera sendiri."""
+    offset = WINDOW_CASCADE_OFFSET * (table_index + 1)
+    os.environ["SDL_VIDEO_WINDOW_POS"] = f"{offset},{offset}" # Dibaca SDL saat jendela dibuat
+    game_logging.setup_logging()
+    try:
+        game = chess_main.MainGame(camera_id=camera_id, inference_in_subprocess=True,
+                                   caption=f"{gui_display.WINDOW_CAPTION} - Table {table_index + 1}")
+        game.start_game()
+    except Exception:
+        logger.exception("Table %s crashed.", table_index + 1)
+        game_logging.shutdown_logging()
+        dump_path = game_logging.dump_recent_records()
+        if dump_path:
+            print(f"Recent log records of table {table_index + 1} written to {dump_path}")
+        raise
+    finally:
+        game_logging.shutdown_logging()
+
+def main():
+    parser = argparse.ArgumentParser(description="Host several chess tables on one machine, one camera per table.")
+    parser.add_argument("--cameras", type=int, nargs="+", default=[0], help="Camera IDs; one table is started per camera.")
+    args = parser.parse_args()
+
+    game_logging.setup_logging()
+    context = multiprocessing.get_context("spawn") # Proses meja tidak mewarisi state pygame/thread host
+    tables = [context.Process(target=_run_table, args=(table_index, camera_id), name=f"table-{table_index + 1}")
+              for table_index, camera_id in enumerate(args.cameras)]
+    for table in tables:
+        table.start()
+    log_event(logger, "host_started", "Hosting chess tables.", tables=len(tables), cameras=args.cameras)
+
+    try:
+        for table in tables:
+            table.join()
+    except KeyboardInterrupt:
+        logger.info("Stopping all tables.")
+        for table in tables:
+            table.join(STOP_TIMEOUT) # Ctrl+C juga sampai ke proses meja, biarkan mereka bersih-bersih dulu
+            if table.is_alive():
+                table.terminate()
+                table.join()
+    finally:
+        failed = [table.name for table in tables if table.exitcode not in (0, None)]
+        if failed:
+            log_event(logger, "host_table_failed", "Some tables exited with an error.", logging.ERROR, tables=failed)
+        game_logging.shutdown_logging()
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+import time
+from collections import deque, namedtuple
+
+# Jenis event gestur
+HOVER_ENTER = "HOVER_ENTER" # Kursor masuk ke target (tombol / kotak papan)
+HOVER_LEAVE = "HOVER_LEAVE" # Kursor keluar dari target
+PRESS = "PRESS" # Pinch dimulai (tangan menutup)
+DRAG = "DRAG" # Kursor bergerak selama pinch ditahan
+RELEASE = "RELEASE" # Pinch dilepas (tangan membuka)
+
+# Jenis target di bawah kursor
+TARGET_BUTTON = "button"
+TARGET_SQUARE = "square"
+
+# type: salah satu jenis event di atas
+# pos: posisi kursor (x, y) saat event, atau None jika tangan tidak terdeteksi
+# target_kind / target: jenis dan nama target (misal "button", "Undo" atau "square", "e2"), atau None
+# timestamp: waktu (time.perf_counter) frame kamera yang menghasilkan event, untuk mengukur latensi input
+GestureEvent = namedtuple("GestureEvent", ["type", "pos", "target_kind", "target", "timestamp"])
+
+MAX_QUEUED_EVENTS = 64 # Batas antrian agar event lama tidak menumpuk jika tidak pernah dibaca
+
+class GestureInputTracker:
+    """
+    Mengubah stream gestur per frame (posisi kursor + status pinch) menjadi antrian event bertipe.
+    Hit-test (resolve_target) hanya dijalankan saat posisi kursor atau konteks layar berubah,
+    bukan setiap frame.
+    """
+    def __init__(self):
+        self.events = deque(maxlen=MAX_QUEUED_EVENTS)
+        self.cursor_pos = None
+        self.is_pressed = False
+        self.hover_kind, self.hover_target = None, None
+        self._context = None
+
+        # Statistik latensi input (dari timestamp frame kamera sampai event ditangani)
+        self.last_latency_ms = None
+        self.avg_latency_ms = None
+        self.handled_count = 0
+
+    def update(self, cursor_pos, is_closed, resolve_target, context=None, timestamp=None):
+        """
+        Memproses satu frame input gestur.
+        cursor_pos: (x, y) atau None jika tangan tidak terdeteksi.
+        is_closed: True jika pinch terdeteksi.
+        resolve_target: fungsi pos -> (target_kind, target) atau (None, None), dipakai untuk hit-test.
+        context: nilai apa pun yang mewakili layout/layar saat ini (misal game_state + ukuran jendela);
+                 jika berubah, target di bawah kursor di-resolve ulang walau kursor diam.
+        timestamp: waktu frame kamera (default: sekarang).
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+
+        moved = cursor_pos != self.cursor_pos
+        if moved or context != self._context:
+            if cursor_pos is not None:
+                kind, target = resolve_target(cursor_pos)
+            else:
+                kind, target = None, None
+            if (kind, target) != (self.hover_kind, self.hover_target):
+                if self.hover_target is not None:
+                    self._push(HOVER_LEAVE, cursor_pos, self.hover_kind, self.hover_target, timestamp)
+                if target is not None:
+                    self._push(HOVER_ENTER, cursor_pos, kind, target, timestamp)
+                self.hover_kind, self.hover_target = kind, target
+            self._context = context
+        self.cursor_pos = cursor_pos
+
+        if is_closed and not self.is_pressed:
+            self._push(PRESS, cursor_pos, self.hover_kind, self.hover_target, timestamp)
+        elif not is_closed and self.is_pressed:
+            self._push(RELEASE, cursor_pos, self.hover_kind, self.hover_target, timestamp)
+        elif is_closed and moved and cursor_pos is not None:
+            self._push(DRAG, cursor_pos, self.hover_kind, self.hover_target, timestamp)
+        self.is_pressed = is_closed
+
+    def _push(self, event_type, pos, target_kind, target, timestamp):
+        self.events.append(GestureEvent(event_type, pos, target_kind, target, timestamp))
+
+    def poll(self):
+        """Mengambil (dan mengosongkan) semua event yang menunggu, urut dari yang paling lama."""
+        while self.events:
+            yield self.events.popleft()
+
+    def note_handled(self, event):
+        """Mencatat latensi sebuah event (sejak frame kamera) setelah selesai ditangani."""
+        latency_ms = (time.perf_counter() - event.timestamp) * 1000
+        self.last_latency_ms = latency_ms
+        if self.avg_latency_ms is None:
+            self.avg_latency_ms = latency_ms
+        else:
+            self.avg_latency_ms = self.avg_latency_ms * 0.9 + latency_ms * 0.1
+        self.handled_count += 1
+
+
+CURSOR_ROI_MARGIN = 0.05 # Area tepi frame kamera (persentase) yang tidak dipetakan ke layar
+
+class HandCursor:
+    """
+    Kursor gestur untuk satu tangan: pemetaan posisi jari di frame kamera ke layar (dengan ROI
+    dan smoothing), status pinch, dan GestureInputTracker miliknya sendiri.
+    """
+    def __init__(self, start_pos, smoothing_factor):
+        self.smoothed_x, self.smoothed_y = start_pos
+        self.smoothing_factor = smoothing_factor
+        self.pos = None # Posisi kursor (x, y) di layar, atau None jika tangan tidak terdeteksi
+        self.is_closed = False
+        self.tracker = GestureInputTracker()
+
+    def update(self, raw_pos, is_closed, frame_size, screen_size):
+        """
+        raw_pos: (x, y) ujung jari telunjuk dalam piksel frame kamera, atau None.
+        frame_size / screen_size: (lebar, tinggi) frame kamera dan layar game.
+        """
+        self.is_closed = is_closed if raw_pos is not None else False
+        if raw_pos is None:
+            self.pos = None
+            return
+
+        # --- Terapkan Smoothing Kursor, hanya area ROI di tengah frame yang dipetakan ke layar ---
+        cursor_x_raw, cursor_y_raw = raw_pos
+        img_w, img_h = frame_size
+        screen_w, screen_h = screen_size
+        roi_x_start = int(img_w * CURSOR_ROI_MARGIN)
+        roi_x_end = int(img_w * (1 - CURSOR_ROI_MARGIN))
+        roi_y_start = int(img_h * CURSOR_ROI_MARGIN)
+        roi_y_end = int(img_h * (1 - CURSOR_ROI_MARGIN))
+
+        if roi_x_start <= cursor_x_raw <= roi_x_end and \
+           roi_y_start <= cursor_y_raw <= roi_y_end:
+            normalized_x_roi = (cursor_x_raw - roi_x_start) / (roi_x_end - roi_x_start)
+            normalized_y_roi = (cursor_y_raw - roi_y_start) / (roi_y_end - roi_y_start)
+
+            target_x = int(normalized_x_roi * screen_w)
+            target_y = int(normalized_y_roi * screen_h)
+        else:
+            target_x, target_y = self.smoothed_x, self.smoothed_y
+
+        self.smoothed_x = int(self.smoothed_x * self.smoothing_factor + target_x * (1 - self.smoothing_factor))
+        self.smoothed_y = int(self.smoothed_y * self.smoothing_factor + target_y * (1 - self.smoothing_factor))
+        self.pos = (self.smoothed_x, self.smoothed_y)
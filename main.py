@@ -1,26 +1,72 @@
+import time
+STARTUP_T0 = time.perf_counter() # Titik awal pengukuran time-to-first-frame
+
 import pygame
-import cv2
 import chess
 import asyncio 
+import logging
 import sys 
-import random 
 
 # Import modul-modul lokal secara eksplisit
 import gesture_control
+import camera_process
 import chess_game
 import gui_display
+import frame_scheduler
+import input_events
+import analysis
+import engine_pool
+import exhibition
+import gesture_shortcuts
+import game_logging
+from game_logging import log_event
+
+logger = logging.getLogger(__name__)
 
 # --- KONSTANTA ---
 CURSOR_SMOOTHING_FACTOR = 0.6 
 
+# Mode multiplayer dua tangan: satu kamera + satu inferensi untuk dua pemain
+TWO_HAND_MULTIPLAYER = True
+HAND_ASSIGNMENT_MODE = gesture_control.ASSIGN_BY_SCREEN_HALF # Atau gesture_control.ASSIGN_BY_HANDEDNESS
+PLAYER_SLOT_COLORS = [chess.WHITE, chess.BLACK] # Warna yang dikendalikan tangan pemain 0 dan 1
+
+# Capture + inferensi MediaPipe di proses terpisah (camera_process); mode host (host_tables.py) selalu memakainya
+INFERENCE_IN_SUBPROCESS = False
+
+# Shortcut gestur (swipe/thumbs down -> Undo/Redo/Restart) untuk tangan pemain utama; butuh model terlatih
+ENABLE_GESTURE_SHORTCUTS = True
+
+# Tampilan: fullscreen (kiosk) dan penurunan resolusi internal papan saat frame terlalu lambat
+START_FULLSCREEN = False
+ADAPTIVE_BOARD_RESOLUTION = True
+
 # Waktu "berpikir" AI yang tetap (default)
-AI_FIXED_THINKING_TIME = 1.0 # Jeda 1.0 detik untuk AI sederhana
+AI_FIXED_THINKING_TIME = 1.0 # Batas waktu engine per langkah (juga jeda AI sederhana jika tidak ada engine)
+AI_MOVE_JOB_KEY = "ai_move"
+
+# Hint: langkah saran engine untuk pemain, ditampilkan di papan sampai posisi berubah
+HINT_THINKING_TIME = 0.5
+HINT_DEADLINE_SECONDS = 3.0 # Hint yang belum mulai dalam waktu ini dibuang (pemain sudah tidak menunggu)
+HINT_JOB_KEY = "hint"
 
 class MainGame:
-    def __init__(self):
-        self.gesture_controller = gesture_control.GestureController()
+    def __init__(self, camera_id=0, inference_in_subprocess=INFERENCE_IN_SUBPROCESS, caption=gui_display.WINDOW_CAPTION):
+        """
+        camera_id: Kamera yang dipakai meja ini.
+        inference_in_subprocess: Jika True, capture dan inferensi berjalan di proses kamera sendiri
+                                 (camera_process.RemoteGestureController), bukan di thread game.
+        caption: Judul jendela (mode host memberi nama per meja).
+        """
+        # Satu tangan di semua mode; dua tangan hanya saat multiplayer dua tangan (diatur tiap frame dari _two_hand_active)
+        if inference_in_subprocess:
+            self.gesture_controller = camera_process.RemoteGestureController(camera_id, max_num_hands=1)
+        else:
+            self.gesture_controller = gesture_control.GestureController(max_num_hands=1)
+        self.camera_id = camera_id
         self.chess_game = chess_game.ChessGame()
-        self.gui = gui_display.ChessGUI() 
+        self.gui = gui_display.ChessGUI(fullscreen=START_FULLSCREEN, adaptive_resolution=ADAPTIVE_BOARD_RESOLUTION,
+                                        caption=caption) 
 
         self.running = False
         
@@ -28,18 +74,27 @@ class MainGame:
         # State IN_GAME_MENU tidak lagi ada sebagai state terpisah
         self.game_state = "HOMEPAGE" 
         
-        self.current_cursor_x, self.current_cursor_y = None, None 
-        self.is_hand_closed = False
-        self.prev_is_hand_closed = False
+        # Satu kursor per tangan (index 0 = pemain utama; index 1 hanya dipakai di multiplayer dua tangan)
+        start_pos = (self.gui.width // 2, self.gui.height // 2)
+        self.hand_cursors = [input_events.HandCursor(start_pos, CURSOR_SMOOTHING_FACTOR) for _ in PLAYER_SLOT_COLORS]
         
         self.selected_square_gui = None 
         self.possible_moves_gui = [] 
         
         self.click_state = "IDLE" 
-        self.smoothed_cursor_x = gui_display.WIDTH // 2 
-        self.smoothed_cursor_y = gui_display.HEIGHT // 2 
+        self.drag_slot = 0 # Tangan (player_slot) yang sedang men-drag bidak terpilih
 
         self.ai_task = None 
+        self.exhibition_boards = [] # Papan mode eksibisi (exhibition.ExhibitionBoard), diisi saat mode dimulai
+        self.exhibition_focus = None # Indeks papan eksibisi yang sedang aktif (tombol sidebar berlaku untuknya)
+        self.engine_pool = engine_pool.EnginePool() # Proses engine bersama: langkah AI, hint, dan analisis
+        self.ai_pool = exhibition.AIWorkerPool(self.engine_pool) # Balasan AI untuk semua papan eksibisi
+        self.shortcut_recognizer = gesture_shortcuts.GestureShortcutRecognizer() if ENABLE_GESTURE_SHORTCUTS else None
+        self.hint = None # (ChessGame, position_version, chess.Move) hint terakhir; hanya tampil selama posisi sama
+        self._hint_job = None
+        self.analyzer = analysis.LiveAnalyzer(self.engine_pool) # Panel analisis engine (multi-PV), dinyalakan lewat tombol "Analysis"
+        self.scheduler = frame_scheduler.FrameScheduler(active_fps=gui_display.FPS)
+        self._last_frame_signature = None # Untuk mendeteksi apakah ada yang berubah sejak frame lalu
         
         self.player_color = chess.WHITE 
         self.ai_player_color = chess.BLACK 
@@ -48,206 +103,452 @@ class MainGame:
         self.selected_player_color_name = None 
         self.player_is_black_view = False 
 
+        # Pengukuran waktu startup (detik sejak STARTUP_T0)
+        self.first_gui_frame_time = None
+        self.first_camera_frame_time = None
+
     def start_game(self):
-        """Memulai semua subsistem (kamera, Pygame) dan game loop utama."""
-        print(f"Python version: {sys.version}")
-        print(f"python-chess version: {chess.__version__}")
+        """
+        Memulai semua subsistem dan game loop utama.
+        Jendela dan homepage tampil lebih dulu; MediaPipe dan kamera dimuat di background.
+        """
+        logger.info("Python version: %s", sys.version)
+        logger.info("python-chess version: %s", chess.__version__)
 
-        if not self.gesture_controller.start_camera():
-            print("Failed to start camera. Exiting.")
-            return
+        self.gesture_controller.start_in_background(self.camera_id)
 
-        print("Camera started. Game is running.")
         self.running = True
         asyncio.run(self.game_loop_async()) 
 
+    def _render_frame(self, cursor_pos_for_gui):
+        """Menggambar satu frame GUI sesuai game_state, lalu menampilkannya."""
+        self.gui.screen.fill((0, 0, 0)) # Selalu bersihkan layar sebelum menggambar (untuk fallback)
+
+        # Gambar elemen GUI sesuai game_state
+        if self.game_state == "HOMEPAGE":
+            status_text = None if self.gesture_controller.is_ready() else "Starting camera..."
+            self.gui.draw_homepage(cursor_pos_for_gui, status_text) 
+        elif self.game_state == "PLAYER_COLOR_SELECTION": 
+            self.gui.draw_color_selection(cursor_pos_for_gui, self.selected_game_mode, self.selected_player_color_name)
+        elif self.game_state in ["PLAYING_VS_COMPUTER", "PLAYING_MULTIPLAYER"]:
+            game_status = self.chess_game.get_game_status()
+            self.gui.draw_board(self.chess_game.get_board_state(), 
+                                 self.selected_square_gui, 
+                                 self.possible_moves_gui,
+                                 game_status,
+                                 player_is_black_view=self.player_is_black_view,
+                                 hint_move=self._hint_move_for(self.chess_game),
+                                 drag_pos=self.hand_cursors[self.drag_slot].pos if self.click_state == "SELECTED_DRAG" else None) 
+            self.gui.draw_buttons(cursor_pos_for_gui, self.game_state, self._active_buttons()) 
+            self.gui.draw_history_scrubber(*self.chess_game.get_timeline_info())
+            if self.analyzer.enabled:
+                self.gui.draw_analysis_panel(self.analyzer.status_message, self.analyzer.lines, self.analyzer.snapshot_version)
+        elif self.game_state == gui_display.EXHIBITION_STATE:
+            self._draw_exhibition(cursor_pos_for_gui)
+        # Jika tombol Quit diklik, tampilkan menu overlay, bukan state game yang terpisah
+        # Maka, tidak perlu ada "elif self.game_state == 'IN_GAME_MENU'" lagi di sini.
+        
+        # Gambar kursor gestur di atas semua elemen GUI lainnya
+        for player_slot, hand_cursor in enumerate(self.hand_cursors):
+            if hand_cursor.pos is not None:
+                self.gui.draw_cursor(hand_cursor.pos[0], hand_cursor.pos[1], hand_cursor.is_closed, player_slot)
+
+        self.gui.update_display() 
+        if self.first_gui_frame_time is None:
+            self.first_gui_frame_time = self._report_startup_time("first window frame")
+
+    def _report_startup_time(self, label):
+        """Mencatat dan mencetak waktu sejak proses dimulai sampai event startup tertentu."""
+        elapsed = time.perf_counter() - STARTUP_T0
+        log_event(logger, "startup", f"Startup: {label} after {elapsed * 1000:.0f} ms.", elapsed_ms=round(elapsed * 1000))
+        return elapsed
+
     async def game_loop_async(self):
         """Loop utama permainan, dijalankan secara asynchronous."""
         while self.running:
+            self.scheduler.begin_frame()
+
             # --- 1. Event Handling Pygame (misal: tombol tutup jendela) ---
             for event in pygame.event.get():
+                self.scheduler.mark_activity()
                 if event.type == pygame.QUIT:
                     self.running = False
-
-            # --- 2. Pemrosesan Kamera & Deteksi Gestur (Selalu Aktif) ---
-            ret, frame = self.gesture_controller.cap.read()
-            if not ret:
-                print("Failed to grab frame from camera.")
+                elif event.type == pygame.VIDEORESIZE:
+                    self.gui.handle_resize(event.w, event.h)
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
+                    self.gui.toggle_fullscreen()
+
+            # --- 2. Pemrosesan Kamera & Deteksi Gestur (Aktif setelah kamera siap) ---
+            display_frame, detected_hands = None, []
+            frame_timestamp = time.perf_counter()
+            if self.gesture_controller.has_failed():
+                logger.error("Failed to start camera. Exiting.")
                 self.running = False
                 break
-            
-            frame = cv2.flip(frame, 1) 
-            display_frame, hand_landmarks = self.gesture_controller.process_frame(frame)
-            
-            img_h, img_w, _ = display_frame.shape
-            cursor_x_raw, cursor_y_raw = self.gesture_controller.get_hand_position(hand_landmarks, img_w, img_h)
-            
-            # --- Terapkan Smoothing Kursor & Penanganan None untuk koordinat mentah ---
-            if cursor_x_raw is not None and cursor_y_raw is not None:
-                roi_x_start_perc = 0.05 
-                roi_x_end_perc = 0.95   
-                roi_y_start_perc = 0.05 
-                roi_y_end_perc = 0.95   
-
-                roi_x_start = int(img_w * roi_x_start_perc)
-                roi_x_end = int(img_w * roi_x_end_perc)
-                roi_y_start = int(img_h * roi_y_start_perc)
-                roi_y_end = int(img_h * roi_y_end_perc)
-
-                if roi_x_start <= cursor_x_raw <= roi_x_end and \
-                   roi_y_start <= cursor_y_raw <= roi_y_end:
-                    normalized_x_roi = (cursor_x_raw - roi_x_start) / (roi_x_end - roi_x_start)
-                    normalized_y_roi = (cursor_y_raw - roi_y_start) / (roi_y_end - roi_y_start)
-
-                    target_x = int(normalized_x_roi * gui_display.WIDTH) 
-                    target_y = int(normalized_y_roi * gui_display.HEIGHT)
-                else:
-                    target_x, target_y = self.smoothed_cursor_x, self.smoothed_cursor_y 
-
-                self.smoothed_cursor_x = int(self.smoothed_cursor_x * CURSOR_SMOOTHING_FACTOR + target_x * (1 - CURSOR_SMOOTHING_FACTOR))
-                self.smoothed_cursor_y = int(self.smoothed_cursor_y * CURSOR_SMOOTHING_FACTOR + target_y * (1 - CURSOR_SMOOTHING_FACTOR))
-                
-                self.current_cursor_x = self.smoothed_cursor_x
-                self.current_cursor_y = self.smoothed_cursor_y
-            else:
-                self.current_cursor_x, self.current_cursor_y = None, None 
-
-            if hand_landmarks:
-                self.is_hand_closed = self.gesture_controller.is_hand_closed(hand_landmarks)
+            elif self.gesture_controller.is_ready():
+                frame = self.gesture_controller.read_frame()
+                if frame is None:
+                    logger.error("Failed to grab frame from camera.")
+                    self.running = False
+                    break
+                frame_timestamp = self.gesture_controller.last_frame_timestamp # Waktu capture (mode host: di proses kamera)
+                display_frame, detected_hands = self.gesture_controller.detect_hands(frame) # Satu inferensi untuk semua tangan
+                if self.first_camera_frame_time is None:
+                    self.first_camera_frame_time = self._report_startup_time("first camera frame")
+                    log_event(logger, "camera_ready", "Camera and model loaded in background.", load_ms=round(self.gesture_controller.startup_seconds * 1000))
+
+            self.gesture_controller.set_max_num_hands(2 if self._two_hand_active() else 1)
+
+            # --- Bagi tangan ke pemain, lalu perbarui kursor (ROI + smoothing) dan status pinch per tangan ---
+            if self._two_hand_active():
+                hands_per_slot = self.gesture_controller.assign_hands_to_players(detected_hands, HAND_ASSIGNMENT_MODE)
             else:
-                self.is_hand_closed = False
-
-            # Siapkan posisi kursor dalam format tuple (x, y) untuk fungsi GUI, atau None
-            cursor_pos_for_gui = None
-            if self.current_cursor_x is not None and self.current_cursor_y is not None:
-                cursor_pos_for_gui = (self.current_cursor_x, self.current_cursor_y)
-
-            # --- Logika Game Berdasarkan State ---
-            if self.game_state == "HOMEPAGE":
-                self._handle_homepage_logic(cursor_pos_for_gui, self.is_hand_closed, self.prev_is_hand_closed)
-            elif self.game_state == "PLAYER_COLOR_SELECTION": 
-                await self._handle_player_color_selection_logic(cursor_pos_for_gui, self.is_hand_closed, self.prev_is_hand_closed)
-            elif self.game_state in ["PLAYING_VS_COMPUTER", "PLAYING_MULTIPLAYER"]: 
-                await self._handle_playing_logic(cursor_pos_for_gui, self.is_hand_closed, self.prev_is_hand_closed) 
-            # Dihapus: elif self.game_state == "IN_GAME_MENU":
-            #    self._handle_in_game_menu_logic(cursor_pos_for_gui, self.is_hand_closed, self.prev_is_hand_closed)
-
-            self.prev_is_hand_closed = self.is_hand_closed 
-
-            # --- Pembaharuan GUI Berdasarkan State ---
-            self.gui.screen.fill((0, 0, 0)) # Selalu bersihkan layar sebelum menggambar (untuk fallback)
-
-            # Gambar elemen GUI sesuai game_state
-            if self.game_state == "HOMEPAGE":
-                self.gui.draw_homepage(cursor_pos_for_gui) 
-            elif self.game_state == "PLAYER_COLOR_SELECTION": 
-                self.gui.draw_color_selection(cursor_pos_for_gui, self.selected_game_mode, self.selected_player_color_name)
-            elif self.game_state in ["PLAYING_VS_COMPUTER", "PLAYING_MULTIPLAYER"]:
-                game_status = self.chess_game.get_game_status()
-                self.gui.draw_board(self.chess_game.get_board_state(), 
-                                     self.selected_square_gui, 
-                                     self.possible_moves_gui,
-                                     game_status,
-                                     player_is_black_view=self.player_is_black_view) 
-                self.gui.draw_buttons(cursor_pos_for_gui, self.game_state) 
-            # Jika tombol Quit diklik, tampilkan menu overlay, bukan state game yang terpisah
-            # Maka, tidak perlu ada "elif self.game_state == 'IN_GAME_MENU'" lagi di sini.
-            
-            # Gambar kursor gestur di atas semua elemen GUI lainnya
-            if self.current_cursor_x is not None and self.current_cursor_y is not None:
-                self.gui.draw_cursor(self.current_cursor_x, self.current_cursor_y, self.is_hand_closed)
-
-            self.gui.update_display() 
+                hands_per_slot = [detected_hands[0].landmarks if detected_hands else None, None]
+
+            for hand_cursor, hand_landmarks in zip(self.hand_cursors, hands_per_slot):
+                raw_pos, is_closed = None, False
+                if display_frame is not None and hand_landmarks:
+                    img_h, img_w, _ = display_frame.shape
+                    raw_pos = self.gesture_controller.get_hand_position(hand_landmarks, img_w, img_h)
+                    is_closed = self.gesture_controller.is_hand_closed(hand_landmarks)
+                    frame_size = (img_w, img_h)
+                else:
+                    frame_size = None
+                hand_cursor.update(raw_pos, is_closed, frame_size, (self.gui.width, self.gui.height))
+
+            # Shortcut gestur hanya dari frame inferensi penuh dan tidak saat pinch (pinch = drag bidak)
+            if self.shortcut_recognizer is not None and self.game_state in gui_display.PLAYING_STATES \
+               and self.gesture_controller.last_frame_inferred:
+                if self.hand_cursors[0].is_closed:
+                    self.shortcut_recognizer.reset()
+                else:
+                    shortcut_action = self.shortcut_recognizer.update(hands_per_slot[0], frame_timestamp)
+                    if shortcut_action:
+                        await self._dispatch_shortcut(shortcut_action, frame_timestamp)
+
+            # Posisi kursor pemain utama dalam format tuple (x, y) untuk fungsi GUI (hover), atau None
+            cursor_pos_for_gui = self.hand_cursors[0].pos
+
+            # --- Ubah gestur menjadi event, lalu jalankan logika game berdasarkan state ---
+            input_context = (self.game_state, self.gui.width, self.gui.height, self.player_is_black_view)
+            for player_slot, hand_cursor in enumerate(self.hand_cursors):
+                hand_cursor.tracker.update(hand_cursor.pos, hand_cursor.is_closed, self._resolve_input_target,
+                                           context=input_context, timestamp=frame_timestamp)
+                for input_event in hand_cursor.tracker.poll():
+                    if self.game_state == "HOMEPAGE":
+                        self._handle_homepage_logic(input_event)
+                    elif self.game_state == "PLAYER_COLOR_SELECTION": 
+                        await self._handle_player_color_selection_logic(input_event)
+                    elif self.game_state in ["PLAYING_VS_COMPUTER", "PLAYING_MULTIPLAYER"]: 
+                        await self._handle_playing_logic(input_event, player_slot) 
+                    elif self.game_state == gui_display.EXHIBITION_STATE:
+                        self._handle_exhibition_logic(input_event)
+                    hand_cursor.tracker.note_handled(input_event)
+
+            if self.game_state in gui_display.PLAYING_STATES:
+                self._prefetch_hover_targets()
+
+            if self.game_state in ["PLAYING_VS_COMPUTER", "PLAYING_MULTIPLAYER"]:
+                # Posisi berubah (langkah/undo/redo) -> analisis lama langsung dibatalkan, yang baru dimulai di background
+                self.analyzer.update_position(self.chess_game.get_board_state())
+            elif self.game_state == gui_display.EXHIBITION_STATE:
+                self.analyzer.update_position(self.exhibition_boards[self.exhibition_focus].board)
+
+            self._update_frame_pacing()
+
+            # Render dibatasi saat layar diam; kamera, inferensi, dan input tetap jalan tiap iterasi
+            rendered = self.scheduler.should_render()
+            if rendered:
+                self._render_frame(cursor_pos_for_gui)
 
             # Tampilkan feed kamera untuk debugging
-            cv2.imshow('Camera Feed (Debug)', display_frame) 
-            if cv2.waitKey(1) & 0xFF == ord('q'): 
+            if display_frame is not None and self.gesture_controller.show_debug_frame(display_frame): 
                 self.running = False
             
-            await asyncio.sleep(0.01) 
+            frame_work_ms = await self.scheduler.end_frame()
+            if rendered:
+                self.gui.report_frame_time(frame_work_ms) # Hanya frame yang dirender yang dipakai resolusi adaptif
 
         # --- 5. Bersih-bersih setelah game loop selesai ---
+        await self.analyzer.close()
+        await self.ai_pool.close()
+        await self.engine_pool.close()
         self.gesture_controller.stop_camera() 
-        cv2.destroyAllWindows() 
+        self.gesture_controller.close_debug_windows() 
         self.gui.quit() 
-        print("Game closed.")
+        for player_slot, hand_cursor in enumerate(self.hand_cursors):
+            if hand_cursor.tracker.avg_latency_ms is not None:
+                log_event(logger, "input_latency", f"Input latency (hand {player_slot})", avg_ms=round(hand_cursor.tracker.avg_latency_ms, 1), events=hand_cursor.tracker.handled_count)
+        logger.info("Game closed.")
+
+    def _resolve_input_target(self, cursor_pos):
+        """
+        Hit-test untuk input tracker: mengembalikan (jenis_target, nama_target) di bawah kursor
+        sesuai state game (tombol, atau kotak papan saat bermain), atau (None, None).
+        """
+        clicked_button = self.gui.get_button_clicked(cursor_pos, self.game_state)
+        if clicked_button:
+            return input_events.TARGET_BUTTON, clicked_button
+        if self.game_state in ["PLAYING_VS_COMPUTER", "PLAYING_MULTIPLAYER"]:
+            square_name = self.gui.get_square_name_from_pixels(cursor_pos[0], cursor_pos[1], self.player_is_black_view)
+            if square_name:
+                return input_events.TARGET_SQUARE, square_name
+        elif self.game_state == gui_display.EXHIBITION_STATE:
+            board_square = self.gui.get_exhibition_square_from_pixels(cursor_pos[0], cursor_pos[1], self.player_is_black_view)
+            if board_square:
+                return input_events.TARGET_SQUARE, board_square # (indeks_papan, nama_kotak)
+        return None, None
     
-    def _handle_homepage_logic(self, cursor_pos, is_closed, prev_is_hand_closed):
-        """Logika untuk halaman utama (homepage)."""
-        if is_closed and not prev_is_hand_closed: 
-            if cursor_pos is not None: 
-                clicked_button = self.gui.get_button_clicked(cursor_pos, self.game_state)
-                if clicked_button in ["VS COMPUTER", "MULTIPLAYER"]:
-                    print(f"Entering mode selection for: {clicked_button}")
-                    self.selected_game_mode = clicked_button
-                    self.game_state = "PLAYER_COLOR_SELECTION" 
-                    self.selected_player_color_name = None 
-
-    async def _handle_player_color_selection_logic(self, cursor_pos, is_closed, prev_is_hand_closed):
-        """Logika untuk layar pemilihan warna pemain."""
-        if is_closed and not prev_is_hand_closed:
-            if cursor_pos is not None:
-                clicked_button = self.gui.get_button_clicked(cursor_pos, self.game_state)
-
-                if clicked_button == "PLAY AS A WHITE":
-                    self.selected_player_color_name = "PLAY AS A WHITE"
-                    self.player_color = chess.WHITE
-                    self.ai_player_color = chess.BLACK
-                    self.player_is_black_view = False 
-                    print("Player selected White.")
-                    self._start_game_after_color_selection()
-
-                elif clicked_button == "PLAY AS A BLACK":
-                    self.selected_player_color_name = "PLAY AS A BLACK"
-                    self.player_color = chess.BLACK
-                    self.ai_player_color = chess.WHITE
-                    self.player_is_black_view = True 
-                    print("Player selected Black, board will be inverted.")
-                    self._start_game_after_color_selection()
+    def _scrub_history(self, game, cursor_pos):
+        """Memindahkan game ke ply yang sesuai posisi kursor di scrubber. Mengembalikan True jika posisi berubah."""
+        _, total_plies, _ = game.get_timeline_info()
+        return game.go_to_ply(self.gui.scrubber_ply_from_pixels(cursor_pos[0], total_plies))
+
+    async def _dispatch_shortcut(self, action, timestamp):
+        """Menjalankan shortcut gestur sebagai penekanan tombol sidebar dengan nama yang sama."""
+        event = input_events.GestureEvent(input_events.PRESS, self.hand_cursors[0].pos or (0, 0),
+                                          input_events.TARGET_BUTTON, action, timestamp)
+        if self.game_state == gui_display.EXHIBITION_STATE:
+            self._handle_exhibition_logic(event)
+        else:
+            await self._handle_playing_logic(event)
+
+    def _prefetch_hover_targets(self):
+        """
+        Prefetch spekulatif: jika kursor melayang di atas bidak pihak yang sedang melangkah, cache langkah
+        sah posisi itu (ChessGame) dan surface highlight (GUI) disiapkan sekarang, sehingga saat pinch
+        mendarat tujuan sah tampil di frame yang sama tanpa generate langkah. Setelah cache terisi,
+        panggilan per frame hanya berupa cek versi posisi.
+        """
+        for hand_cursor in self.hand_cursors:
+            tracker = hand_cursor.tracker
+            if tracker.hover_kind != input_events.TARGET_SQUARE:
+                continue
+            if self.game_state == gui_display.EXHIBITION_STATE:
+                board_index, square_name = tracker.hover_target
+                game = self.exhibition_boards[board_index].chess_game
+                square_size = self.gui.exhibition_square_size
+            else:
+                game, square_name, square_size = self.chess_game, tracker.hover_target, None
+            board = game.get_board_state()
+            piece = board.piece_at(chess.parse_square(square_name))
+            if piece and piece.color == board.turn:
+                game.prefetch_legal_moves()
+                self.gui.prefetch_overlays(square_size)
+
+    def _two_hand_active(self):
+        """True jika multiplayer sedang dimainkan dengan dua tangan (satu tangan per pemain)."""
+        return TWO_HAND_MULTIPLAYER and self.game_state == "PLAYING_MULTIPLAYER"
+
+    def _update_frame_pacing(self):
+        """
+        Memberi tahu frame scheduler apakah ada yang berubah sejak frame lalu, dan apakah layar ini
+        boleh cepat turun ke FPS render rendah: di homepage, atau saat pemain VS COMPUTER menunggu AI.
+        Job AI mode eksibisi tidak dihitung: hampir selalu ada, sementara operator tetap bermain di
+        papan lain. Aktivitas terbaru tetap menang atas petunjuk ini (lihat FrameScheduler).
+        """
+        frame_signature = (self.game_state, tuple((c.pos, c.is_closed) for c in self.hand_cursors),
+                           self.chess_game.position_version, self.selected_square_gui,
+                           self.analyzer.snapshot_version, self.exhibition_focus, self.hint, self._hint_job,
+                           tuple((b.chess_game.position_version, b.selected_square_gui) for b in self.exhibition_boards))
+        if frame_signature != self._last_frame_signature:
+            self.scheduler.mark_activity()
+            self._last_frame_signature = frame_signature
+
+        waiting_for_ai = self.game_state == "PLAYING_VS_COMPUTER" and self.ai_task is not None and not self.ai_task.done()
+        self.scheduler.set_idle_hint(self.game_state == "HOMEPAGE" or waiting_for_ai)
+
+    def _handle_homepage_logic(self, event):
+        """Logika untuk halaman utama (homepage), bereaksi terhadap event gestur."""
+        if event.type == input_events.PRESS and event.target_kind == input_events.TARGET_BUTTON:
+            if event.target in ["VS COMPUTER", "MULTIPLAYER", "EXHIBITION"]:
+                logger.info("Entering mode selection for: %s", event.target)
+                self.selected_game_mode = event.target
+                self.game_state = "PLAYER_COLOR_SELECTION" 
+                self.selected_player_color_name = None 
+
+    async def _handle_player_color_selection_logic(self, event):
+        """Logika untuk layar pemilihan warna pemain, bereaksi terhadap event gestur."""
+        if event.type != input_events.PRESS or event.target_kind != input_events.TARGET_BUTTON:
+            return
+
+        if event.target == "PLAY AS A WHITE":
+            self.selected_player_color_name = "PLAY AS A WHITE"
+            self.player_color = chess.WHITE
+            self.ai_player_color = chess.BLACK
+            self.player_is_black_view = False 
+            logger.info("Player selected White.")
+            self._start_game_after_color_selection()
+
+        elif event.target == "PLAY AS A BLACK":
+            self.selected_player_color_name = "PLAY AS A BLACK"
+            self.player_color = chess.BLACK
+            self.ai_player_color = chess.WHITE
+            self.player_is_black_view = True 
+            logger.info("Player selected Black, board will be inverted.")
+            self._start_game_after_color_selection()
 
     def _start_game_after_color_selection(self):
         """Helper function to transition based on selected game mode after color selection."""
         if self.selected_game_mode == "VS COMPUTER":
             self.game_state = "PLAYING_VS_COMPUTER" 
             self.chess_game.reset_game() 
-            print("Starting VS COMPUTER game.")
+            logger.info("Starting VS COMPUTER game.")
             
             if self.chess_game.get_board_state().turn == self.ai_player_color:
-                print("It's AI's turn initially. Attempting to start AI move task.")
+                logger.debug("It's AI's turn initially. Attempting to start AI move task.")
                 if self.ai_task is None or self.ai_task.done(): 
                     self.ai_task = asyncio.create_task(self._handle_ai_move())
                 else:
-                    print("AI task is already running from init, skipping new task creation.") 
+                    logger.debug("AI task is already running from init, skipping new task creation.")
             else:
-                print("It's player's turn initially. AI will wait for player's move.")
+                logger.debug("It's player's turn initially. AI will wait for player's move.")
 
         elif self.selected_game_mode == "MULTIPLAYER":
             self.game_state = "PLAYING_MULTIPLAYER" 
             self.chess_game.reset_game()
-            print("Starting Multiplayer game (Placeholder for actual multiplayer logic).")
+            logger.info("Starting Multiplayer game (Placeholder for actual multiplayer logic).")
+
+        elif self.selected_game_mode == "EXHIBITION":
+            self._start_exhibition()
+
+    def _start_exhibition(self):
+        """Memulai mode eksibisi: operator memainkan warna pilihannya di semua papan melawan AI bersama."""
+        self.game_state = gui_display.EXHIBITION_STATE
+        self.exhibition_boards = [exhibition.ExhibitionBoard(index, self.ai_player_color)
+                                  for index in range(exhibition.EXHIBITION_BOARD_COUNT)]
+        self.exhibition_focus = 0
+        self.gui.set_exhibition_board_count(len(self.exhibition_boards))
+        for exhibition_board in self.exhibition_boards:
+            self.ai_pool.request_move(exhibition_board) # Hanya berlaku jika AI bermain Putih
+        log_event(logger, "exhibition_start", "Starting exhibition game.", boards=len(self.exhibition_boards),
+                  engines=self.engine_pool.size)
+
+    def _draw_exhibition(self, cursor_pos):
+        """Menggambar grid papan eksibisi, sidebar untuk papan aktif, dan panel analisisnya."""
+        # Status lengkap (is_game_over, dst.) hanya dihitung untuk papan aktif; papan lain cukup status check
+        board_states = [(b.chess_game, b.selected_square_gui, b.possible_moves_gui, {"check": b.board.is_check()},
+                         self.player_is_black_view, self._hint_move_for(b.chess_game)) for b in self.exhibition_boards]
+        focused_status = self.exhibition_boards[self.exhibition_focus].chess_game.get_game_status()
+        focused_status["message"] = f"Board {self.exhibition_focus + 1}: {focused_status['message']}"
+        self.gui.draw_exhibition(board_states, self.exhibition_focus, focused_status)
+        self.gui.draw_buttons(cursor_pos, self.game_state, self._active_buttons())
+        self.gui.draw_history_scrubber(*self.exhibition_boards[self.exhibition_focus].chess_game.get_timeline_info())
+        if self.analyzer.enabled:
+            self.gui.draw_analysis_panel(self.analyzer.status_message, self.analyzer.lines, self.analyzer.snapshot_version)
+
+    def _handle_exhibition_logic(self, event):
+        """
+        Logika mode eksibisi. Event kotak membawa target (indeks_papan, nama_kotak), sehingga gestur
+        selalu diarahkan ke papan di bawah kursor; papan yang terakhir disentuh menjadi papan aktif
+        untuk tombol sidebar (Restart/Undo/Redo/Analysis/Hint).
+        """
+        if event.pos is None:
+            return
+        focused_board = self.exhibition_boards[self.exhibition_focus]
+
+        if event.target_kind == input_events.TARGET_BUTTON:
+            if event.target == gui_display.HISTORY_SCRUBBER_TARGET:
+                if event.type in (input_events.PRESS, input_events.DRAG):
+                    self.ai_pool.cancel(focused_board)
+                    if self._scrub_history(focused_board.chess_game, event.pos):
+                        focused_board.clear_selection()
+                    self.ai_pool.request_move(focused_board)
+                return
+            if event.type != input_events.PRESS:
+                return
+            if event.target == "Restart":
+                self.ai_pool.cancel(focused_board)
+                focused_board.reset()
+            elif event.target == "Undo":
+                self.ai_pool.cancel(focused_board)
+                focused_board.chess_game.undo_move()
+                focused_board.clear_selection()
+            elif event.target == "Redo":
+                self.ai_pool.cancel(focused_board)
+                focused_board.chess_game.redo_move()
+                focused_board.clear_selection()
+            elif event.target == "Analysis":
+                self.analyzer.set_enabled(not self.analyzer.enabled)
+                logger.info("Live analysis %s.", "enabled" if self.analyzer.enabled else "disabled")
+            elif event.target == "Hint":
+                self._request_hint(focused_board.chess_game)
+            elif event.target == "Quit":
+                self.running = False
+                logger.info("Quitting exhibition from sidebar.")
+            # Setelah Restart/Undo/Redo bisa jadi giliran AI lagi; pool mengabaikan jika tidak
+            self.ai_pool.request_move(focused_board)
+            return
 
-    async def _handle_playing_logic(self, cursor_pos, is_closed, prev_is_hand_closed):
-        """Logika untuk mode bermain catur (Player vs Computer atau Multiplayer), termasuk menu in-game."""
-        current_hover_square_name = None
-        if cursor_pos is not None: 
-            current_hover_square_name = self.gui.get_square_name_from_pixels(cursor_pos[0], cursor_pos[1], self.player_is_black_view)
-            
-            clicked_button_name = self.gui.get_button_clicked(cursor_pos, self.game_state) 
-            if clicked_button_name and is_closed and not prev_is_hand_closed:
+        board_index, square_name = event.target if event.target_kind == input_events.TARGET_SQUARE else (None, None)
+
+        if event.type == input_events.PRESS:
+            if board_index is None:
+                return
+            if board_index != self.exhibition_focus:
+                focused_board.clear_selection() # Pilihan di papan lama tidak dibawa ke papan lain
+                self.exhibition_focus = board_index
+                focused_board = self.exhibition_boards[board_index]
+            if focused_board.click_state != "IDLE":
+                return
+            piece = focused_board.board.piece_at(chess.parse_square(square_name))
+            if focused_board.board.turn == self.player_color and piece and piece.color == self.player_color:
+                focused_board.chess_game.select_square(square_name)
+                focused_board.selected_square_gui = focused_board.chess_game.selected_square
+                if focused_board.selected_square_gui is not None:
+                    focused_board.possible_moves_gui = focused_board.chess_game.get_legal_moves(square_name)
+                    focused_board.click_state = "SELECTED_DRAG"
+
+        elif event.type == input_events.RELEASE and focused_board.click_state == "SELECTED_DRAG":
+            move_successful = False
+            if board_index == self.exhibition_focus:
+                move_successful = focused_board.chess_game.select_square(square_name)
+                log_event(logger, "player_move", "Exhibition move attempted.", board=board_index, square=square_name,
+                          success=move_successful)
+            focused_board.clear_selection()
+            if move_successful:
+                self.ai_pool.request_move(focused_board)
+
+    async def _handle_playing_logic(self, event, player_slot=0):
+        """
+        Logika untuk mode bermain catur (Player vs Computer atau Multiplayer), termasuk menu in-game.
+        Bereaksi terhadap event gestur; hover dan drag saat ini tidak mengubah state game.
+        player_slot: Tangan asal event (0/1). Di multiplayer dua tangan, tiap tangan hanya bisa
+                     menggerakkan bidak warnanya sendiri (PLAYER_SLOT_COLORS); tombol bisa dipakai keduanya.
+        """
+        current_hover_square_name = event.target if event.target_kind == input_events.TARGET_SQUARE else None
+        if event.pos is not None: 
+            clicked_button_name = event.target if event.target_kind == input_events.TARGET_BUTTON else None
+            if clicked_button_name == gui_display.HISTORY_SCRUBBER_TARGET:
+                # Pinch lalu geser di scrubber: lompat langsung ke ply mana pun
+                if event.type in (input_events.PRESS, input_events.DRAG) and self._scrub_history(self.chess_game, event.pos):
+                    self.selected_square_gui = None
+                    self.possible_moves_gui = []
+                    self.click_state = "IDLE"
+                    if self.ai_task and not self.ai_task.done():
+                        self.ai_task.cancel()
+                        logger.info("AI thinking cancelled due to history jump.")
+                    board = self.chess_game.get_board_state()
+                    if self.game_state == "PLAYING_VS_COMPUTER" and board.turn == self.ai_player_color and \
+                       not board.is_game_over():
+                        logger.debug("It's AI's turn after history jump. Starting AI move task.")
+                        self.ai_task = asyncio.create_task(self._handle_ai_move())
+                return
+            if clicked_button_name and event.type == input_events.PRESS:
                 if clicked_button_name == "Restart":
                     self.chess_game.reset_game()
                     self.selected_square_gui = None
                     self.possible_moves_gui = []
-                    print("Game restarted.")
+                    logger.info("Game restarted.")
                     
                     if self.game_state == "PLAYING_VS_COMPUTER" and self.chess_game.get_board_state().turn == self.ai_player_color:
-                        print("It's AI's turn after restart. Attempting to start AI move task.")
+                        logger.debug("It's AI's turn after restart. Attempting to start AI move task.")
                         if self.ai_task is None or self.ai_task.done(): 
                             self.ai_task = asyncio.create_task(self._handle_ai_move())
                         else:
-                            print("AI task is already running from restart, skipping new task creation.") 
+                            logger.debug("AI task is already running from restart, skipping new task creation.")
                     else:
-                        print("It's player's turn after restart. AI will wait.")
+                        logger.debug("It's player's turn after restart. AI will wait.")
 
                 elif clicked_button_name == "Undo":
                     self.chess_game.undo_move() 
@@ -255,18 +556,26 @@ class MainGame:
                     self.possible_moves_gui = []
                     if self.ai_task and not self.ai_task.done(): 
                         self.ai_task.cancel()
-                        print("AI thinking cancelled due to Undo.")
+                        logger.info("AI thinking cancelled due to Undo.")
                 elif clicked_button_name == "Redo":
                     self.chess_game.redo_move() 
                     self.selected_square_gui = None
                     self.possible_moves_gui = []
+                elif clicked_button_name == "Analysis":
+                    self.analyzer.set_enabled(not self.analyzer.enabled)
+                    logger.info("Live analysis %s.", "enabled" if self.analyzer.enabled else "disabled")
+                elif clicked_button_name == "Hint":
+                    self._request_hint(self.chess_game)
                 elif clicked_button_name == "Quit": # Tombol Quit langsung berfungsi dari sidebar
                     self.running = False 
-                    print("Quitting game from in-game sidebar.")
+                    logger.info("Quitting game from in-game sidebar.")
                 return 
 
+        if self._two_hand_active() and PLAYER_SLOT_COLORS[player_slot] != self.chess_game.get_board_state().turn:
+            return # Bukan giliran pemain pemilik tangan ini
+
         # --- Logika Deteksi Gerakan Bidak (Klik-Lepas) ---
-        if is_closed and not prev_is_hand_closed and cursor_pos is not None: 
+        if event.type == input_events.PRESS and event.pos is not None: 
             if self.click_state == "IDLE": 
                 if current_hover_square_name:
                     piece_at_square = self.chess_game.get_board_state().piece_at(chess.parse_square(current_hover_square_name))
@@ -285,84 +594,147 @@ class MainGame:
                         if self.selected_square_gui:
                             self.possible_moves_gui = self.chess_game.get_legal_moves(chess.square_name(self.selected_square_gui))
                             self.click_state = "SELECTED_DRAG" 
+                            self.drag_slot = player_slot
                     else:
-                        print(f"Cannot select piece at {current_hover_square_name}. It's not your piece or square is empty.")
+                        log_event(logger, "select_rejected", "Cannot select piece: not your piece or square is empty.", logging.DEBUG, square=current_hover_square_name)
                         self.click_state = "IDLE" 
                 else:
                     self.click_state = "IDLE"
 
-        elif not is_closed and prev_is_hand_closed and cursor_pos is not None: 
+        elif event.type == input_events.RELEASE and event.pos is not None: 
             if self.click_state == "SELECTED_DRAG": 
                 if current_hover_square_name:
                     move_successful = self.chess_game.select_square(current_hover_square_name)
-                    print(f"Player move successful: {move_successful}") 
+                    log_event(logger, "player_move", "Player move attempted.", square=current_hover_square_name, success=move_successful, latency_ms=round((time.perf_counter() - event.timestamp) * 1000, 1))
                     self.selected_square_gui = None
                     self.possible_moves_gui = [] 
                     
-                    print(f"After player move: Board turn: {'White' if self.chess_game.get_board_state().turn == chess.WHITE else 'Black'}, AI color: {'White' if self.ai_player_color == chess.WHITE else 'Black'}")
-                    print(f"Is game over? {self.chess_game.get_board_state().is_game_over()}")
+                    logger.debug("After player move: board turn %s, AI color %s", "White" if self.chess_game.get_board_state().turn == chess.WHITE else "Black", "White" if self.ai_player_color == chess.WHITE else "Black")
+                    logger.debug("Is game over? %s", self.chess_game.get_board_state().is_game_over())
 
                     if self.game_state == "PLAYING_VS_COMPUTER" and \
                        move_successful and \
                        self.chess_game.get_board_state().turn == self.ai_player_color and \
                        not self.chess_game.get_board_state().is_game_over():
-                        print("It is AI's turn and game is not over. Attempting to start AI move task.")
+                        logger.debug("It is AI's turn and game is not over. Attempting to start AI move task.")
                         if self.ai_task is None or self.ai_task.done(): 
                             self.ai_task = asyncio.create_task(self._handle_ai_move()) 
                         else:
-                            print("AI task is already running, skipping new task creation.")
+                            logger.debug("AI task is already running, skipping new task creation.")
                     elif move_successful:
-                        print("Player moved successfully, but it's not AI's turn yet or game is over.")
+                        logger.debug("Player moved successfully, but it's not AI's turn yet or game is over.")
                     else:
-                        print("Player's move was not successful.")
+                        logger.debug("Player's move was not successful.")
                 else:
                     self.selected_square_gui = None
                     self.possible_moves_gui = []
                 self.click_state = "IDLE"
         
     # Dihapus: _handle_in_game_menu_logic
-    # async def _handle_in_game_menu_logic(self, cursor_pos, is_closed, prev_is_hand_closed): 
+    # async def _handle_in_game_menu_logic(self, event): 
     #    ...
 
+    def _active_buttons(self):
+        """Tombol sidebar yang disorot: Analysis saat menyala, Hint saat engine sedang mencari hint."""
+        active_buttons = ["Analysis"] if self.analyzer.enabled else []
+        if self._hint_job is not None and not self._hint_job.done:
+            active_buttons.append("Hint")
+        return active_buttons
+
+    def _hint_move_for(self, game):
+        """Langkah hint untuk game ini, atau None jika hint milik game lain atau posisinya sudah berubah."""
+        if self.hint is None:
+            return None
+        hint_game, position_version, move = self.hint
+        return move if hint_game is game and position_version == game.position_version else None
+
+    def _request_hint(self, game):
+        """
+        Meminta langkah saran engine untuk pihak yang sedang melangkah. Prioritasnya di antara langkah AI
+        dan analisis; hint yang tidak sempat mulai sebelum HINT_DEADLINE_SECONDS dibuang oleh pool.
+        """
+        board = game.get_board_state()
+        if not self.engine_pool.has_engine:
+            logger.info("Hint unavailable: no UCI engine found.")
+            return
+        if board.is_game_over():
+            return
+        self.hint = None
+        position_version = game.position_version
+        job = self.engine_pool.submit(engine_pool.JOB_PLAY, board, engine_pool.PRIORITY_HINT, HINT_THINKING_TIME,
+                                      deadline=time.perf_counter() + HINT_DEADLINE_SECONDS, key=HINT_JOB_KEY)
+        job.future.add_done_callback(lambda future: self._on_hint_done(game, position_version, job, future))
+        self._hint_job = job
+        log_event(logger, "hint_requested", "Hint requested.", logging.DEBUG, ply=game.history.ply)
+
+    def _on_hint_done(self, game, position_version, job, future):
+        if job is self._hint_job:
+            self._hint_job = None
+        if future.cancelled() or future.exception() is not None or future.result() is None:
+            return
+        if position_version != game.position_version:
+            return # Posisi berubah selama engine berpikir; hint basi
+        self.hint = (game, position_version, future.result())
+        log_event(logger, "hint", "Hint ready.", move=future.result().uci())
+
     async def _handle_ai_move(self):
-        """Meminta langkah dari AI sederhana dan melaksanakannya."""
+        """Meminta langkah AI dari pool engine (prioritas tertinggi, pemain sedang menunggu) dan melaksanakannya."""
+        ai_start = time.perf_counter()
+        job = None
         try:
             if self.chess_game.get_board_state().turn == self.ai_player_color and \
                not self.chess_game.get_board_state().is_game_over():
                 
-                print(f"AI ({'White' if self.ai_player_color == chess.WHITE else 'Black'}) is thinking for {AI_FIXED_THINKING_TIME} seconds (simple AI)...") 
+                log_event(logger, "ai_thinking", "AI is thinking.", color="White" if self.ai_player_color == chess.WHITE else "Black", think_s=AI_FIXED_THINKING_TIME, engine=self.engine_pool.has_engine)
                 
-                await asyncio.sleep(AI_FIXED_THINKING_TIME) 
+                position_version = self.chess_game.position_version
+                job = self.engine_pool.submit(engine_pool.JOB_PLAY, self.chess_game.get_board_state(), engine_pool.PRIORITY_AI_MOVE,
+                                              AI_FIXED_THINKING_TIME, key=AI_MOVE_JOB_KEY)
+                best_move = await job.future
 
-                legal_moves = list(self.chess_game.get_board_state().legal_moves)
-                if not legal_moves:
-                    print("No legal moves for AI. Game might be over or stalled.")
+                if best_move is None:
+                    logger.warning("No legal moves for AI. Game might be over or stalled.")
+                    return
+                if position_version != self.chess_game.position_version:
+                    logger.debug("Dropping stale AI move %s: position changed while thinking.", best_move.uci())
                     return
 
-                best_move = random.choice(legal_moves)
-                
                 if best_move in self.chess_game.get_board_state().legal_moves:
                     self.chess_game.select_square(chess.square_name(best_move.from_square))
-                    self.chess_game.select_square(chess.square_name(best_move.to_square))
-                    print(f"AI moved: {best_move.uci()} (random move)")
+                    self.chess_game.select_square(chess.square_name(best_move.to_square), best_move.promotion or chess.QUEEN)
+                    log_event(logger, "ai_move", "AI moved.", move=best_move.uci(), elapsed_ms=round((time.perf_counter() - ai_start) * 1000))
                 else:
-                    print(f"AI generated an illegal move: {best_move.uci()}. This shouldn't happen with random legal moves.")
+                    logger.error("AI generated an illegal move: %s.", best_move.uci())
 
                 self.selected_square_gui = None 
                 self.possible_moves_gui = [] 
 
             else:
-                print("AI move not executed: Not AI's turn or game is over.") 
-                print(f"Current turn: {'White' if self.chess_game.get_board_state().turn == chess.WHITE else 'Black'}, AI color: {'White' if self.ai_player_color == chess.WHITE else 'Black'}, Game Over: {self.chess_game.get_board_state().is_game_over()}")
+                logger.debug("AI move not executed: Not AI's turn or game is over.")
+                logger.debug("Current turn: %s, AI color: %s, Game Over: %s", "White" if self.chess_game.get_board_state().turn == chess.WHITE else "Black", "White" if self.ai_player_color == chess.WHITE else "Black", self.chess_game.get_board_state().is_game_over())
 
         except asyncio.CancelledError: 
-            print("AI thinking cancelled by user action (e.g., Undo or Pause).")
+            if job is not None:
+                job.cancel() # Hentikan juga pencarian engine yang sedang berjalan
+            logger.info("AI thinking cancelled by user action (e.g., Undo or Pause).")
         except Exception as e:
-            print(f"An unexpected error occurred during AI move: {e}")
+            logger.exception("An unexpected error occurred during AI move: %s", e)
         finally:
-            self.ai_task = None 
+            if self.ai_task is asyncio.current_task(): # Task pengganti (misal setelah lompat riwayat) tidak dihapus
+                self.ai_task = None 
 
 
 if __name__ == "__main__":
-    game = MainGame()
-    game.start_game()
+    game_logging.setup_logging()
+    try:
+        game = MainGame()
+        game.start_game()
+    except Exception:
+        logger.exception("Game crashed.")
+        game_logging.shutdown_logging()
+        dump_path = game_logging.dump_recent_records()
+        if dump_path:
+            print(f"Recent log records written to {dump_path}")
+        raise
+    finally:
+        game_logging.shutdown_logging()
@@ -0,0 +1,135 @@
+CHECKPOINT_INTERVAL = 8 # Snapshot papan disimpan setiap N ply; lompatan me-replay paling banyak N-1 langkah
+
+class HistoryNode:
+    """Satu posisi dalam pohon variasi: langkah yang menuju ke sini, induk, dan cabang-cabang lanjutannya."""
+    def __init__(self, move=None, parent=None):
+        self.move = move
+        self.parent = parent
+        self.ply = parent.ply + 1 if parent is not None else 0
+        self.children = [] # Semua variasi yang pernah dimainkan dari posisi ini (urut pertama dimainkan)
+        self.preferred_child = None # Lanjutan yang dipakai Redo dan timeline (variasi terakhir yang dikunjungi)
+        self.checkpoint = None # Salinan chess.Board (dengan move_stack) jika ply kelipatan CHECKPOINT_INTERVAL
+
+    def child_for(self, move):
+        for child in self.children:
+            if child.move == move:
+                return child
+        return None
+
+class MoveHistory:
+    """
+    Riwayat langkah berbentuk pohon dengan checkpoint papan berkala.
+    - Langkah baru setelah Undo tidak membuang lanjutan lama; ia menjadi cabang (variasi) baru.
+    - Timeline adalah jalur akar -> posisi sekarang -> lanjutan pilihan (preferred_child), dipakai
+      oleh Redo dan scrubber di sidebar.
+    - Lompat ke ply mana pun = salin checkpoint terdekat di jalur itu, lalu replay < CHECKPOINT_INTERVAL langkah.
+    """
+    def __init__(self, board, checkpoint_interval=CHECKPOINT_INTERVAL):
+        self.checkpoint_interval = checkpoint_interval
+        self.reset(board)
+
+    def reset(self, board):
+        """Mengosongkan riwayat dengan posisi board sebagai akar."""
+        self.root = HistoryNode()
+        self.root.checkpoint = board.copy()
+        self.current = self.root
+        self._timeline = None # Cache list node timeline (indeks = ply), dihitung ulang saat berubah
+        self._branch_plies = []
+
+    @property
+    def ply(self):
+        return self.current.ply
+
+    def record_move(self, board):
+        """
+        Dipanggil setelah langkah di-push ke board. Jika langkah itu sudah pernah dimainkan dari
+        posisi ini, cabang lama dipakai ulang; jika tidak, cabang baru dibuat.
+        """
+        move = board.peek()
+        child = self.current.child_for(move)
+        if child is None:
+            child = HistoryNode(move, self.current)
+            self.current.children.append(child)
+            if child.ply % self.checkpoint_interval == 0:
+                child.checkpoint = board.copy()
+        self.current.preferred_child = child
+        self.current = child
+        self._timeline = None
+
+    def step_back(self):
+        """Mundur satu ply (board.pop() dilakukan pemanggil). Mengembalikan False jika sudah di awal."""
+        if self.current.parent is None:
+            return False
+        self.current.parent.preferred_child = self.current
+        self.current = self.current.parent
+        return True
+
+    def next_move(self):
+        """Langkah lanjutan pilihan dari posisi sekarang (untuk Redo), atau None."""
+        child = self.current.preferred_child
+        return child.move if child is not None else None
+
+    def step_forward(self):
+        """Maju satu ply ke lanjutan pilihan (board.push() dilakukan pemanggil)."""
+        if self.current.preferred_child is None:
+            return False
+        self.current = self.current.preferred_child
+        return True
+
+    def timeline(self):
+        """List node dari akar sampai akhir lanjutan pilihan; indeks list = ply."""
+        if self._timeline is None:
+            path = []
+            node = self.current
+            while node is not None:
+                path.append(node)
+                node = node.parent
+            path.reverse()
+            node = self.current.preferred_child
+            while node is not None:
+                path.append(node)
+                node = node.preferred_child
+            self._timeline = path
+            self._branch_plies = [node.ply for node in path[1:] if len(node.parent.children) > 1]
+        return self._timeline
+
+    def branch_plies(self):
+        """Ply di timeline yang punya variasi lain (lebih dari satu cabang dari posisi sebelumnya)."""
+        self.timeline()
+        return self._branch_plies
+
+    def variations(self):
+        """Langkah-langkah alternatif dari posisi sebelum posisi sekarang (termasuk langkah yang dimainkan)."""
+        if self.current.parent is None:
+            return []
+        return [child.move for child in self.current.parent.children]
+
+    def board_at(self, ply):
+        """
+        Membuat papan pada ply tertentu di timeline: salin checkpoint terdekat di jalur itu
+        (move_stack ikut tersalin, jadi undo dan deteksi repetisi tetap benar), lalu replay sisanya.
+        Posisi sekarang di pohon dipindah ke ply tersebut; preferred_child di jalur tidak berubah.
+        """
+        timeline = self.timeline()
+        ply = max(0, min(ply, len(timeline) - 1))
+        target = timeline[ply]
+        checkpoint_ply = ply - ply % self.checkpoint_interval
+        while timeline[checkpoint_ply].checkpoint is None: # Checkpoint bisa hilang jika interval diubah
+            checkpoint_ply -= self.checkpoint_interval
+        board = timeline[checkpoint_ply].checkpoint.copy()
+        for node in timeline[checkpoint_ply + 1:ply + 1]:
+            board.push(node.move)
+        self.current = target
+        # Timeline tetap sama: jalur dan lanjutan pilihan tidak berubah oleh lompatan
+        return board
+
+    def restore_into(self, board, ply):
+        """
+        Seperti board_at, tetapi posisinya dipulihkan ke objek board yang sudah ada (in place), sehingga
+        semua yang memegang referensi ke board itu melihat posisi baru.
+        """
+        restored = self.board_at(ply)
+        board.set_fen(restored.fen())
+        # set_fen mengosongkan riwayat; move_stack dan state untuk pop() diambil dari papan hasil replay
+        board.move_stack = restored.move_stack
+        board._stack = restored._stack
@@ -0,0 +1,123 @@
+import logging
+import time
+from collections import namedtuple
+
+from game_logging import log_event
+
+logger = logging.getLogger(__name__)
+
+# Format kamera yang dicoba saat startup, urut dari yang paling disukai.
+# MJPG biasanya bisa 30 FPS di resolusi lebih tinggi lewat USB 2.0; YUYV (tanpa kompresi) lebih
+# ringan di-decode tapi sering dibatasi FPS-nya oleh bandwidth USB.
+CameraFormat = namedtuple("CameraFormat", ["fourcc", "width", "height", "fps"])
+CAMERA_FORMAT_CANDIDATES = [
+    CameraFormat("MJPG", 640, 480, 30),
+    CameraFormat("YUYV", 640, 480, 30),
+    CameraFormat("MJPG", 320, 240, 30),
+    CameraFormat("YUYV", 320, 240, 30),
+]
+CAMERA_FPS_TOLERANCE = 5 # FPS yang dilaporkan kamera boleh lebih rendah segini dari yang diminta
+
+# Level kualitas runtime, urut dari kualitas tertinggi ke terendah.
+# capture_size: resolusi capture; inference_interval: inferensi MediaPipe tiap N frame (frame di
+# antaranya dilacak dengan optical flow, lihat hand_tracker); model_complexity: 1 (akurat) atau 0 (ringan).
+QualityLevel = namedtuple("QualityLevel", ["capture_size", "inference_interval", "model_complexity"])
+QUALITY_LEVELS = [
+    QualityLevel((640, 480), 2, 1),
+    QualityLevel((640, 480), 2, 0),
+    QualityLevel((480, 360), 3, 0),
+    QualityLevel((320, 240), 3, 0),
+    QualityLevel((320, 240), 4, 0),
+]
+
+GESTURE_BUDGET_MS = 25.0 # Target waktu komputasi gestur per frame (tanpa menunggu frame kamera)
+DEGRADE_RATIO = 1.0 # Turunkan kualitas jika rata-rata > budget * rasio ini
+UPGRADE_RATIO = 0.5 # Naikkan kualitas jika rata-rata < budget * rasio ini
+DEGRADE_AFTER_SECONDS = 1.0 # Harus lambat terus-menerus selama ini sebelum turun level
+UPGRADE_AFTER_SECONDS = 5.0 # Harus cepat terus-menerus selama ini sebelum naik level (lebih konservatif)
+
+def negotiate_camera_format(cap, candidates=CAMERA_FORMAT_CANDIDATES):
+    """
+    Mencoba format kamera (fourcc, resolusi, FPS) sesuai urutan dan memakai yang pertama
+    yang benar-benar diterima kamera dan bisa menghasilkan frame.
+    Mengembalikan CameraFormat yang aktif, atau None jika semua gagal (kamera tetap di format default).
+    """
+    import cv2 # Sudah diimpor lebih dulu oleh gesture_control di thread background
+
+    for candidate in candidates:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*candidate.fourcc))
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, candidate.width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, candidate.height)
+        cap.set(cv2.CAP_PROP_FPS, candidate.fps)
+
+        actual_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        actual_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        actual_fps = cap.get(cv2.CAP_PROP_FPS)
+        if (actual_width, actual_height) != (candidate.width, candidate.height):
+            continue
+        # Beberapa backend melaporkan FPS 0 (tidak diketahui); anggap diterima
+        if actual_fps and actual_fps < candidate.fps - CAMERA_FPS_TOLERANCE:
+            continue
+        ret, _ = cap.read()
+        if not ret:
+            continue
+        log_event(logger, "camera_format", f"Camera format: {candidate.fourcc} {actual_width}x{actual_height} @ {actual_fps or candidate.fps:.0f} FPS.", fourcc=candidate.fourcc, width=actual_width, height=actual_height, fps=actual_fps)
+        return candidate
+
+    logger.warning("Camera format negotiation failed, using camera default format.")
+    return None
+
+class QualityController:
+    """
+    Mengatur level kualitas gesture (resolusi capture, frekuensi inferensi, kompleksitas model)
+    berdasarkan latensi terukur terhadap anggaran waktu. Turun level cepat saat lambat, naik level
+    pelan saat longgar, sehingga hardware kiosk yang lambat tetap responsif.
+    """
+    def __init__(self, budget_ms=GESTURE_BUDGET_MS, levels=QUALITY_LEVELS, start_level=0):
+        self.budget_ms = budget_ms
+        self.levels = levels
+        self.level_index = start_level
+        self.avg_ms = None
+        self._over_since = None
+        self._under_since = None
+
+    @property
+    def level(self):
+        return self.levels[self.level_index]
+
+    def report(self, latency_ms, now=None):
+        """
+        Mencatat waktu komputasi satu frame (mirror + konversi warna + inferensi/optical flow, dalam ms).
+        Mengembalikan QualityLevel baru jika level berubah, atau None jika tetap.
+        """
+        if now is None:
+            now = time.perf_counter()
+        self.avg_ms = latency_ms if self.avg_ms is None else self.avg_ms * 0.9 + latency_ms * 0.1
+
+        if self.avg_ms > self.budget_ms * DEGRADE_RATIO:
+            self._under_since = None
+            if self._over_since is None:
+                self._over_since = now
+            if now - self._over_since >= DEGRADE_AFTER_SECONDS and self.level_index < len(self.levels) - 1:
+                return self._change_level(self.level_index + 1, now)
+        elif self.avg_ms < self.budget_ms * UPGRADE_RATIO:
+            self._over_since = None
+            if self._under_since is None:
+                self._under_since = now
+            if now - self._under_since >= UPGRADE_AFTER_SECONDS and self.level_index > 0:
+                return self._change_level(self.level_index - 1, now)
+        else:
+            self._over_since = self._under_since = None
+        return None
+
+    def _change_level(self, new_index, now):
+        direction = "down" if new_index > self.level_index else "up"
+        self.level_index = new_index
+        self._over_since = self._under_since = None
+        # Rata-rata lama tidak mewakili level baru; mulai ulang dari pengukuran berikutnya
+        avg_ms, self.avg_ms = self.avg_ms, None
+        level = self.level
+        log_event(logger, "quality_level", f"Gesture quality {direction}: level {new_index}",
+                  capture=f"{level.capture_size[0]}x{level.capture_size[1]}", inference_interval=level.inference_interval,
+                  model_complexity=level.model_complexity, avg_ms=round(avg_ms, 1))
+        return level
@@ -0,0 +1,138 @@
+# train_gesture_shortcuts.py
+# Merekam sesi landmark tangan dan melatih model gesture shortcut (lihat gesture_shortcuts.py).
+#
+#   python train_gesture_shortcuts.py record sessions/budi_01.jsonl
+#       Tekan 0-3 untuk memilih label yang sedang diperagakan (0 = none), 'q' untuk selesai.
+#   python train_gesture_shortcuts.py train sessions/*.jsonl
+#       Melatih kNN dan menyimpannya ke gesture_shortcuts.MODEL_PATH.
+import argparse
+import json
+import logging
+import os
+import random
+import time
+
+import game_logging
+import gesture_shortcuts
+
+logger = logging.getLogger(__name__)
+
+MAX_SAMPLES_PER_LABEL = 300 # Batas sampel per label agar prediksi kNN tetap jauh di bawah 1 ms
+HOLDOUT_RATIO = 0.2 # Porsi sesi yang disisihkan untuk evaluasi
+
+def record_session(output_path, camera_id=0):
+    """Merekam landmark per frame inferensi penuh ke file JSON Lines dengan label dari keyboard."""
+    import gesture_control
+
+    controller = gesture_control.GestureController()
+    controller.load_model()
+    if not controller.start_camera(camera_id):
+        logger.error("Failed to start camera.")
+        return
+    cv2 = gesture_control.cv2
+
+    label = gesture_shortcuts.GESTURE_NONE
+    frames = 0
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    try:
+        with open(output_path, "w", encoding="utf-8") as f:
+            while True:
+                frame = controller.read_frame()
+                if frame is None:
+                    logger.error("Failed to grab frame from camera.")
+                    break
+                display_frame, hands = controller.detect_hands(frame)
+                if controller.last_frame_inferred: # Sama seperti runtime: hanya frame inferensi penuh
+                    landmarks = None
+                    if hands:
+                        landmarks = [[lm.x, lm.y, lm.z] for lm in hands[0].landmarks.landmark]
+                    f.write(json.dumps({"t": time.perf_counter(), "label": label, "landmarks": landmarks}) + "\n")
+                    frames += 1
+
+                cv2.putText(display_frame, f"label: {label} ({frames} frames)", (10, 30),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+                cv2.imshow("Gesture Recorder", display_frame)
+                key = cv2.waitKey(1) & 0xFF
+                if key == ord("q"):
+                    break
+                if ord("0") <= key < ord("0") + len(gesture_shortcuts.GESTURE_LABELS):
+                    label = gesture_shortcuts.GESTURE_LABELS[key - ord("0")]
+    finally:
+        controller.stop_camera()
+        controller.close_debug_windows()
+    logger.info("Recorded %d frames to %s.", frames, output_path)
+
+def _load_sessions(session_paths):
+    samples = []
+    for path in session_paths:
+        session = list(gesture_shortcuts.iter_session_features(path))
+        samples.append((path, session))
+        logger.info("Loaded %d samples from %s.", len(session), path)
+    return samples
+
+def _balance(samples, rng):
+    """Membatasi jumlah sampel per label (subsampel acak) agar model kecil dan tidak berat sebelah."""
+    by_label = {}
+    for feature, label in samples:
+        by_label.setdefault(label, []).append(feature)
+    features, labels = [], []
+    for label, label_features in by_label.items():
+        if len(label_features) > MAX_SAMPLES_PER_LABEL:
+            label_features = rng.sample(label_features, MAX_SAMPLES_PER_LABEL)
+        features.extend(label_features)
+        labels.extend([label] * len(label_features))
+    return features, labels
+
+def train(session_paths, output_path=gesture_shortcuts.MODEL_PATH, seed=0):
+    """
+    Melatih KNNGestureModel dari sesi rekaman. Sesi (bukan frame) dibagi menjadi train/holdout agar
+    akurasi yang dilaporkan tidak bocor dari frame tetangga yang hampir identik.
+    """
+    rng = random.Random(seed)
+    sessions = _load_sessions(session_paths)
+    rng.shuffle(sessions)
+    holdout_count = int(len(sessions) * HOLDOUT_RATIO) if len(sessions) > 1 else 0
+    holdout = [sample for _, session in sessions[:holdout_count] for sample in session]
+    training = [sample for _, session in sessions[holdout_count:] for sample in session]
+    if not training:
+        logger.error("No training samples found.")
+        return None
+
+    features, labels = _balance(training, rng)
+    model = gesture_shortcuts.KNNGestureModel.fit(features, labels)
+
+    if holdout:
+        correct = sum(model.predict(feature)[0] == label for feature, label in holdout)
+        start = time.perf_counter()
+        for feature, _ in holdout:
+            model.predict(feature)
+        predict_ms = (time.perf_counter() - start) * 1000 / len(holdout)
+        logger.info("Holdout accuracy: %.1f%% on %d samples, %.3f ms per prediction.",
+                    100 * correct / len(holdout), len(holdout), predict_ms)
+
+    model.save(output_path)
+    logger.info("Saved model with %d samples to %s.", len(labels), output_path)
+    return model
+
+def main():
+    parser = argparse.ArgumentParser(description="Record landmark sessions and train the gesture shortcut model.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    record_parser = subparsers.add_parser("record", help="Record a labelled landmark session from the camera.")
+    record_parser.add_argument("output", help="Output session file (.jsonl)")
+    record_parser.add_argument("--camera", type=int, default=0)
+    train_parser = subparsers.add_parser("train", help="Train the kNN model from recorded sessions.")
+    train_parser.add_argument("sessions", nargs="+", help="Recorded session files (.jsonl)")
+    train_parser.add_argument("--output", default=gesture_shortcuts.MODEL_PATH)
+    args = parser.parse_args()
+
+    game_logging.setup_logging()
+    try:
+        if args.command == "record":
+            record_session(args.output, args.camera)
+        else:
+            train(args.sessions, args.output)
+    finally:
+        game_logging.shutdown_logging()
+
+if __name__ == "__main__":
+    main()